@@ -0,0 +1,82 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare per-row creates with DuckDBProxy.create_many.
+
+Run from the backend directory:
+    PYTHONPATH=src python benchmarks/bench_bulk_load.py [rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.model_enum import ComponentType
+from app.sqlmodel_models import Component
+
+# Per-row creates are only timed up to this many rows; the rate is what matters
+SINGLE_ROW_SAMPLE = 2000
+
+
+def make_components(count):
+    return [
+        Component(
+            name=f"Component {i}",
+            type=ComponentType.SOFTWARE,
+            properties=[{"key": "index", "value": str(i)}],
+        )
+        for i in range(count)
+    ]
+
+
+def rows_per_second(load, rows):
+    with tempfile.TemporaryDirectory() as directory:
+        registry = EngineRegistry()
+        proxy = DuckDBProxy(
+            Component,
+            db_path=os.path.join(directory, "bench.duckdb"),
+            registry=registry,
+        )
+        components = make_components(rows)
+        start = time.perf_counter()
+        load(proxy, components)
+        elapsed = time.perf_counter() - start
+        registry.dispose()
+    return rows / elapsed
+
+
+def single_rows(proxy, components):
+    for component in components:
+        proxy.create(component)
+
+
+def create_many(proxy, components):
+    proxy.create_many(components)
+
+
+def main(sizes):
+    for rows in sizes:
+        single = rows_per_second(single_rows, min(rows, SINGLE_ROW_SAMPLE))
+        bulk = rows_per_second(create_many, rows)
+        print(
+            f"{rows:>9} rows  create: {single:>10,.0f} rows/s  "
+            f"create_many: {bulk:>10,.0f} rows/s  ({bulk / single:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 1_000_000])
@@ -0,0 +1,75 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare write throughput with and without the group commit writer.
+
+Each concurrent writer creates components one at a time, as concurrent POST
+requests do.
+
+Run from the backend directory:
+    PYTHONPATH=src python benchmarks/bench_group_commit.py [writers ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.group_commit import GroupCommitWriter
+from app.model_enum import ComponentType
+from app.sqlmodel_models import Component
+
+WRITES = 2000
+
+
+def writes_per_second(writers, group_commit):
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "bench.duckdb")
+        # Enough pooled connections for every writer thread
+        registry = EngineRegistry(pool_size=writers, max_overflow=0)
+        writer = GroupCommitWriter(db_path, registry) if group_commit else None
+        proxy = DuckDBProxy(
+            Component, db_path=db_path, registry=registry, writer=writer
+        )
+
+        def create(i):
+            proxy.create(Component(name=f"Component {i}", type=ComponentType.SOFTWARE))
+
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            start = time.perf_counter()
+            list(pool.map(create, range(WRITES)))
+            elapsed = time.perf_counter() - start
+        stats = writer.stats() if writer else None
+        if writer:
+            writer.shutdown()
+        registry.dispose()
+    return WRITES / elapsed, stats
+
+
+def main(writer_counts):
+    for writers in writer_counts:
+        direct, _ = writes_per_second(writers, False)
+        grouped, stats = writes_per_second(writers, True)
+        print(
+            f"{writers:>3} writers  per-write commit: {direct:>7,.0f} writes/s  "
+            f"group commit: {grouped:>7,.0f} writes/s  ({grouped / direct:.1f}x, "
+            f"mean batch {stats['mean_batch']:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 8, 64])
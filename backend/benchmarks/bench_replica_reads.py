@@ -0,0 +1,83 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure read throughput of snapshot replicas in 1..N processes.
+
+A primary database is populated and published as a snapshot; each replica
+process then serves keyset-paginated reads from it, as a uvicorn worker in
+replica mode would. Throughput should grow with the process count up to the
+number of CPU cores.
+
+Run from the backend directory:
+    PYTHONPATH=src python benchmarks/bench_replica_reads.py [processes ...]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.model_enum import ComponentType
+from app.replica import SnapshotPublisher, SnapshotReplica
+from app.sqlmodel_models import Component
+
+ROWS = 100_000
+SECONDS = 3.0
+
+
+def replica_reads(db_path, snapshot_dir, seconds):
+    """Read pages from the snapshot for `seconds`, returning the page count"""
+    registry = EngineRegistry()
+    replica = SnapshotReplica(db_path, snapshot_dir, registry=registry)
+    replica.attach()
+    proxy = DuckDBProxy(Component, db_path=db_path, registry=registry)
+    pages, cursor = 0, None
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        cursor = proxy.list_page(cursor, 100).next_cursor
+        pages += 1
+    replica.detach()
+    registry.dispose()
+    return pages
+
+
+def main(process_counts):
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "primary.duckdb")
+        snapshot_dir = os.path.join(directory, "snapshots")
+        registry = EngineRegistry()
+        DuckDBProxy(Component, db_path=db_path, registry=registry).create_many(
+            [
+                Component(name=f"Component {i}", type=ComponentType.SOFTWARE)
+                for i in range(ROWS)
+            ]
+        )
+        SnapshotPublisher(db_path, snapshot_dir, registry=registry).publish()
+        registry.dispose()
+        print(f"{os.cpu_count()} CPU cores")
+        for processes in process_counts:
+            with multiprocessing.Pool(processes) as pool:
+                pages = sum(
+                    pool.starmap(
+                        replica_reads, [(db_path, snapshot_dir, SECONDS)] * processes
+                    )
+                )
+            print(f"{processes:>3} processes  {pages / SECONDS:>9,.0f} pages/s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 2, 4])
@@ -0,0 +1,135 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare list route serialization: response_model validation vs the fast path.
+
+The validated path is what FastAPI does for a route returning dumped rows
+with `response_model=List[...Read]`: dump each row to a dict, validate the
+list against the response model and serialize the result to JSON. The fast
+path is app.serialization.dump_rows, serializing the rows as loaded.
+Only serialization is timed; the rows are read from DuckDB beforehand.
+
+Run from the backend directory:
+    PYTHONPATH=src python benchmarks/bench_serialization.py [rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.model_enum import ComponentType
+from app.serialization import dump_rows, embedded
+from app.services import SystemComponentLinkService
+from app.sqlmodel_models import (
+    Component,
+    ComponentRead,
+    System,
+    SystemRead,
+    User,
+    UserRead,
+)
+
+COMPONENTS_PER_SYSTEM = 20
+TYPES = list(ComponentType)
+
+
+def populate(db_path, registry, count):
+    """Create `count` users and components, and systems of 20 components"""
+    DuckDBProxy(User, db_path=db_path, registry=registry).create_many(
+        [User(name=f"User {i}") for i in range(count)]
+    )
+    components = DuckDBProxy(Component, db_path=db_path, registry=registry).create_many(
+        [
+            Component(
+                name=f"Component {i}",
+                type=TYPES[i % len(TYPES)],
+                properties=[{"key": "serial", "value": str(i)}],
+            )
+            for i in range(count)
+        ]
+    )
+    systems = DuckDBProxy(System, db_path=db_path, registry=registry).create_many(
+        [System(name=f"System {i}") for i in range(count // COMPONENTS_PER_SYSTEM)]
+    )
+    links = SystemComponentLinkService(db_path=db_path, registry=registry)
+    ids = [c.id for c in components]
+    for system in systems:
+        members, ids = ids[:COMPONENTS_PER_SYSTEM], ids[COMPONENTS_PER_SYSTEM:]
+        links.replace_components(system.id, members)
+
+
+def routes(db_path, registry):
+    """Return (route, model, read model, rows, include) for each list route"""
+    proxies = {
+        model: DuckDBProxy(model, db_path=db_path, registry=registry)
+        for model in (User, Component, System)
+    }
+    with_components = proxies[System].with_relationships(["components"])
+    return [
+        ("/users/", User, UserRead, proxies[User].list_all(), ()),
+        ("/components/", Component, ComponentRead, proxies[Component].list_all(), ()),
+        (
+            "/systems/?include=components",
+            System,
+            SystemRead,
+            with_components.list_all(),
+            ("components",),
+        ),
+    ]
+
+
+def validated(read_adapter, rows, include):
+    dumped = [embedded(obj, include) for obj in rows]
+    value = read_adapter.validate_python(dumped)
+    return read_adapter.dump_json(value, exclude_none=True)
+
+
+def fast(model_cls, rows, include):
+    return dump_rows(model_cls, rows, include, exclude_none=True)
+
+
+def best_of(runs, fn, *args):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes):
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            registry = EngineRegistry()
+            db_path = os.path.join(directory, "bench.duckdb")
+            populate(db_path, registry, count)
+            for route, model_cls, read_cls, rows, include in routes(db_path, registry):
+                adapter = TypeAdapter(List[read_cls])
+                slow = best_of(3, validated, adapter, rows, include)
+                quick = best_of(3, fast, model_cls, rows, include)
+                print(
+                    f"{count:>7} rows  {route:<30} validated: {slow * 1000:>8.1f} ms"
+                    f"  fast: {quick * 1000:>7.1f} ms  ({slow / quick:.1f}x)"
+                )
+            registry.dispose()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 100_000])
@@ -0,0 +1,103 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the DuckDB aggregates of StatsService with counting in Python.
+
+The Python side does what the dashboards did: load every component and every
+system with its components, then count.
+
+Run from the backend directory:
+    PYTHONPATH=src python benchmarks/bench_stats.py [components ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.model_enum import ComponentType
+from app.services import StatsService, SystemComponentLinkService
+from app.sqlmodel_models import Component, System
+
+COMPONENTS_PER_SYSTEM = 20
+TYPES = list(ComponentType)
+
+
+def populate(db_path, registry, count):
+    """Create `count` components, a system per 40 of them and link half"""
+    components = DuckDBProxy(Component, db_path=db_path, registry=registry).create_many(
+        [
+            Component(name=f"Component {i}", type=TYPES[i % len(TYPES)])
+            for i in range(count)
+        ]
+    )
+    systems = DuckDBProxy(System, db_path=db_path, registry=registry).create_many(
+        [System(name=f"System {i}") for i in range(count // 40)]
+    )
+    links = SystemComponentLinkService(db_path=db_path, registry=registry)
+    ids = [c.id for c in components]
+    for system in systems:
+        members, ids = ids[:COMPONENTS_PER_SYSTEM], ids[COMPONENTS_PER_SYSTEM:]
+        links.replace_components(system.id, members)
+
+
+def python_stats(db_path, registry):
+    components = DuckDBProxy(Component, db_path=db_path, registry=registry)
+    systems = DuckDBProxy(System, db_path=db_path, registry=registry)
+    by_type = Counter(c.type for c in components.list_all())
+    loaded = systems.with_relationships(["components"]).list_all()
+    per_system = {s.id: len(s.components) for s in loaded}
+    linked = {c.id for s in loaded for c in s.components}
+    orphans = [c for c in components.list_all() if c.id not in linked]
+    return by_type, per_system, orphans
+
+
+def duckdb_stats(db_path, registry):
+    stats = StatsService(db_path=db_path, registry=registry)
+    return (
+        stats.components_by_type(),
+        stats.components_per_system(),
+        stats.orphan_components(),
+    )
+
+
+def best_of(runs, fn, *args):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes):
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            registry = EngineRegistry()
+            db_path = os.path.join(directory, "bench.duckdb")
+            populate(db_path, registry, count)
+            python = best_of(3, python_stats, db_path, registry)
+            duckdb = best_of(3, duckdb_stats, db_path, registry)
+            registry.dispose()
+        print(
+            f"{count:>9} components  python: {python * 1000:>9.1f} ms  "
+            f"duckdb: {duckdb * 1000:>7.1f} ms  ({python / duckdb:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
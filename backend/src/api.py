@@ -12,81 +12,673 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from .app.authentication import BCRYPT_CALIBRATE, hash_rounds
+from .app.broker import BROKER_CLIENT
+from .app.change_log import CursorExpiredError
+from .app.duckdb_persistence_proxy import DEFAULT_DUCKDB_PATH
+from .app.engine_registry import ENGINE_REGISTRY
+from .app.event_stream import CHANGE_BROADCASTER, server_sent_events
+from .app.events import DELETE, EVENT_BUS
+from .app.executor import DB_EXECUTOR, ExecutorSaturatedError
+from .app.hashing import (
+    HASH_EXECUTOR,
+    HASH_METRICS,
+    HashingService,
+    default_authentication,
+)
+from .app.replica import (
+    PRIMARY,
+    REPLICA,
+    REPLICA_ROLE,
+    SNAPSHOT_PUBLISHER,
+    SNAPSHOT_REPLICA,
+)
+from .app.schema import bootstrap_schema
+from .app.serialization import (
+    FAST_SERIALIZATION,
+    FastJSONResponse,
+    dump_rows,
+    embedded,
+)
 from .app.services import (
+    CHANGE_LOG_COMPACTOR,
+    GROUP_COMMIT_WRITER,
+    READ_CACHES,
+    AuthorizationService,
+    ChangeFeedService,
     ComponentService,
     PasswordService,
     RoleAuthService,
     RoleService,
+    SearchService,
+    StatsService,
+    SystemComponentLinkService,
     SystemService,
+    TableTagService,
     UserAuthService,
     UserService,
+    reload_indexes,
 )
 from .app.sqlmodel_models import (
     Component,
+    ComponentRead,
     Password,
     Role,
     RoleAuth,
+    RoleRead,
     System,
+    SystemRead,
     User,
     UserAuth,
+    UserRead,
+)
+from .app.tokens import InvalidTokenError, TokenService
+
+
+def events_missed() -> None:
+    """Catch up after change events may have been missed"""
+    reload_indexes()
+    CHANGE_BROADCASTER.resync()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: bootstrap the schema, release engines on shutdown"""
+    if REPLICA_ROLE == REPLICA:
+        # Serve reads from the primary's snapshots instead of the database file
+        SNAPSHOT_REPLICA.on_switch(reload_indexes)
+        SNAPSHOT_REPLICA.attach()
+    elif BROKER_CLIENT is not None:
+        # The write broker owns the database; follow its change events instead
+        BROKER_CLIENT.subscribe(EVENT_BUS, on_reconnect=events_missed)
+    else:
+        bootstrap_schema(DEFAULT_DUCKDB_PATH)
+        CHANGE_LOG_COMPACTOR.start()
+    if REPLICA_ROLE == PRIMARY:
+        SNAPSHOT_PUBLISHER.start()
+    CHANGE_BROADCASTER.start(asyncio.get_running_loop())
+    AuthorizationService()  # Load the authorization index before serving
+    SearchService()  # Likewise the name search index
+    if BCRYPT_CALIBRATE:
+        # Tune the cost of new password hashes to this machine
+        default_authentication().calibrate()
+    yield
+    CHANGE_BROADCASTER.stop()
+    CHANGE_LOG_COMPACTOR.stop()
+    if REPLICA_ROLE == PRIMARY:
+        SNAPSHOT_PUBLISHER.stop()
+    elif REPLICA_ROLE == REPLICA:
+        SNAPSHOT_REPLICA.detach()
+    HASH_EXECUTOR.shutdown()
+    DB_EXECUTOR.shutdown()
+    GROUP_COMMIT_WRITER.shutdown()
+    if BROKER_CLIENT is not None:
+        BROKER_CLIENT.close()
+    ENGINE_REGISTRY.dispose()
+
+
+app = FastAPI(
+    title="SAMmy API",
+    description="API for System and Component Management",
+    lifespan=lifespan,
 )
 
-app = FastAPI(title="SAMmy API", description="API for System and Component Management")
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@app.middleware("http")
+async def replica_guard(request: Request, call_next):
+    """On read-only replicas, refuse writes and reads from a stale snapshot.
+    Responses carry the age of the snapshot they were read from in seconds in
+    the X-Snapshot-Age header.
+    """
+    if REPLICA_ROLE != REPLICA:
+        return await call_next(request)
+    if request.method not in READ_ONLY_METHODS:
+        return JSONResponse(
+            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+            content={"detail": "Read-only replica; send writes to the primary"},
+            headers={"Allow": ", ".join(READ_ONLY_METHODS)},
+        )
+    if not SNAPSHOT_REPLICA.is_fresh():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "detail": f"Snapshot is older than {SNAPSHOT_REPLICA.max_lag:g}s"
+            },
+            headers={"Retry-After": "1"},
+        )
+    age = SNAPSHOT_REPLICA.age()
+    response = await call_next(request)
+    response.headers["X-Snapshot-Age"] = f"{age:.3f}"
+    return response
+
 
 origins = [
     "http://localhost:3000"
 ]
 
+exposed_headers = [
+    "X-Next-Cursor",
+    "X-Snapshot-Age",
+    "ETag",
+    "Last-Modified"
+]
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,            # Origins allowed to access
     allow_credentials=True,           # Allows cookies, auth headers
     allow_methods=["*"],              # HTTP methods: GET, POST, etc.
     allow_headers=["*"],              # HTTP headers
+    expose_headers=exposed_headers,   # Response headers readable by clients
 )
 
+
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    """Shed load with 503 when a bounded executor's queue is full"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+MAX_BULK_ITEMS = 10000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000
+STREAM_RETRY_DELAY = 0.05
+
 # Service dependencies
-def get_user_service():
+async def get_user_service():
     """Dependency to get the UserService instance"""
     return UserService()
 
 
-def get_password_service():
+async def get_password_service():
     """Dependency to get the PasswordService instance"""
     return PasswordService()
 
 
-def get_role_service():
+async def get_role_service():
     """Dependency to get the RoleService instance"""
     return RoleService()
 
 
-def get_role_auth_service():
+async def get_role_auth_service():
     """Dependency to get the RoleAuthService instance"""
     return RoleAuthService()
 
 
-def get_user_auth_service():
+async def get_user_auth_service():
     """Dependency to get the UserAuthService instance"""
     return UserAuthService()
 
 
-def get_component_service():
+async def get_component_service():
     """Dependency to get the ComponentService instance"""
     return ComponentService()
 
 
-def get_system_service():
+async def get_system_service():
     """Dependency to get the SystemService instance"""
     return SystemService()
 
 
+async def get_authorization_service():
+    """Dependency to get the AuthorizationService instance"""
+    return AuthorizationService()
+
+
+async def get_search_service():
+    """Dependency to get the SearchService instance"""
+    return SearchService()
+
+
+async def get_stats_service():
+    """Dependency to get the StatsService instance"""
+    return StatsService()
+
+
+async def get_link_service():
+    """Dependency to get the SystemComponentLinkService instance"""
+    return SystemComponentLinkService()
+
+
+async def get_change_feed_service():
+    """Dependency to get the ChangeFeedService instance"""
+    return ChangeFeedService()
+
+
+async def get_hashing_service():
+    """Dependency to get the HashingService instance"""
+    return HashingService()
+
+
+async def get_token_service():
+    """Dependency to get the TokenService instance"""
+    return TokenService(default_authentication())
+
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    tokens: TokenService = Depends(get_token_service),
+) -> UUID:
+    """Dependency returning the ID of the user named by the bearer token"""
+    try:
+        return tokens.validate(credentials.credentials if credentials else None)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+INCLUDE_DESCRIPTION = "Relationships to embed, repeated or comma-separated"
+
+# Relationships each resource can embed through the include= parameter
+USER_INCLUDES = ("auths",)
+ROLE_INCLUDES = ("role_auths", "user_auths")
+COMPONENT_INCLUDES = ("systems",)
+SYSTEM_INCLUDES = ("components",)
+
+
+def parse_include(values: Optional[List[str]], allowed: Sequence[str]) -> List[str]:
+    """Split the include= values and check them against the allowed names"""
+    include = [name for value in values or [] for name in value.split(",") if name]
+    unknown = [name for name in include if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot include {unknown[0]!r}; choose from {', '.join(allowed)}",
+        )
+    return list(dict.fromkeys(include))
+
+
+def embed(obj, include: Sequence[str]) -> Dict[str, Any]:
+    """Dump an object's columns, embedding its eager-loaded relationships.
+    Relationships not in `include` are left out rather than lazy-loaded, as the
+    object's session is already closed.
+    """
+    return embedded(obj, include)
+
+
+def rows_response(
+    request: Request,
+    response: Response,
+    model_cls: type,
+    rows: Sequence[Any],
+    include: Sequence[str] = (),
+):
+    """Return rows read from the database as the body of a list route.
+    With SAMMY_FAST_SERIALIZATION (the default) the rows are serialized
+    straight to JSON without being validated against the route's
+    response_model, which only documents their shape; the route's
+    response_model_exclude_none is honoured and the headers set on `response`
+    are kept. Otherwise the dumped rows are returned for FastAPI to validate.
+    """
+    if not FAST_SERIALIZATION:
+        return [embed(obj, include) for obj in rows]
+    route = request.scope.get("route")
+    exclude_none = getattr(route, "response_model_exclude_none", False)
+    return FastJSONResponse(
+        dump_rows(model_cls, rows, include, exclude_none),
+        headers=dict(response.headers),
+    )
+
+
+def _row_token(obj) -> str:
+    return f"{obj.id}:{obj.version}:{obj.updated_at.isoformat()}"
+
+
+def entity_tag(obj, include: Sequence[str] = ()) -> str:
+    """Strong ETag of an object as embedded with `include`, from row versions.
+    The versions of the embedded objects are folded in, so linking, unlinking
+    or editing one of them changes the tag too.
+    """
+    parts = [_row_token(obj)]
+    for name in include:
+        parts.append(name)
+        parts.extend(sorted(_row_token(related) for related in getattr(obj, name)))
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def _unmodified_since(header: Optional[str], last_modified: datetime) -> bool:
+    """Whether an If-Modified-Since date is no older than `last_modified` (UTC)"""
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    vary: Optional[str] = None,
+) -> Optional[Response]:
+    """Answer 304 when the client's cached copy is current.
+    If-None-Match is compared weakly against `etag` and takes precedence over
+    If-Modified-Since, as RFC 9110 prescribes for GET. Otherwise the
+    validators are set on `response` and None is returned, and the route
+    responds as usual. `vary` names the request headers the representation
+    depends on, and is sent with either answer.
+    """
+    headers = {"ETag": etag}
+    if vary is not None:
+        headers["Vary"] = vary
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        fresh = "*" in tags or etag in tags
+    else:
+        fresh = last_modified is not None and _unmodified_since(
+            request.headers.get("if-modified-since"), last_modified
+        )
+    if fresh:
+        # Returned as is, so nothing is serialized
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def item_not_modified(
+    request: Request, response: Response, obj, include: Sequence[str] = ()
+) -> Optional[Response]:
+    """Answer 304 for an unchanged object, else set its validators.
+    Last-Modified is only sent without `include`, as changes to the embedded
+    objects do not touch the object's own `updated_at`.
+    """
+    last_modified = None if include else obj.updated_at
+    return not_modified(request, response, entity_tag(obj, include), last_modified)
+
+
+async def table_not_modified(
+    service,
+    request: Request,
+    response: Response,
+    include: Sequence[str] = (),
+    media_type: Optional[str] = None,
+) -> Optional[Response]:
+    """Answer 304 for an unchanged listing, else set its table-level ETag.
+    Routes negotiating the format pass the `media_type` they respond with; it
+    is mixed into the ETag and the answer varies by Accept, so a cached JSON
+    listing is never revalidated as NDJSON or the other way around.
+    """
+    tag = await TableTagService().atable_tag(service.model_cls, include)
+    if media_type is None:
+        return not_modified(request, response, f'"{tag}"')
+    variant = hashlib.blake2b(f"{tag}|{media_type}".encode(), digest_size=16)
+    return not_modified(request, response, f'"{variant.hexdigest()}"', vary="Accept")
+
+
+class ListParams:
+    """Dependency collecting the query parameters shared by the list routes"""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+        cursor: Optional[UUID] = None,
+        order_by: str = "id",
+        include: Optional[List[str]] = Query(None, description=INCLUDE_DESCRIPTION),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.order_by = order_by
+        self.include = include
+
+
+class BatchParams:
+    """Dependency collecting the query parameters of the batch routes"""
+
+    def __init__(
+        self,
+        ids: List[str] = Query(
+            ..., description="IDs to fetch, repeated or comma-separated"
+        ),
+        include: Optional[List[str]] = Query(None, description=INCLUDE_DESCRIPTION),
+    ):
+        self.include = include
+        try:
+            self.ids = [
+                UUID(value) for param in ids for value in param.split(",") if value
+            ]
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+            )
+        if len(self.ids) > MAX_PAGE_LIMIT:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_PAGE_LIMIT} IDs can be fetched at once",
+            )
+
+
+ReadT = TypeVar("ReadT")
+
+
+class Batch(BaseModel, Generic[ReadT]):
+    """Objects fetched by ID, and the requested IDs that were not found"""
+
+    items: List[ReadT]
+    missing: List[UUID]
+
+
+async def next_stream_page(service, cursor: Optional[UUID]):
+    """Read the next page of an NDJSON stream on DB_EXECUTOR.
+    The response has already started, so a saturated executor is waited out
+    rather than answered with 503.
+    """
+    while True:
+        try:
+            return await service.alist_page(cursor, STREAM_BATCH_SIZE)
+        except ExecutorSaturatedError:
+            await asyncio.sleep(STREAM_RETRY_DELAY)
+
+
+async def stream_ndjson(service, page):
+    """Stream every object as newline-delimited JSON, one page in memory at a time.
+    Each page is read on DB_EXECUTOR like any other query, so long exports
+    count against its bound. `page` is the first page, read before the
+    response starts so that a saturated executor is still answered with 503.
+    """
+    while True:
+        yield "".join(obj.model_dump_json() + "\n" for obj in page.items)
+        if page.next_cursor is None:
+            return
+        page = await next_stream_page(service, page.next_cursor)
+
+
+async def read_objects(
+    service,
+    request: Request,
+    response: Response,
+    batch: BatchParams,
+    includes: Sequence[str] = (),
+):
+    """Fetch several objects in one round trip, reporting the IDs not found.
+    Relationships named in `include` (out of `includes`) are embedded, and
+    the response carries the table-level ETag of the listing. Serialized as
+    by `rows_response`.
+    """
+    include = parse_include(batch.include, includes)
+    unchanged = await table_not_modified(service, request, response, include)
+    if unchanged is not None:
+        return unchanged
+    items = await service.aread_many(batch.ids, include)
+    found = {item.id for item in items}
+    missing = [i for i in batch.ids if i not in found]
+    if not FAST_SERIALIZATION:
+        return {"items": [embed(item, include) for item in items], "missing": missing}
+    route = request.scope.get("route")
+    exclude_none = getattr(route, "response_model_exclude_none", False)
+    content = {
+        "items": [embedded(item, include, exclude_none) for item in items],
+        "missing": missing,
+    }
+    return FastJSONResponse(content, headers=dict(response.headers))
+
+
+async def list_objects(
+    service,
+    request: Request,
+    response: Response,
+    page: ListParams,
+    includes: Sequence[str] = (),
+):
+    """List objects, one page at a time when any pagination parameter is given.
+    The ID to pass as `cursor` for the following page is returned in the
+    X-Next-Cursor response header; the header is absent on the last page.
+    Clients sending `Accept: application/x-ndjson` get the whole collection
+    streamed as NDJSON instead. Relationships named in `include` (out of
+    `includes`) are loaded in the same query and embedded.
+    Every variant carries a table-level ETag of its own, and is answered 304
+    Not Modified without being read when If-None-Match matches it.
+    """
+    include = parse_include(page.include, includes)
+    streaming = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    if streaming and include:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="include is not supported when streaming NDJSON",
+        )
+    media_type = NDJSON_MEDIA_TYPE if streaming else "application/json"
+    unchanged = await table_not_modified(
+        service, request, response, include, media_type
+    )
+    if unchanged is not None:
+        return unchanged
+    if streaming:
+        return StreamingResponse(
+            stream_ndjson(service, await service.alist_page(None, STREAM_BATCH_SIZE)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=dict(response.headers),
+        )
+    if page.limit is None and page.cursor is None and page.order_by == "id":
+        rows = await service.alist_all(include)
+        return rows_response(request, response, service.model_cls, rows, include)
+    try:
+        result = await service.alist_page(
+            page.cursor, page.limit or DEFAULT_PAGE_LIMIT, page.order_by, include
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor {page.cursor}",
+        )
+    if result.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(result.next_cursor)
+    return rows_response(request, response, service.model_cls, result.items, include)
+
+
+PROPERTY_FILTER_PREFIX = "prop."
+
+
+def property_filters(request: Request) -> Dict[str, str]:
+    """Collect the `prop.<key>=<value>` query parameters as {key: value}.
+    Raises:
+        HTTPException: 400 if a key is empty or given more than once.
+    """
+    filters: Dict[str, str] = {}
+    for name, value in request.query_params.multi_items():
+        if not name.startswith(PROPERTY_FILTER_PREFIX):
+            continue
+        key = name.removeprefix(PROPERTY_FILTER_PREFIX)
+        if not key or key in filters:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid property filter {name}",
+            )
+        filters[key] = value
+    return filters
+
+
+class BulkWriteResult(BaseModel):
+    """Result of a bulk create or upsert"""
+
+    count: int
+    ids: List[UUID]
+
+
+class LinkUpdateResult(BaseModel):
+    """Result of replacing a system's component set"""
+
+    added: List[UUID]
+    removed: List[UUID]
+
+
+async def bulk_write(
+    service, model_cls, objs: List[Dict[str, Any]], upsert: bool
+) -> BulkWriteResult:
+    """Create or upsert objects in a single transaction.
+    The whole batch is rejected when any object violates a constraint.
+    """
+    if len(objs) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ITEMS} objects can be written per request",
+        )
+    # Table models nested in a list are not validated by FastAPI, so the body
+    # arrives as plain dicts and is validated here
+    try:
+        objs = [model_cls.model_validate(obj) for obj in objs]
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    try:
+        if upsert:
+            written = await service.aupsert_many(objs)
+        else:
+            written = await service.acreate_many(objs)
+    except IntegrityError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e.orig))
+    return BulkWriteResult(count=len(written), ids=[obj.id for obj in written])
+
+
 # Create routers
 user_router = APIRouter(prefix="/users", tags=["Users"])
 password_router = APIRouter(prefix="/passwords", tags=["Passwords"])
@@ -95,41 +687,90 @@ role_auth_router = APIRouter(prefix="/role-auths", tags=["Role Authorizations"])
 user_auth_router = APIRouter(prefix="/user-auths", tags=["User Authorizations"])
 component_router = APIRouter(prefix="/components", tags=["Components"])
 system_router = APIRouter(prefix="/systems", tags=["Systems"])
+auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
+search_router = APIRouter(prefix="/search", tags=["Search"])
+stats_router = APIRouter(prefix="/stats", tags=["Statistics"])
+changes_router = APIRouter(prefix="/changes", tags=["Changes"])
 
 
 # User endpoints
 @user_router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_user(user: User, service: UserService = Depends(get_user_service)):
+async def create_user(
+    user: User, service: UserService = Depends(get_user_service)
+):
     """Create a new user"""
-    return service.create(user)
+    return await service.acreate(user)
+
+
+@user_router.post(
+    "/bulk", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_users(
+    users: List[Dict[str, Any]],
+    upsert: bool = False,
+    service: UserService = Depends(get_user_service),
+):
+    """Create (or, with upsert=true, insert or update) users in one batch"""
+    return await bulk_write(service, User, users, upsert)
+
+
+@user_router.get(
+    "/batch", response_model=Batch[UserRead], response_model_exclude_none=True
+)
+async def batch_users(
+    request: Request,
+    response: Response,
+    batch: BatchParams = Depends(),
+    service: UserService = Depends(get_user_service),
+):
+    """Get several users by ID"""
+    return await read_objects(service, request, response, batch, USER_INCLUDES)
 
 
-@user_router.get("/{user_id}", response_model=User)
-def get_user(user_id: UUID, service: UserService = Depends(get_user_service)):
+@user_router.get(
+    "/{user_id}", response_model=UserRead, response_model_exclude_none=True
+)
+async def get_user(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    include: Optional[List[str]] = Query(None, description=INCLUDE_DESCRIPTION),
+    service: UserService = Depends(get_user_service),
+):
     """Get a user by ID"""
+    include = parse_include(include, USER_INCLUDES)
     try:
-        return service.read(user_id)
+        user = await service.aread(user_id, include)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found",
         )
-
-
-@user_router.get("/", response_model=List[User])
-def list_users(service: UserService = Depends(get_user_service)):
+    unchanged = item_not_modified(request, response, user, include)
+    if unchanged is not None:
+        return unchanged
+    return embed(user, include)
+
+
+@user_router.get("/", response_model=List[UserRead], response_model_exclude_none=True)
+async def list_users(
+    request: Request,
+    response: Response,
+    page: ListParams = Depends(),
+    service: UserService = Depends(get_user_service),
+):
     """List all users"""
-    return service.list_all()
+    return await list_objects(service, request, response, page, USER_INCLUDES)
 
 
 @user_router.put("/{user_id}", response_model=User)
-def update_user(
+async def update_user(
     user_id: UUID, user: User, service: UserService = Depends(get_user_service)
 ):
     """Update a user by ID"""
     try:
-        service.update(user_id, user)
-        return service.read(user_id)
+        await service.aupdate(user_id, user)
+        return await service.aread(user_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -138,50 +779,111 @@ def update_user(
 
 
 @user_router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: UUID, service: UserService = Depends(get_user_service)):
+async def delete_user(
+    user_id: UUID, service: UserService = Depends(get_user_service)
+):
     """Delete a user by ID"""
     try:
-        service.delete(user_id)
+        await service.adelete(user_id)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found",
+        )
+
+
+@user_router.get("/{user_id}/features", response_model=List[str])
+async def list_user_features(
+    user_id: UUID,
+    service: UserService = Depends(get_user_service),
+    authorization: AuthorizationService = Depends(get_authorization_service),
+):
+    """List the features granted to a user through their roles"""
+    try:
+        await service.aread(user_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found",
         )
+    return authorization.features_for(user_id)
 
 
 # Password endpoints
+async def hash_plain_password(password: Password, hashing: HashingService) -> Password:
+    """Replace the plain password in a request body with its bcrypt hash"""
+    password.password = (await hashing.hash_password(password.password)).decode()
+    return password
+
+
 @password_router.post("/", response_model=Password, status_code=status.HTTP_201_CREATED)
-def create_password(
-    password: Password, service: PasswordService = Depends(get_password_service)
+async def create_password(
+    password: Password,
+    service: PasswordService = Depends(get_password_service),
+    hashing: HashingService = Depends(get_hashing_service),
 ):
-    """Create a new password"""
-    return service.create(password)
+    """Set a user's password; `id` is the user's ID and `password` the plain
+    password, stored as its bcrypt hash
+    """
+    return await service.acreate(await hash_plain_password(password, hashing))
+
+
+@password_router.post(
+    "/bulk", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_passwords(
+    passwords: List[Dict[str, Any]],
+    upsert: bool = False,
+    service: PasswordService = Depends(get_password_service),
+):
+    """Create (or, with upsert=true, insert or update) passwords in one batch.
+    Meant for imports: each `password` must already be a bcrypt hash.
+    """
+    for password in passwords:
+        try:
+            hash_rounds(str(password.get("password", "")).encode())
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Password {password.get('id')} is not a bcrypt hash",
+            )
+    return await bulk_write(service, Password, passwords, upsert)
 
 
 @password_router.get("/{password_id}", response_model=Password)
-def get_password(
-    password_id: UUID, service: PasswordService = Depends(get_password_service)
+async def get_password(
+    password_id: UUID,
+    request: Request,
+    response: Response,
+    service: PasswordService = Depends(get_password_service),
 ):
     """Get a password by ID"""
     try:
-        return service.read(password_id)
+        password = await service.aread(password_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Password with ID {password_id} not found",
         )
+    unchanged = item_not_modified(request, response, password)
+    if unchanged is not None:
+        return unchanged
+    return password
 
 
 @password_router.put("/{password_id}", response_model=Password)
-def update_password(
+async def update_password(
     password_id: UUID,
     password: Password,
     service: PasswordService = Depends(get_password_service),
+    hashing: HashingService = Depends(get_hashing_service),
 ):
-    """Update a password by ID"""
+    """Change a password by ID; `password` is the plain password"""
     try:
-        service.update(password_id, password)
-        return service.read(password_id)
+        await service.aupdate(
+            password_id, await hash_plain_password(password, hashing)
+        )
+        return await service.aread(password_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -190,12 +892,12 @@ def update_password(
 
 
 @password_router.delete("/{password_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_password(
+async def delete_password(
     password_id: UUID, service: PasswordService = Depends(get_password_service)
 ):
     """Delete a password by ID"""
     try:
-        service.delete(password_id)
+        await service.adelete(password_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -205,37 +907,82 @@ def delete_password(
 
 # Role endpoints
 @role_router.post("/", response_model=Role, status_code=status.HTTP_201_CREATED)
-def create_role(role: Role, service: RoleService = Depends(get_role_service)):
+async def create_role(
+    role: Role, service: RoleService = Depends(get_role_service)
+):
     """Create a new role"""
-    return service.create(role)
+    return await service.acreate(role)
 
 
-@role_router.get("/{role_id}", response_model=Role)
-def get_role(role_id: UUID, service: RoleService = Depends(get_role_service)):
+@role_router.post(
+    "/bulk", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_roles(
+    roles: List[Dict[str, Any]],
+    upsert: bool = False,
+    service: RoleService = Depends(get_role_service),
+):
+    """Create (or, with upsert=true, insert or update) roles in one batch"""
+    return await bulk_write(service, Role, roles, upsert)
+
+
+@role_router.get(
+    "/batch", response_model=Batch[RoleRead], response_model_exclude_none=True
+)
+async def batch_roles(
+    request: Request,
+    response: Response,
+    batch: BatchParams = Depends(),
+    service: RoleService = Depends(get_role_service),
+):
+    """Get several roles by ID"""
+    return await read_objects(service, request, response, batch, ROLE_INCLUDES)
+
+
+@role_router.get(
+    "/{role_id}", response_model=RoleRead, response_model_exclude_none=True
+)
+async def get_role(
+    role_id: UUID,
+    request: Request,
+    response: Response,
+    include: Optional[List[str]] = Query(None, description=INCLUDE_DESCRIPTION),
+    service: RoleService = Depends(get_role_service),
+):
     """Get a role by ID"""
+    include = parse_include(include, ROLE_INCLUDES)
     try:
-        return service.read(role_id)
+        role = await service.aread(role_id, include)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Role with ID {role_id} not found",
         )
-
-
-@role_router.get("/", response_model=List[Role])
-def list_roles(service: RoleService = Depends(get_role_service)):
+    unchanged = item_not_modified(request, response, role, include)
+    if unchanged is not None:
+        return unchanged
+    return embed(role, include)
+
+
+@role_router.get("/", response_model=List[RoleRead], response_model_exclude_none=True)
+async def list_roles(
+    request: Request,
+    response: Response,
+    page: ListParams = Depends(),
+    service: RoleService = Depends(get_role_service),
+):
     """List all roles"""
-    return service.list_all()
+    return await list_objects(service, request, response, page, ROLE_INCLUDES)
 
 
 @role_router.put("/{role_id}", response_model=Role)
-def update_role(
+async def update_role(
     role_id: UUID, role: Role, service: RoleService = Depends(get_role_service)
 ):
     """Update a role by ID"""
     try:
-        service.update(role_id, role)
-        return service.read(role_id)
+        await service.aupdate(role_id, role)
+        return await service.aread(role_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -244,10 +991,12 @@ def update_role(
 
 
 @role_router.delete("/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_role(role_id: UUID, service: RoleService = Depends(get_role_service)):
+async def delete_role(
+    role_id: UUID, service: RoleService = Depends(get_role_service)
+):
     """Delete a role by ID"""
     try:
-        service.delete(role_id)
+        await service.adelete(role_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -259,44 +1008,79 @@ def delete_role(role_id: UUID, service: RoleService = Depends(get_role_service))
 @role_auth_router.post(
     "/", response_model=RoleAuth, status_code=status.HTTP_201_CREATED
 )
-def create_role_auth(
+async def create_role_auth(
     role_auth: RoleAuth, service: RoleAuthService = Depends(get_role_auth_service)
 ):
     """Create a new role authorization"""
     # Verify that the role exists before creating a role auth
     role_service = RoleService()
     try:
-        role_service.read(role_auth.role_id)
+        await role_service.aread(role_auth.role_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Role with ID {role_auth.role_id} not found",
         )
-    return service.create(role_auth)
+    return await service.acreate(role_auth)
+
+
+@role_auth_router.post(
+    "/bulk", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_role_auths(
+    role_auths: List[Dict[str, Any]],
+    upsert: bool = False,
+    service: RoleAuthService = Depends(get_role_auth_service),
+):
+    """Create (or, with upsert=true, insert or update) role auths in one batch"""
+    return await bulk_write(service, RoleAuth, role_auths, upsert)
+
+
+@role_auth_router.get("/batch", response_model=Batch[RoleAuth])
+async def batch_role_auths(
+    request: Request,
+    response: Response,
+    batch: BatchParams = Depends(),
+    service: RoleAuthService = Depends(get_role_auth_service),
+):
+    """Get several role authorizations by ID"""
+    return await read_objects(service, request, response, batch)
 
 
 @role_auth_router.get("/{role_auth_id}", response_model=RoleAuth)
-def get_role_auth(
-    role_auth_id: UUID, service: RoleAuthService = Depends(get_role_auth_service)
+async def get_role_auth(
+    role_auth_id: UUID,
+    request: Request,
+    response: Response,
+    service: RoleAuthService = Depends(get_role_auth_service),
 ):
     """Get a role authorization by ID"""
     try:
-        return service.read(role_auth_id)
+        role_auth = await service.aread(role_auth_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Role authorization with ID {role_auth_id} not found",
         )
+    unchanged = item_not_modified(request, response, role_auth)
+    if unchanged is not None:
+        return unchanged
+    return role_auth
 
 
 @role_auth_router.get("/", response_model=List[RoleAuth])
-def list_role_auths(service: RoleAuthService = Depends(get_role_auth_service)):
+async def list_role_auths(
+    request: Request,
+    response: Response,
+    page: ListParams = Depends(),
+    service: RoleAuthService = Depends(get_role_auth_service),
+):
     """List all role authorizations"""
-    return service.list_all()
+    return await list_objects(service, request, response, page)
 
 
 @role_auth_router.put("/{role_auth_id}", response_model=RoleAuth)
-def update_role_auth(
+async def update_role_auth(
     role_auth_id: UUID,
     role_auth: RoleAuth,
     service: RoleAuthService = Depends(get_role_auth_service),
@@ -306,14 +1090,14 @@ def update_role_auth(
         # Verify that the role exists
         role_service = RoleService()
         try:
-            role_service.read(role_auth.role_id)
+            await role_service.aread(role_auth.role_id)
         except KeyError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Role with ID {role_auth.role_id} not found",
             )
-        service.update(role_auth_id, role_auth)
-        return service.read(role_auth_id)
+        await service.aupdate(role_auth_id, role_auth)
+        return await service.aread(role_auth_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -322,12 +1106,12 @@ def update_role_auth(
 
 
 @role_auth_router.delete("/{role_auth_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_role_auth(
+async def delete_role_auth(
     role_auth_id: UUID, service: RoleAuthService = Depends(get_role_auth_service)
 ):
     """Delete a role authorization by ID"""
     try:
-        service.delete(role_auth_id)
+        await service.adelete(role_auth_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -339,7 +1123,7 @@ def delete_role_auth(
 @user_auth_router.post(
     "/", response_model=UserAuth, status_code=status.HTTP_201_CREATED
 )
-def create_user_auth(
+async def create_user_auth(
     user_auth: UserAuth, service: UserAuthService = Depends(get_user_auth_service)
 ):
     """Create a new user authorization"""
@@ -348,7 +1132,7 @@ def create_user_auth(
     role_service = RoleService()
 
     try:
-        user_service.read(user_auth.user_id)
+        await user_service.aread(user_auth.user_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -356,38 +1140,73 @@ def create_user_auth(
         )
 
     try:
-        role_service.read(user_auth.role_id)
+        await role_service.aread(user_auth.role_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Role with ID {user_auth.role_id} not found",
         )
 
-    return service.create(user_auth)
+    return await service.acreate(user_auth)
+
+
+@user_auth_router.post(
+    "/bulk", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_user_auths(
+    user_auths: List[Dict[str, Any]],
+    upsert: bool = False,
+    service: UserAuthService = Depends(get_user_auth_service),
+):
+    """Create (or, with upsert=true, insert or update) user auths in one batch"""
+    return await bulk_write(service, UserAuth, user_auths, upsert)
+
+
+@user_auth_router.get("/batch", response_model=Batch[UserAuth])
+async def batch_user_auths(
+    request: Request,
+    response: Response,
+    batch: BatchParams = Depends(),
+    service: UserAuthService = Depends(get_user_auth_service),
+):
+    """Get several user authorizations by ID"""
+    return await read_objects(service, request, response, batch)
 
 
 @user_auth_router.get("/{user_auth_id}", response_model=UserAuth)
-def get_user_auth(
-    user_auth_id: UUID, service: UserAuthService = Depends(get_user_auth_service)
+async def get_user_auth(
+    user_auth_id: UUID,
+    request: Request,
+    response: Response,
+    service: UserAuthService = Depends(get_user_auth_service),
 ):
     """Get a user authorization by ID"""
     try:
-        return service.read(user_auth_id)
+        user_auth = await service.aread(user_auth_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User authorization with ID {user_auth_id} not found",
         )
+    unchanged = item_not_modified(request, response, user_auth)
+    if unchanged is not None:
+        return unchanged
+    return user_auth
 
 
 @user_auth_router.get("/", response_model=List[UserAuth])
-def list_user_auths(service: UserAuthService = Depends(get_user_auth_service)):
+async def list_user_auths(
+    request: Request,
+    response: Response,
+    page: ListParams = Depends(),
+    service: UserAuthService = Depends(get_user_auth_service),
+):
     """List all user authorizations"""
-    return service.list_all()
+    return await list_objects(service, request, response, page)
 
 
 @user_auth_router.put("/{user_auth_id}", response_model=UserAuth)
-def update_user_auth(
+async def update_user_auth(
     user_auth_id: UUID,
     user_auth: UserAuth,
     service: UserAuthService = Depends(get_user_auth_service),
@@ -399,7 +1218,7 @@ def update_user_auth(
         role_service = RoleService()
 
         try:
-            user_service.read(user_auth.user_id)
+            await user_service.aread(user_auth.user_id)
         except KeyError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -407,15 +1226,15 @@ def update_user_auth(
             )
 
         try:
-            role_service.read(user_auth.role_id)
+            await role_service.aread(user_auth.role_id)
         except KeyError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Role with ID {user_auth.role_id} not found",
             )
 
-        service.update(user_auth_id, user_auth)
-        return service.read(user_auth_id)
+        await service.aupdate(user_auth_id, user_auth)
+        return await service.aread(user_auth_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -424,12 +1243,12 @@ def update_user_auth(
 
 
 @user_auth_router.delete("/{user_auth_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_auth(
+async def delete_user_auth(
     user_auth_id: UUID, service: UserAuthService = Depends(get_user_auth_service)
 ):
     """Delete a user authorization by ID"""
     try:
-        service.delete(user_auth_id)
+        await service.adelete(user_auth_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -441,43 +1260,105 @@ def delete_user_auth(
 @component_router.post(
     "/", response_model=Component, status_code=status.HTTP_201_CREATED
 )
-def create_component(
+async def create_component(
     component: Component, service: ComponentService = Depends(get_component_service)
 ):
     """Create a new component"""
-    return service.create(component)
+    return await service.acreate(component)
 
 
-@component_router.get("/{component_id}", response_model=Component)
-def get_component(
-    component_id: UUID, service: ComponentService = Depends(get_component_service)
+@component_router.post(
+    "/bulk", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_components(
+    components: List[Dict[str, Any]],
+    upsert: bool = False,
+    service: ComponentService = Depends(get_component_service),
+):
+    """Create (or, with upsert=true, insert or update) components in one batch"""
+    return await bulk_write(service, Component, components, upsert)
+
+
+@component_router.get(
+    "/batch", response_model=Batch[ComponentRead], response_model_exclude_none=True
+)
+async def batch_components(
+    request: Request,
+    response: Response,
+    batch: BatchParams = Depends(),
+    service: ComponentService = Depends(get_component_service),
+):
+    """Get several components by ID"""
+    return await read_objects(service, request, response, batch, COMPONENT_INCLUDES)
+
+
+@component_router.get(
+    "/{component_id}", response_model=ComponentRead, response_model_exclude_none=True
+)
+async def get_component(
+    component_id: UUID,
+    request: Request,
+    response: Response,
+    include: Optional[List[str]] = Query(None, description=INCLUDE_DESCRIPTION),
+    service: ComponentService = Depends(get_component_service),
 ):
     """Get a component by ID"""
+    include = parse_include(include, COMPONENT_INCLUDES)
     try:
-        return service.read(component_id)
+        component = await service.aread(component_id, include)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Component with ID {component_id} not found",
         )
+    unchanged = item_not_modified(request, response, component, include)
+    if unchanged is not None:
+        return unchanged
+    return embed(component, include)
 
 
-@component_router.get("/", response_model=List[Component])
-def list_components(service: ComponentService = Depends(get_component_service)):
-    """List all components"""
-    return service.list_all()
+@component_router.get(
+    "/", response_model=List[ComponentRead], response_model_exclude_none=True
+)
+async def list_components(
+    request: Request,
+    response: Response,
+    page: ListParams = Depends(),
+    service: ComponentService = Depends(get_component_service),
+):
+    """List all components.
+    Query parameters of the form `prop.<key>=<value>` return just the
+    components having every given property, sorted by ID.
+    """
+    filters = property_filters(request)
+    if not filters:
+        return await list_objects(service, request, response, page, COMPONENT_INCLUDES)
+    if page.cursor is not None or page.limit is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="prop. filters cannot be combined with cursor or limit",
+        )
+    include = parse_include(page.include, COMPONENT_INCLUDES)
+    unchanged = await table_not_modified(service, request, response, include)
+    if unchanged is not None:
+        return unchanged
+    try:
+        components = await service.afind_by_properties(filters, include)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return rows_response(request, response, Component, components, include)
 
 
 @component_router.put("/{component_id}", response_model=Component)
-def update_component(
+async def update_component(
     component_id: UUID,
     component: Component,
     service: ComponentService = Depends(get_component_service),
 ):
     """Update a component by ID"""
     try:
-        service.update(component_id, component)
-        return service.read(component_id)
+        await service.aupdate(component_id, component)
+        return await service.aread(component_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -486,12 +1367,13 @@ def update_component(
 
 
 @component_router.delete("/{component_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_component(
-    component_id: UUID, service: ComponentService = Depends(get_component_service)
+async def delete_component(
+    component_id: UUID,
+    link_service: SystemComponentLinkService = Depends(get_link_service),
 ):
-    """Delete a component by ID"""
+    """Delete a component by ID, removing it from every system"""
     try:
-        service.delete(component_id)
+        await link_service.adelete_component(component_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -501,39 +1383,86 @@ def delete_component(
 
 # System endpoints
 @system_router.post("/", response_model=System, status_code=status.HTTP_201_CREATED)
-def create_system(system: System, service: SystemService = Depends(get_system_service)):
+async def create_system(
+    system: System, service: SystemService = Depends(get_system_service)
+):
     """Create a new system"""
-    return service.create(system)
+    return await service.acreate(system)
+
+
+@system_router.post(
+    "/bulk", response_model=BulkWriteResult, status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_systems(
+    systems: List[Dict[str, Any]],
+    upsert: bool = False,
+    service: SystemService = Depends(get_system_service),
+):
+    """Create (or, with upsert=true, insert or update) systems in one batch"""
+    return await bulk_write(service, System, systems, upsert)
+
+
+@system_router.get(
+    "/batch", response_model=Batch[SystemRead], response_model_exclude_none=True
+)
+async def batch_systems(
+    request: Request,
+    response: Response,
+    batch: BatchParams = Depends(),
+    service: SystemService = Depends(get_system_service),
+):
+    """Get several systems by ID"""
+    return await read_objects(service, request, response, batch, SYSTEM_INCLUDES)
 
 
-@system_router.get("/{system_id}", response_model=System)
-def get_system(system_id: UUID, service: SystemService = Depends(get_system_service)):
+@system_router.get(
+    "/{system_id}", response_model=SystemRead, response_model_exclude_none=True
+)
+async def get_system(
+    system_id: UUID,
+    request: Request,
+    response: Response,
+    include: Optional[List[str]] = Query(None, description=INCLUDE_DESCRIPTION),
+    service: SystemService = Depends(get_system_service),
+):
     """Get a system by ID"""
+    include = parse_include(include, SYSTEM_INCLUDES)
     try:
-        return service.read(system_id)
+        system = await service.aread(system_id, include)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"System with ID {system_id} not found",
         )
+    unchanged = item_not_modified(request, response, system, include)
+    if unchanged is not None:
+        return unchanged
+    return embed(system, include)
 
 
-@system_router.get("/", response_model=List[System])
-def list_systems(service: SystemService = Depends(get_system_service)):
+@system_router.get(
+    "/", response_model=List[SystemRead], response_model_exclude_none=True
+)
+async def list_systems(
+    request: Request,
+    response: Response,
+    page: ListParams = Depends(),
+    service: SystemService = Depends(get_system_service),
+):
     """List all systems"""
-    return service.list_all()
+    return await list_objects(service, request, response, page, SYSTEM_INCLUDES)
 
 
 @system_router.put("/{system_id}", response_model=System)
-def update_system(
+async def update_system(
     system_id: UUID,
     system: System,
     service: SystemService = Depends(get_system_service),
 ):
     """Update a system by ID"""
     try:
-        service.update(system_id, system)
-        return service.read(system_id)
+        await service.aupdate(system_id, system)
+        return await service.aread(system_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -542,12 +1471,13 @@ def update_system(
 
 
 @system_router.delete("/{system_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_system(
-    system_id: UUID, service: SystemService = Depends(get_system_service)
+async def delete_system(
+    system_id: UUID,
+    link_service: SystemComponentLinkService = Depends(get_link_service),
 ):
-    """Delete a system by ID"""
+    """Delete a system by ID, unlinking its components first"""
     try:
-        service.delete(system_id)
+        await link_service.adelete_system(system_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -556,51 +1486,358 @@ def delete_system(
 
 
 # Add relationship management endpoints for many-to-many relationships
+@system_router.get("/{system_id}/components", response_model=List[UUID])
+async def list_system_components(
+    system_id: UUID,
+    link_service: SystemComponentLinkService = Depends(get_link_service),
+):
+    """List the IDs of the components linked to a system"""
+    try:
+        return await link_service.acomponent_ids(system_id)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
+
+
+@system_router.put("/{system_id}/components", response_model=LinkUpdateResult)
+async def replace_system_components(
+    system_id: UUID,
+    component_ids: List[UUID],
+    link_service: SystemComponentLinkService = Depends(get_link_service),
+):
+    """Replace the full set of components linked to a system"""
+    if len(component_ids) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ITEMS} components can be linked at once",
+        )
+    try:
+        added, removed = await link_service.areplace_components(
+            system_id, component_ids
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
+    return LinkUpdateResult(added=added, removed=removed)
+
+
 @system_router.post(
     "/{system_id}/components/{component_id}", status_code=status.HTTP_204_NO_CONTENT
 )
-def add_component_to_system(
+async def add_component_to_system(
     system_id: UUID,
     component_id: UUID,
-    system_service: SystemService = Depends(get_system_service),
-    component_service: ComponentService = Depends(get_component_service),
+    link_service: SystemComponentLinkService = Depends(get_link_service),
 ):
     """Add a component to a system"""
     try:
-        # Verify both system and component exist
-        system = system_service.read(system_id)
-        component_service.read(component_id)
-
-        # This requires custom business logic as many-to-many relationships
-        # aren't directly supported by the current service layer
-        # For now, we'll just acknowledge the endpoint
+        await link_service.alink(system_id, component_id)
     except KeyError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
 
 
 @system_router.delete(
     "/{system_id}/components/{component_id}", status_code=status.HTTP_204_NO_CONTENT
 )
-def remove_component_from_system(
+async def remove_component_from_system(
     system_id: UUID,
     component_id: UUID,
-    system_service: SystemService = Depends(get_system_service),
-    component_service: ComponentService = Depends(get_component_service),
+    link_service: SystemComponentLinkService = Depends(get_link_service),
 ):
     """Remove a component from a system"""
     try:
-        # Verify both system and component exist
-        system = system_service.read(system_id)
-        component_service.read(component_id)
-
-        # This requires custom business logic as many-to-many relationships
-        # aren't directly supported by the current service layer
-        # For now, we'll just acknowledge the endpoint
+        await link_service.aunlink(system_id, component_id)
     except KeyError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
+
+
+# Authentication endpoints
+class LoginRequest(BaseModel):
+    """Credentials for a login; the user's Password row shares their ID"""
+
+    user_id: UUID
+    password: str
+
+
+class TokenResponse(BaseModel):
+    """A session token and its expiry as a Unix timestamp"""
+
+    access_token: str
+    token_type: str = "bearer"
+    expires_at: int
+
+
+async def rehash_password(
+    user_id: UUID, password: str, passwords: PasswordService, hashing: HashingService
+):
+    """Replace a stored hash made with an outdated bcrypt cost"""
+    try:
+        rehashed = await hashing.hash_password(password)
+        await passwords.aupdate(
+            user_id, Password(id=user_id, password=rehashed.decode())
+        )
+    except (ExecutorSaturatedError, KeyError):
+        pass  # Busy or gone; the next login tries again
+
+
+@auth_router.post("/login", response_model=TokenResponse)
+async def login(
+    credentials: LoginRequest,
+    background_tasks: BackgroundTasks,
+    passwords: PasswordService = Depends(get_password_service),
+    hashing: HashingService = Depends(get_hashing_service),
+    tokens: TokenService = Depends(get_token_service),
+):
+    """Verify a password once and issue a short-lived session token.
+    Hashes made with an outdated bcrypt cost are replaced in the background.
+    """
+    try:
+        stored = await passwords.aread(credentials.user_id)
+        stored_hash = stored.password.encode()
+        valid = await hashing.verify_password(credentials.password, stored_hash)
+        if valid and hashing.needs_rehash(stored_hash):
+            background_tasks.add_task(
+                rehash_password,
+                credentials.user_id,
+                credentials.password,
+                passwords,
+                hashing,
+            )
+    except (KeyError, ValueError):
+        # Unknown user, or a stored value that is not a bcrypt hash
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token, expires_at = tokens.issue(credentials.user_id)
+    return TokenResponse(access_token=token, expires_at=expires_at)
+
+
+@auth_router.get("/me", response_model=UserRead, response_model_exclude_none=True)
+async def read_current_user(
+    user_id: UUID = Depends(get_current_user_id),
+    service: UserService = Depends(get_user_service),
+):
+    """Get the user the bearer token was issued to"""
+    try:
+        return embed(await service.aread(user_id), ())
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found",
+        )
+
+
+# Search endpoints
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+SEARCH_TYPES_DESCRIPTION = (
+    "Types to search (user, component, system), repeated or comma-separated; "
+    "all by default"
+)
+
+
+class SearchResult(BaseModel):
+    """A user, component or system whose name matched a search"""
+
+    type: str
+    id: UUID
+    name: str
+
+
+@search_router.get("/", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, description="Text to find in names"),
+    types: Optional[List[str]] = Query(None, description=SEARCH_TYPES_DESCRIPTION),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    service: SearchService = Depends(get_search_service),
+):
+    """Find users, components and systems by name, best matches first.
+    Exact names rank first, then names starting with `q`, names with a word
+    starting with `q`, and finally names containing `q` anywhere. Queries
+    shorter than three characters only match the start of a word.
+    """
+    if types is not None:
+        types = [value for param in types for value in param.split(",") if value]
+    try:
+        hits = await service.asearch(q, types, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return [SearchResult(type=hit.type, id=hit.id, name=hit.name) for hit in hits]
+
+
+# Statistics endpoints; tables are returned as {column: [values...]}
+@stats_router.get("/summary", response_model=Dict[str, int])
+async def stats_summary(service: StatsService = Depends(get_stats_service)):
+    """Count systems, components, links, orphan components and empty systems"""
+    return await service.asummary()
+
+
+@stats_router.get("/components-by-type", response_model=Dict[str, List[Any]])
+async def stats_components_by_type(
+    service: StatsService = Depends(get_stats_service),
+):
+    """Count the components of each type, as columns `type` and `count`"""
+    return await service.acomponents_by_type()
+
+
+@stats_router.get("/components-per-system", response_model=Dict[str, List[Any]])
+async def stats_components_per_system(
+    service: StatsService = Depends(get_stats_service),
+):
+    """Count each system's components, as columns `system_id`, `name` and
+    `component_count`, largest systems first
+    """
+    return await service.acomponents_per_system()
+
+
+@stats_router.get("/orphan-components", response_model=Dict[str, List[Any]])
+async def stats_orphan_components(
+    service: StatsService = Depends(get_stats_service),
+):
+    """List the components linked to no system, as columns `id`, `name` and
+    `type`
+    """
+    return await service.aorphan_components()
+
+
+# Change feed endpoint
+DEFAULT_CHANGES_LIMIT = 1000
+MAX_CHANGES_LIMIT = 10000
+CHANGE_TYPES_DESCRIPTION = (
+    "Types to include (users, passwords, roles, role-auths, user-auths, "
+    "components, systems), repeated or comma-separated; all by default"
+)
+# Services serving the current state of changed objects. Passwords are left
+# out so the feed never serves their hashes: their entries carry no data
+CHANGE_SERVICES = {
+    "users": UserService,
+    "roles": RoleService,
+    "role-auths": RoleAuthService,
+    "user-auths": UserAuthService,
+    "components": ComponentService,
+    "systems": SystemService,
+}
+
+
+class ChangeEntry(BaseModel):
+    """The latest change to one object; `data` is its current state, or null
+    once it is deleted and for passwords
+    """
+
+    type: str
+    id: UUID
+    action: str
+    data: Optional[Dict[str, Any]] = None
+
+
+class ChangeFeed(BaseModel):
+    """Changes after a cursor and the cursor to continue from"""
+
+    changes: List[ChangeEntry]
+    cursor: int
+    has_more: bool
+
+
+@changes_router.get("", response_model=ChangeFeed)
+async def list_changes(
+    since: Optional[int] = Query(
+        None, ge=0, description="Cursor of the previous call; omit to start"
+    ),
+    types: Optional[List[str]] = Query(None, description=CHANGE_TYPES_DESCRIPTION),
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=MAX_CHANGES_LIMIT),
+    service: ChangeFeedService = Depends(get_change_feed_service),
+):
+    """Return what changed since a cursor, one entry per object, oldest first.
+    To sync, call without `since` to get a cursor, load the collections, then
+    poll with the latest cursor and apply each entry: replace the object with
+    `data`, or remove it for action "delete". Entries already applied may be
+    returned again and are safe to reapply. While `has_more` is true, call
+    again right away. 410 Gone means the cursor predates the retained log and
+    the collections must be loaded again. Password entries never carry `data`.
+    """
+    if types is not None:
+        types = [value for param in types for value in param.split(",") if value]
+    try:
+        batch = await service.achanges(since, types, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=e.args[0])
+    wanted: Dict[str, List[UUID]] = {}
+    for change in batch.changes:
+        if change.action != DELETE and change.type in CHANGE_SERVICES:
+            wanted.setdefault(change.type, []).append(change.id)
+    current = {}
+    for type_name, ids in wanted.items():
+        for obj in await CHANGE_SERVICES[type_name]().aread_many(ids):
+            current[type_name, obj.id] = obj.model_dump()
+    entries = []
+    for change in batch.changes:
+        data = current.get((change.type, change.id))
+        action = change.action
+        if data is None and change.type in CHANGE_SERVICES:
+            # Deleted after the log was read; the delete follows in a later batch
+            action = DELETE
+        entries.append(
+            ChangeEntry(type=change.type, id=change.id, action=action, data=data)
+        )
+    return ChangeFeed(changes=entries, cursor=batch.cursor, has_more=batch.has_more)
+
+
+@changes_router.get("/stream")
+async def stream_changes(
+    types: Optional[List[str]] = Query(None, description=CHANGE_TYPES_DESCRIPTION),
+    ids: Optional[List[str]] = Query(
+        None, description="IDs to follow, repeated or comma-separated; all by default"
+    ),
+):
+    """Push create, update and delete events as Server-Sent Events.
+    Each `changes` event carries a JSON list of {"type", "id", "action"}, one
+    entry per object written since the previous event, so a burst of writes
+    arrives as one event. Linking or unlinking is reported as an update of the
+    system and components concerned. A `resync` event means changes were
+    dropped because the client fell behind; reload, or catch up through
+    GET /changes. Replicas see no writes, so only the primary streams; on a
+    replica, poll GET /changes instead.
+    """
+    if REPLICA_ROLE == REPLICA:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Read-only replica; stream changes from the primary",
+        )
+    if types is not None:
+        types = [value for param in types for value in param.split(",") if value]
+    if ids is not None:
+        try:
+            ids = [UUID(value) for param in ids for value in param.split(",") if value]
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+            )
+    try:
+        subscription = CHANGE_BROADCASTER.subscribe(types or None, ids or None)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def events():
+        try:
+            async for event in server_sent_events(subscription):
+                yield event
+        finally:
+            CHANGE_BROADCASTER.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # Register all routers
+app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(password_router)
 app.include_router(role_router)
@@ -608,9 +1845,45 @@ app.include_router(role_auth_router)
 app.include_router(user_auth_router)
 app.include_router(component_router)
 app.include_router(system_router)
+app.include_router(search_router)
+app.include_router(stats_router)
+app.include_router(changes_router)
 
 
 @app.get("/", tags=["Root"])
-def read_root():
+async def read_root():
     """Root endpoint"""
     return {"title": "SAMmy API", "version": "0.1.0"}
+
+
+@app.get("/health", tags=["Root"])
+def health():
+    """Report the health of the pooled database engines and the executor queue"""
+    databases = ENGINE_REGISTRY.health_check()
+    if not all(databases.values()):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=databases
+        )
+    return {
+        "status": "ok",
+        "databases": databases,
+        "executor": DB_EXECUTOR.stats(),
+    }
+
+
+@app.get("/metrics", tags=["Root"])
+async def metrics():
+    """Report read cache, executor, password hashing and event stream counters"""
+    return {
+        "caches": {
+            model_cls.__name__: cache.stats()
+            for model_cls, cache in READ_CACHES.items()
+        },
+        "executors": {
+            executor.name: executor.stats()
+            for executor in (DB_EXECUTOR, HASH_EXECUTOR)
+        },
+        "hashing": HASH_METRICS.stats(),
+        "group_commit": GROUP_COMMIT_WRITER.stats(),
+        "event_stream": {"subscribers": CHANGE_BROADCASTER.subscribers()},
+    }
@@ -12,7 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 import os
+import statistics
+import time
+from typing import Callable, Optional, Tuple
 
 import bcrypt
 from cryptography.fernet import Fernet
@@ -29,6 +33,60 @@ FERNET_KEY_FILE = os.path.join(
     "fernet.key",
 )
 
+# bcrypt cost calibration settings, overridable through the environment.
+# Calibration is opt-in: the cost it picks is not persisted, so with it on a
+# restart on a busier or faster machine changes the cost of new hashes.
+BCRYPT_CALIBRATE = os.environ.get("SAMMY_BCRYPT_CALIBRATE", "0") == "1"
+BCRYPT_TARGET_SECONDS = float(os.environ.get("SAMMY_BCRYPT_TARGET_MS", "250")) / 1000
+BCRYPT_MIN_ROUNDS = int(os.environ.get("SAMMY_BCRYPT_MIN_ROUNDS", "12"))
+BCRYPT_MAX_ROUNDS = int(os.environ.get("SAMMY_BCRYPT_MAX_ROUNDS", "16"))
+CALIBRATION_PROBE_ROUNDS = 8
+CALIBRATION_PROBES = 5
+
+
+def hash_rounds(hashed: bytes) -> int:
+    """Return the cost factor of a bcrypt hash or salt ($2b$<cost>$...)."""
+    try:
+        return int(hashed.split(b"$")[2])
+    except (IndexError, ValueError):
+        raise ValueError("Not a bcrypt hash")
+
+
+def calibrate_rounds(
+    target_seconds: float = BCRYPT_TARGET_SECONDS,
+    min_rounds: int = BCRYPT_MIN_ROUNDS,
+    max_rounds: int = BCRYPT_MAX_ROUNDS,
+    timer: Callable[[], float] = time.perf_counter,
+    probes: int = CALIBRATION_PROBES,
+) -> int:
+    """Pick the bcrypt cost whose hash time is closest to, but not above, a target.
+    Each extra round doubles the work, so hashes at a cheap probe cost are
+    timed and extrapolated rather than trying every candidate cost. The
+    median probe is used, so one hash slowed by a busy machine does not
+    skew the result.
+
+    Args:
+        target_seconds (float): The hash time to aim for.
+        min_rounds (int): The lowest cost ever returned.
+        max_rounds (int): The highest cost ever returned.
+        timer (Callable[[], float]): Clock used to time the probes.
+        probes (int): How many probe hashes to time.
+
+    Returns:
+        int: The calibrated cost, clamped to [min_rounds, max_rounds].
+    """
+    salt = bcrypt.gensalt(rounds=CALIBRATION_PROBE_ROUNDS)
+    timings = []
+    for _ in range(probes):
+        started = timer()
+        bcrypt.hashpw(b"calibration", salt)
+        timings.append(timer() - started)
+    probe_seconds = max(statistics.median(timings), 1e-6)
+    rounds = CALIBRATION_PROBE_ROUNDS + math.floor(
+        math.log2(target_seconds / probe_seconds)
+    )
+    return max(min_rounds, min(max_rounds, rounds))
+
 
 class Authentication:
     """Authentication class for password hashing and verification.
@@ -48,6 +106,27 @@ class Authentication:
         # Step 2: Generate/load encrypted salt
         self.salt = self.load_or_create_encrypted_salt(self.fernet)
 
+    @property
+    def rounds(self) -> int:
+        """The bcrypt cost new hashes are created with."""
+        return hash_rounds(self.salt)
+
+    def set_rounds(self, rounds: int) -> None:
+        """Hash new passwords with a different bcrypt cost.
+        Only the cost prefix of the stored salt changes; the salt itself and
+        the stored file are left alone, so existing hashes keep verifying.
+        """
+        prefix, _, salt = self.salt.rsplit(b"$", 2)
+        self.salt = b"$".join([prefix, b"%02d" % rounds, salt])
+
+    def calibrate(self, target_seconds: float = BCRYPT_TARGET_SECONDS) -> int:
+        """Set the bcrypt cost to hit `target_seconds` per hash on this machine.
+        Returns:
+            int: The cost now used for new hashes.
+        """
+        self.set_rounds(calibrate_rounds(target_seconds))
+        return self.rounds
+
     def load_or_create_fernet_key(self):
         """Generate/load Fernet key."""
         if os.path.exists(FERNET_KEY_FILE):
@@ -101,3 +180,34 @@ class Authentication:
             is_valid = auth.verify_password("my_secure_password", stored_hash)
         """
         return bcrypt.checkpw(password.encode(), stored_hash)
+
+    def needs_rehash(self, stored_hash: bytes) -> bool:
+        """Check whether a stored hash was made with a lower cost than the current one.
+        Hashes with a higher cost are kept: replacing them would weaken them.
+
+        Args:
+            stored_hash (bytes): The stored hash to inspect.
+        Returns:
+            bool: True if the hash should be replaced by a fresh one.
+        """
+        return hash_rounds(stored_hash) < self.rounds
+
+    def verify_and_update(
+        self, password: str, stored_hash: bytes
+    ) -> Tuple[bool, Optional[bytes]]:
+        """Verify a password and rehash it if its stored cost is outdated.
+        This mirrors passlib's CryptContext.verify_and_update, so a login can
+        upgrade the stored hash while it still has the plain password.
+
+        Args:
+            password (str): The password to verify.
+            stored_hash (bytes): The stored hash to compare against.
+        Returns:
+            Tuple[bool, Optional[bytes]]: Whether the password matches, and a
+                replacement hash when it matches but the cost is outdated.
+        """
+        if not self.verify_password(password, stored_hash):
+            return False, None
+        if self.needs_rehash(stored_hash):
+            return True, self.hash_password(password)
+        return True, None
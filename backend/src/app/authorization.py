@@ -0,0 +1,154 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# authorization.py
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Tuple
+from uuid import UUID
+
+from .events import DELETE, ChangeEvent
+from .sqlmodel_models import RoleAuth, UserAuth
+
+
+def _add(index: Dict[Hashable, Counter], key: Hashable, value: Hashable, n=1):
+    """Add `n` paths from key to value."""
+    index[key][value] += n
+
+
+def _remove(index: Dict[Hashable, Counter], key: Hashable, value: Hashable, n=1):
+    """Remove `n` paths from key to value, dropping entries that reach zero."""
+    counts = index.get(key)
+    if counts is None:
+        return
+    counts[value] -= n
+    if counts[value] <= 0:
+        del counts[value]
+    if not counts:
+        del index[key]
+
+
+class AuthorizationIndex:
+    """Materialized user→feature and feature→user maps.
+    A user has a feature when a UserAuth row grants them a role and a RoleAuth
+    row grants that role the feature. Each map counts the distinct
+    UserAuth/RoleAuth paths behind an entry, so rows can be added and removed
+    one at a time without rebuilding. Applying the same row twice is a no-op,
+    as rows are tracked by ID.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every row."""
+        with self._lock:
+            # Auth rows by ID: (user_id, role_id) and (role_id, feature_name)
+            self._user_auths: Dict[UUID, Tuple[UUID, UUID]] = {}
+            self._role_auths: Dict[UUID, Tuple[UUID, str]] = {}
+            self._users_by_role: Dict[UUID, Counter] = defaultdict(Counter)
+            self._features_by_role: Dict[UUID, Counter] = defaultdict(Counter)
+            self._features_by_user: Dict[UUID, Counter] = defaultdict(Counter)
+            self._users_by_feature: Dict[str, Counter] = defaultdict(Counter)
+
+    def load(
+        self, user_auths: Iterable[UserAuth], role_auths: Iterable[RoleAuth]
+    ) -> None:
+        """Replace the index contents with the given rows."""
+        with self._lock:
+            self.clear()
+            for role_auth in role_auths:
+                self.put_role_auth(
+                    role_auth.id, role_auth.role_id, role_auth.feature_name
+                )
+            for user_auth in user_auths:
+                self.put_user_auth(user_auth.id, user_auth.user_id, user_auth.role_id)
+
+    def _link(self, user_id: UUID, feature: str, n: int) -> None:
+        _add(self._features_by_user, user_id, feature, n)
+        _add(self._users_by_feature, feature, user_id, n)
+
+    def _unlink(self, user_id: UUID, feature: str, n: int) -> None:
+        _remove(self._features_by_user, user_id, feature, n)
+        _remove(self._users_by_feature, feature, user_id, n)
+
+    def put_user_auth(self, row_id: UUID, user_id: UUID, role_id: UUID) -> None:
+        """Add or replace the UserAuth row granting `role_id` to `user_id`."""
+        with self._lock:
+            self.remove_user_auth(row_id)
+            self._user_auths[row_id] = (user_id, role_id)
+            _add(self._users_by_role, role_id, user_id)
+            for feature, n in list(self._features_by_role.get(role_id, {}).items()):
+                self._link(user_id, feature, n)
+
+    def remove_user_auth(self, row_id: UUID) -> None:
+        """Remove a UserAuth row; unknown rows are ignored."""
+        with self._lock:
+            row = self._user_auths.pop(row_id, None)
+            if row is None:
+                return
+            user_id, role_id = row
+            _remove(self._users_by_role, role_id, user_id)
+            for feature, n in list(self._features_by_role.get(role_id, {}).items()):
+                self._unlink(user_id, feature, n)
+
+    def put_role_auth(self, row_id: UUID, role_id: UUID, feature: str) -> None:
+        """Add or replace the RoleAuth row granting `feature` to `role_id`."""
+        with self._lock:
+            self.remove_role_auth(row_id)
+            self._role_auths[row_id] = (role_id, feature)
+            _add(self._features_by_role, role_id, feature)
+            for user_id, n in list(self._users_by_role.get(role_id, {}).items()):
+                self._link(user_id, feature, n)
+
+    def remove_role_auth(self, row_id: UUID) -> None:
+        """Remove a RoleAuth row; unknown rows are ignored."""
+        with self._lock:
+            row = self._role_auths.pop(row_id, None)
+            if row is None:
+                return
+            role_id, feature = row
+            _remove(self._features_by_role, role_id, feature)
+            for user_id, n in list(self._users_by_role.get(role_id, {}).items()):
+                self._unlink(user_id, feature, n)
+
+    def apply(self, event: ChangeEvent) -> None:
+        """Update the index from a UserAuth or RoleAuth change event."""
+        if event.model is UserAuth:
+            if event.action == DELETE:
+                self.remove_user_auth(event.obj_id)
+            else:
+                self.put_user_auth(event.obj_id, event.obj.user_id, event.obj.role_id)
+        elif event.model is RoleAuth:
+            if event.action == DELETE:
+                self.remove_role_auth(event.obj_id)
+            else:
+                self.put_role_auth(
+                    event.obj_id, event.obj.role_id, event.obj.feature_name
+                )
+
+    def has_feature(self, user_id: UUID, feature: str) -> bool:
+        """Return whether any of the user's roles grants the feature."""
+        return feature in self._features_by_user.get(user_id, ())
+
+    def features_for(self, user_id: UUID) -> List[str]:
+        """Return the features the user has, sorted by name."""
+        with self._lock:
+            return sorted(self._features_by_user.get(user_id, ()))
+
+    def users_with(self, feature: str) -> List[UUID]:
+        """Return the IDs of the users having the feature, sorted."""
+        with self._lock:
+            return sorted(self._users_by_feature.get(feature, ()))
@@ -0,0 +1,273 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# broker.py
+import functools
+import logging
+import os
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from .events import EventBus
+from .hashing import default_authentication
+from .persistence import Page, PersistenceProxy
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Unix socket of the write broker; when set, API workers reach the database
+# only through the broker (see broker_server.py)
+BROKER_SOCKET = os.environ.get("SAMMY_BROKER_SOCKET", "")
+BROKER_RECONNECT_DELAY = 1.0
+
+# Request kinds
+PROXY = "proxy"
+SERVICE = "service"
+SUBSCRIBE = "subscribe"
+
+# PersistenceProxy methods the broker runs on behalf of clients
+PROXY_METHODS = frozenset(
+    {
+        "create",
+        "read",
+        "read_many",
+        "update",
+        "upsert",
+        "create_many",
+        "upsert_many",
+        "delete",
+        "list_all",
+        "list_page",
+        "find_by_properties",
+    }
+)
+
+
+class BrokerError(RuntimeError):
+    """Raised when the write broker cannot be reached."""
+
+
+def broker_authkey() -> bytes:
+    """Return the key broker and clients authenticate each other with.
+    It is the Fernet key Authentication already keeps in the resources
+    directory, so every process of a deployment shares it without further
+    setup. Connections are authenticated before anything is unpickled.
+    """
+    return default_authentication().fernet_key
+
+
+def brokered(method: Callable) -> Callable:
+    """Run a service method in the broker when the service has a client.
+    The service must have a `_broker` attribute holding a BrokerClient or
+    None; with None the method runs locally. Only methods marked this way can
+    be called through the broker.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        if self._broker is not None:
+            return self._broker.call_service(
+                type(self).__name__, method.__name__, *args
+            )
+        return method(self, *args)
+
+    wrapper.brokered = True
+    return wrapper
+
+
+class BrokerClient:
+    """Pooled connections from an API worker to the write broker.
+    Each call borrows an idle connection, or opens one, sends one request and
+    waits for its reply, so concurrent callers each use their own connection.
+    Exceptions raised in the broker are re-raised in the caller.
+    """
+
+    def __init__(
+        self, socket_path: str = BROKER_SOCKET, authkey: Optional[bytes] = None
+    ):
+        """Initialize the client; connections are opened on first use.
+        Args:
+            socket_path (str): Path of the broker's Unix socket.
+            authkey (Optional[bytes]): Shared key; `broker_authkey()` if None.
+        """
+        self.socket_path = socket_path
+        self._authkey = authkey
+        self._idle: List[Connection] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._subscriber: Optional[threading.Thread] = None
+
+    def _connect(self) -> Connection:
+        if self._authkey is None:
+            self._authkey = broker_authkey()
+        try:
+            return Client(self.socket_path, family="AF_UNIX", authkey=self._authkey)
+        except (AuthenticationError, OSError) as e:
+            raise BrokerError(
+                f"Cannot reach the write broker at {self.socket_path}: {e}"
+            )
+
+    def _call(self, request: tuple) -> Any:
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._connect()
+        try:
+            connection.send(request)
+            ok, value = connection.recv()
+        except (EOFError, OSError) as e:
+            connection.close()
+            raise BrokerError(f"Lost the connection to the write broker: {e}")
+        with self._lock:
+            self._idle.append(connection)
+        if not ok:
+            raise value
+        return value
+
+    def call_proxy(
+        self, model_cls: type, include: Sequence[str], method: str, *args
+    ) -> Any:
+        """Call a PersistenceProxy method on the broker's proxy for a model."""
+        return self._call((PROXY, model_cls, tuple(include), method, args))
+
+    def call_service(self, service: str, method: str, *args) -> Any:
+        """Call a `brokered` method on the broker's instance of a service."""
+        return self._call((SERVICE, service, method, args))
+
+    def subscribe(
+        self, bus: EventBus, on_reconnect: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Republish the broker's change events on a local bus.
+        Events are received on a background thread. If the connection drops it
+        is reopened, and `on_reconnect` is called as events may have been
+        missed in between.
+        """
+        self._closed.clear()
+        self._subscriber = threading.Thread(
+            target=self._receive_events,
+            args=(bus, on_reconnect),
+            name="sammy-broker-events",
+            daemon=True,
+        )
+        self._subscriber.start()
+
+    def _receive_events(
+        self, bus: EventBus, on_reconnect: Optional[Callable[[], None]]
+    ) -> None:
+        connected_before = False
+        while not self._closed.is_set():
+            try:
+                connection = self._connect()
+                connection.send((SUBSCRIBE,))
+                if connected_before and on_reconnect is not None:
+                    on_reconnect()
+                connected_before = True
+                with connection:
+                    while not self._closed.is_set():
+                        if connection.poll(BROKER_RECONNECT_DELAY):
+                            bus.publish(connection.recv())
+            except (BrokerError, EOFError, OSError) as e:
+                logger.warning("Write broker event stream interrupted: %s", e)
+                self._closed.wait(BROKER_RECONNECT_DELAY)
+
+    def close(self) -> None:
+        """Close every connection and stop receiving events."""
+        self._closed.set()
+        if self._subscriber is not None:
+            self._subscriber.join()
+            self._subscriber = None
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class BrokerProxy(PersistenceProxy[T]):
+    """Persistence proxy running every call in the write broker process.
+    A drop-in replacement for DuckDBProxy in API workers: objects and
+    exceptions are pickled across the socket, so callers see the same results
+    and errors as with a local proxy.
+    """
+
+    def __init__(
+        self, model_cls: type, client: BrokerClient, include: Sequence[str] = ()
+    ):
+        """Initialize the broker proxy.
+        Args:
+            model_cls (type): The SQLModel class to persist.
+            client (BrokerClient): The connection pool to the broker.
+            include (Sequence[str]): Relationships the broker loads eagerly.
+        """
+        self._model_cls = model_cls
+        self._client = client
+        self._include = tuple(include)
+
+    def _call(self, method: str, *args) -> Any:
+        return self._client.call_proxy(self._model_cls, self._include, method, *args)
+
+    def create(self, obj: T) -> T:
+        return self._call("create", obj)
+
+    def read(self, obj_id: UUID) -> T:
+        return self._call("read", obj_id)
+
+    def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        return self._call("read_many", obj_ids)
+
+    def update(self, obj_id: UUID, obj: T) -> T:
+        return self._call("update", obj_id, obj)
+
+    def upsert(self, obj: T) -> T:
+        return self._call("upsert", obj)
+
+    def create_many(self, objs: List[T]) -> List[T]:
+        return self._call("create_many", objs)
+
+    def upsert_many(self, objs: List[T]) -> List[T]:
+        return self._call("upsert_many", objs)
+
+    def delete(self, obj_id: UUID) -> None:
+        self._call("delete", obj_id)
+
+    def list_all(self) -> List[T]:
+        return self._call("list_all")
+
+    def list_page(
+        self, after_id: Optional[UUID] = None, limit: int = 100, order_by: str = "id"
+    ) -> Page[T]:
+        return self._call("list_page", after_id, limit, order_by)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[T]:
+        """Iterate over all objects, fetching one page per broker call."""
+        cursor = None
+        while True:
+            page = self.list_page(cursor, batch_size)
+            yield from page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def find_by_properties(self, filters: Dict[str, str]) -> List[T]:
+        return self._call("find_by_properties", filters)
+
+    def with_relationships(self, include: Sequence[str]) -> "BrokerProxy[T]":
+        return BrokerProxy(self._model_cls, self._client, include)
+
+
+# Process-wide client, used by the services when a broker socket is configured
+BROKER_CLIENT = BrokerClient() if BROKER_SOCKET else None
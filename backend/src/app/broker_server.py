@@ -0,0 +1,300 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# broker_server.py
+import logging
+import os
+import pickle
+import queue
+import signal
+import sys
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import SQLModel
+
+from .broker import (
+    BROKER_SOCKET,
+    PROXY,
+    PROXY_METHODS,
+    SERVICE,
+    SUBSCRIBE,
+    BrokerError,
+    broker_authkey,
+)
+from .duckdb_persistence_proxy import DEFAULT_DUCKDB_PATH, DuckDBProxy
+from .engine_registry import ENGINE_REGISTRY, EngineRegistry
+from .events import ChangeEvent, EventBus, PublishingProxy
+from .group_commit import GROUP_COMMIT, GroupCommitWriter
+from .persistence import PersistenceProxy
+from .schema import bootstrap_schema
+from .services import (
+    CHANGE_LOG_COMPACTOR,
+    GROUP_COMMIT_WRITER,
+    ChangeFeedService,
+    StatsService,
+    SystemComponentLinkService,
+    TableTagService,
+)
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBroker:
+    """Process-wide owner of the database, serving API workers over a socket.
+    DuckDB lets only one process open a database file for writing, so with
+    several API workers one broker process holds the file and every worker
+    sends its persistence calls here. Each client connection is served by its
+    own thread; writes can additionally be batched by a GroupCommitWriter.
+    Change events of the writes are sent to every subscribed connection, so
+    the workers keep their in-memory indexes and caches current.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = BROKER_SOCKET,
+        db_path: str = DEFAULT_DUCKDB_PATH,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        writer: Optional[GroupCommitWriter] = None,
+        authkey: Optional[bytes] = None,
+    ):
+        """Initialize the broker; nothing is listened on until `start`.
+        Args:
+            socket_path (str): Path of the Unix socket to listen on.
+            db_path (str): Path to the DuckDB database file.
+            registry (EngineRegistry): Registry providing the pooled engine.
+            writer (Optional[GroupCommitWriter]): Writer batching the commits.
+            authkey (Optional[bytes]): Shared key; `broker_authkey()` if None.
+        """
+        self.socket_path = socket_path
+        self._db_path = db_path
+        self._registry = registry
+        self._writer = writer
+        self._authkey = authkey
+        self._bus = EventBus()
+        self._bus.subscribe(self._events_put)
+        self._proxies: Dict[type, PersistenceProxy] = {}
+        self._services = {
+            cls.__name__: cls(db_path, registry, broker=None)
+            for cls in (StatsService, TableTagService, ChangeFeedService)
+        }
+        # Its link changes and deletes are sent to the subscribers too
+        self._services[SystemComponentLinkService.__name__] = (
+            SystemComponentLinkService(db_path, registry, broker=None, bus=self._bus)
+        )
+        self._events: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._subscribers: List[Connection] = []
+        self._connections: List[Connection] = []
+        self._lock = threading.Lock()
+        self._listener: Optional[Listener] = None
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _proxy(self, model_cls: Any) -> PersistenceProxy:
+        """Return the publishing proxy of a table model, created on first use."""
+        with self._lock:
+            proxy = self._proxies.get(model_cls)
+            if proxy is not None:
+                return proxy
+            if not (
+                isinstance(model_cls, type)
+                and issubclass(model_cls, SQLModel)
+                and hasattr(model_cls, "__table__")
+            ):
+                raise ValueError(f"{model_cls!r} is not a table model")
+            proxy = PublishingProxy(
+                DuckDBProxy(model_cls, self._db_path, self._registry, self._writer),
+                model_cls,
+                self._bus,
+            )
+            self._proxies[model_cls] = proxy
+            return proxy
+
+    def handle(self, request: tuple) -> Any:
+        """Run one proxy or service request and return its result.
+        Raises:
+            ValueError: If the request names no known model, service or method.
+        """
+        kind, *rest = request
+        if kind == PROXY:
+            model_cls, include, method, args = rest
+            if method not in PROXY_METHODS:
+                raise ValueError(f"Unknown persistence method: {method}")
+            proxy = self._proxy(model_cls)
+            if include:
+                proxy = proxy.with_relationships(include)
+            return getattr(proxy, method)(*args)
+        if kind == SERVICE:
+            name, method, args = rest
+            service = self._services.get(name)
+            function = getattr(service, method, None)
+            if not getattr(function, "brokered", False):
+                raise ValueError(f"Unknown service method: {name}.{method}")
+            return function(*args)
+        raise ValueError(f"Unknown request: {kind!r}")
+
+    def _serve(self, connection: Connection) -> None:
+        """Answer the requests of one client until it disconnects."""
+        try:
+            while True:
+                request = connection.recv()
+                if request == (SUBSCRIBE,):
+                    # The connection now only receives events
+                    with self._lock:
+                        self._subscribers.append(connection)
+                    return
+                try:
+                    reply = (True, self.handle(request))
+                except Exception as e:
+                    reply = (False, e)
+                try:
+                    connection.send(reply)
+                except (pickle.PicklingError, AttributeError, TypeError) as e:
+                    # Nothing is written when the reply cannot be pickled
+                    connection.send((False, BrokerError(f"Unsendable reply: {e!r}")))
+        except (EOFError, OSError):
+            self._drop(connection)
+
+    def _drop(self, connection: Connection) -> None:
+        with self._lock:
+            for connections in (self._connections, self._subscribers):
+                if connection in connections:
+                    connections.remove(connection)
+        connection.close()
+
+    def _events_put(self, event: ChangeEvent) -> None:
+        self._events.put(event)
+
+    def _broadcast(self) -> None:
+        """Send every change event to the subscribed connections, in order."""
+        while True:
+            event = self._events.get()
+            if event is _STOP:
+                return
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for connection in subscribers:
+                try:
+                    connection.send(event)
+                except (OSError, ValueError):
+                    self._drop(connection)
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection = self._listener.accept()
+            except AuthenticationError as e:
+                logger.warning("Rejected a write broker client: %s", e)
+                continue
+            except OSError:
+                # The listener was closed
+                return
+            if self._stopping.is_set():
+                connection.close()
+                return
+            with self._lock:
+                self._connections.append(connection)
+            threading.Thread(
+                target=self._serve,
+                args=(connection,),
+                name="sammy-broker-client",
+                daemon=True,
+            ).start()
+
+    def start(self) -> None:
+        """Listen on the socket and serve clients on background threads.
+        A socket file left behind by a previous broker is replaced; the new one
+        is readable and writable by the owner only.
+        """
+        if self._authkey is None:
+            self._authkey = broker_authkey()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._listener = Listener(
+            self.socket_path, family="AF_UNIX", authkey=self._authkey
+        )
+        os.chmod(self.socket_path, 0o600)
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=target, name=name, daemon=True)
+            for target, name in (
+                (self._accept, "sammy-broker-accept"),
+                (self._broadcast, "sammy-broker-events"),
+            )
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def serve_forever(self) -> None:
+        """Start serving and block until the accept thread ends."""
+        self.start()
+        self._threads[0].join()
+
+    def stop(self) -> None:
+        """Stop accepting clients and close every connection."""
+        self._stopping.set()
+        if self._listener is not None:
+            # Closing the socket does not wake a blocked accept, a client does
+            try:
+                Client(
+                    self.socket_path, family="AF_UNIX", authkey=self._authkey
+                ).close()
+            except OSError:
+                pass
+            self._listener.close()
+            self._listener = None
+        self._events.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        with self._lock:
+            connections = self._connections + self._subscribers
+            self._connections, self._subscribers = [], []
+        for connection in connections:
+            connection.close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def main() -> None:
+    """Run the write broker for the default database until terminated.
+    Start it before the API workers, e.g.
+    `SAMMY_BROKER_SOCKET=/run/sammy/broker.sock python -m src.app.broker_server`,
+    and give the workers the same SAMMY_BROKER_SOCKET.
+    """
+    logging.basicConfig(level=logging.INFO)
+    if not BROKER_SOCKET:
+        sys.exit("SAMMY_BROKER_SOCKET is not set")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    bootstrap_schema(DEFAULT_DUCKDB_PATH)
+    broker = WriteBroker(writer=GROUP_COMMIT_WRITER if GROUP_COMMIT else None)
+    logger.info("Write broker listening on %s", BROKER_SOCKET)
+    CHANGE_LOG_COMPACTOR.start()
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        CHANGE_LOG_COMPACTOR.stop()
+        broker.stop()
+        GROUP_COMMIT_WRITER.shutdown()
+        ENGINE_REGISTRY.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# caching_proxy.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+from uuid import UUID
+
+from .persistence import Page, PersistenceProxy
+
+T = TypeVar("T")
+
+# Cache settings, overridable through the environment
+DEFAULT_CACHE_MAX_ENTRIES = int(os.environ.get("SAMMY_CACHE_MAX_ENTRIES", "1024"))
+DEFAULT_CACHE_TTL = float(os.environ.get("SAMMY_CACHE_TTL", "60"))
+
+_LIST_ALL_KEY = ("list_all",)
+
+
+class ReadCache:
+    """Thread-safe LRU cache whose entries also expire after a TTL.
+    Attributes:
+        max_entries (int): Entries kept before the least recently used is evicted.
+        ttl (float): Seconds an entry stays valid.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that were absent or expired.
+        evictions (int): Entries dropped because the cache was full or expired.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: float = DEFAULT_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple:
+        """Look up a key.
+        Returns:
+            tuple: (True, value) on a hit, or (False, generation) on a miss; pass
+                the generation to `put` so a value read before a concurrent
+                invalidation is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return False, self._generation
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store a value read while the cache was at `generation`."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys and fence off reads that started before now."""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def invalidate_objects(cache: ReadCache, *obj_ids: UUID) -> None:
+    """Drop the cached reads of the given objects and the cached listing."""
+    cache.invalidate(_LIST_ALL_KEY, *(("read", obj_id) for obj_id in obj_ids))
+
+
+class CachingProxy(PersistenceProxy[T]):
+    """Read-through caching wrapper around any PersistenceProxy.
+    `read` and `list_all` results are cached; every write through this proxy
+    invalidates the affected entries. Paged and streamed listings, and reads
+    with eager-loaded relationships, bypass the cache.
+    """
+
+    def __init__(self, proxy: PersistenceProxy[T], cache: Optional[ReadCache] = None):
+        """Initialize the caching proxy.
+        Args:
+            proxy (PersistenceProxy[T]): The proxy to read through to.
+            cache (Optional[ReadCache]): The cache to use; share one instance
+                between proxies of the same model so they see each other's writes.
+        """
+        self._proxy = proxy
+        self.cache = cache if cache is not None else ReadCache()
+
+    def _cached(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Return the cached value for a key, loading it on a miss."""
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        generation = value
+        value = load()
+        self.cache.put(key, value, generation)
+        return value
+
+    def _invalidate(self, *obj_ids: UUID) -> None:
+        """Drop the cached reads of the given objects and the cached listing."""
+        invalidate_objects(self.cache, *obj_ids)
+
+    def create(self, obj: T) -> T:
+        created = self._proxy.create(obj)
+        self._invalidate(created.id)
+        return created
+
+    def read(self, obj_id: UUID) -> T:
+        return self._cached(("read", obj_id), lambda: self._proxy.read(obj_id))
+
+    def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        found = {}
+        missing = []
+        generations = {}
+        for obj_id in obj_ids:
+            hit, value = self.cache.get(("read", obj_id))
+            if hit:
+                found[obj_id] = value
+            else:
+                missing.append(obj_id)
+                generations[obj_id] = value
+        for obj in self._proxy.read_many(missing):
+            self.cache.put(("read", obj.id), obj, generations[obj.id])
+            found[obj.id] = obj
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
+
+    def update(self, obj_id: UUID, obj: T) -> T:
+        try:
+            return self._proxy.update(obj_id, obj)
+        finally:
+            self._invalidate(obj_id)
+
+    def upsert(self, obj: T) -> T:
+        try:
+            return self._proxy.upsert(obj)
+        finally:
+            self._invalidate(obj.id)
+
+    def create_many(self, objs: List[T]) -> List[T]:
+        try:
+            return self._proxy.create_many(objs)
+        finally:
+            self._invalidate(*(obj.id for obj in objs))
+
+    def upsert_many(self, objs: List[T]) -> List[T]:
+        try:
+            return self._proxy.upsert_many(objs)
+        finally:
+            self._invalidate(*(obj.id for obj in objs))
+
+    def delete(self, obj_id: UUID) -> None:
+        try:
+            self._proxy.delete(obj_id)
+        finally:
+            self._invalidate(obj_id)
+
+    def list_all(self) -> List[T]:
+        return self._cached(_LIST_ALL_KEY, self._proxy.list_all)
+
+    def list_page(
+        self, after_id: Optional[UUID] = None, limit: int = 100, order_by: str = "id"
+    ) -> Page[T]:
+        return self._proxy.list_page(after_id, limit, order_by)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[T]:
+        return self._proxy.iter_all(batch_size)
+
+    def find_by_properties(self, filters: Dict[str, str]) -> List[T]:
+        return self._proxy.find_by_properties(filters)
+
+    def with_relationships(self, include: Sequence[str]) -> PersistenceProxy[T]:
+        # Only plain objects are cached; eager-loaded graphs bypass the cache
+        if not include:
+            return self
+        return self._proxy.with_relationships(include)
@@ -0,0 +1,313 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# change_log.py
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+from .engine_registry import ENGINE_REGISTRY, EngineRegistry
+from .sqlmodel_models import (
+    Component,
+    Password,
+    Role,
+    RoleAuth,
+    System,
+    User,
+    UserAuth,
+    utcnow,
+)
+
+logger = logging.getLogger(__name__)
+
+# Change log settings, overridable through the environment
+CHANGE_LOG_RETENTION = float(
+    os.environ.get("SAMMY_CHANGE_LOG_RETENTION", str(7 * 24 * 3600))
+)
+CHANGE_LOG_COMPACT_INTERVAL = float(
+    os.environ.get("SAMMY_CHANGE_LOG_COMPACT_INTERVAL", "300")
+)
+
+CHANGE_LOG_TABLE = "change_log"
+CHANGE_LOG_SEQUENCE = "change_log_seq"
+# Highest sequence number dropped by the retention; older cursors are expired
+CHANGE_LOG_HORIZON_TABLE = "change_log_horizon"
+
+# Object types of the change feed, named like their API collections
+CHANGE_TYPES: Dict[str, type] = {
+    "users": User,
+    "passwords": Password,
+    "roles": Role,
+    "role-auths": RoleAuth,
+    "user-auths": UserAuth,
+    "components": Component,
+    "systems": System,
+}
+TABLE_TYPES = {model.__tablename__: name for name, model in CHANGE_TYPES.items()}
+
+# Key of the changes waiting in a session's info dict
+_PENDING = "sammy_changes"
+_IDS_SQL = "SELECT CAST(unnest(string_split(:ids, ',')) AS UUID) AS id"
+
+_commit_locks: Dict[str, threading.Lock] = {}
+_commit_locks_lock = threading.Lock()
+
+
+class CursorExpiredError(LookupError):
+    """Raised when changes after a cursor were dropped by the retention."""
+
+
+@dataclass(frozen=True)
+class Change:
+    """The latest change to one object after a cursor.
+    Attributes:
+        type (str): The type name of the object, a key of CHANGE_TYPES.
+        id (UUID): The ID of the object.
+        action (str): The last action logged, e.g. "update" or "delete".
+        seq (int): The sequence number of that action.
+    """
+
+    type: str
+    id: UUID
+    action: str
+    seq: int
+
+
+@dataclass
+class ChangeBatch:
+    """Changes after a cursor, one per object, oldest first.
+    Attributes:
+        changes (List[Change]): The changes in this batch.
+        cursor (int): Cursor to pass as `since` for the following changes.
+        has_more (bool): Whether more changes follow `cursor` already.
+    """
+
+    changes: List[Change]
+    cursor: int
+    has_more: bool = False
+
+
+def record_changes(
+    session, model_cls: type, action: str, obj_ids: Iterable[UUID]
+) -> None:
+    """Remember writes to log when the session is committed by `commit_logged`.
+    Only models listed in CHANGE_TYPES are logged.
+    """
+    if model_cls.__tablename__ not in TABLE_TYPES:
+        return
+    ids = list(obj_ids)
+    if ids:
+        pending = session.info.setdefault(_PENDING, [])
+        pending.append((model_cls.__tablename__, action, ids))
+
+
+def _commit_lock(db_path: str) -> threading.Lock:
+    with _commit_locks_lock:
+        return _commit_locks.setdefault(db_path, threading.Lock())
+
+
+def commit_logged(session, db_path: str) -> None:
+    """Commit a session, appending the changes recorded on it to the log.
+    Log entries are numbered and committed under a lock per database, so
+    sequence numbers become visible in order: a reader that has seen an entry
+    has also seen every entry numbered below it. Writes with nothing to log
+    commit without the lock.
+    """
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        session.commit()
+        return
+    changed_at = utcnow()
+    with _commit_lock(db_path):
+        for table, action, ids in pending:
+            session.execute(
+                text(
+                    f"INSERT INTO {CHANGE_LOG_TABLE} "
+                    f"SELECT nextval('{CHANGE_LOG_SEQUENCE}'), :model, :action, "
+                    f"changed.id, CAST(:changed_at AS TIMESTAMP) "
+                    f"FROM ({_IDS_SQL}) AS changed"
+                ),
+                {
+                    "model": table,
+                    "action": action,
+                    "ids": ",".join(str(obj_id) for obj_id in ids),
+                    "changed_at": changed_at,
+                },
+            )
+        session.commit()
+
+
+def read_changes(
+    session,
+    since: Optional[int],
+    types: Optional[Iterable[str]] = None,
+    limit: int = 1000,
+) -> ChangeBatch:
+    """Return the latest change to each object logged after `since`.
+    Args:
+        session: An open session; its transaction gives a consistent view.
+        since (Optional[int]): Cursor from an earlier batch; None returns no
+            changes, only the current cursor to start from.
+        types (Optional[Iterable[str]]): Type names to include; all if None.
+        limit (int): Maximum number of changes returned.
+    Returns:
+        ChangeBatch: The changes, oldest first, and the cursor after them.
+    Raises:
+        ValueError: If a type name is not in CHANGE_TYPES.
+        CursorExpiredError: If changes after `since` were already dropped.
+    """
+    tables = list(TABLE_TYPES)
+    if types is not None:
+        unknown = [name for name in types if name not in CHANGE_TYPES]
+        if unknown:
+            raise ValueError(
+                f"Unknown change type {unknown[0]!r}; "
+                f"expected one of {', '.join(CHANGE_TYPES)}"
+            )
+        tables = [CHANGE_TYPES[name].__tablename__ for name in types]
+    horizon, head = session.execute(
+        text(
+            f"SELECT h.seq, greatest(h.seq, (SELECT max(seq) FROM {CHANGE_LOG_TABLE})) "
+            f"FROM {CHANGE_LOG_HORIZON_TABLE} AS h"
+        )
+    ).one()
+    if since is None:
+        return ChangeBatch(changes=[], cursor=head)
+    if since < horizon:
+        raise CursorExpiredError(
+            f"Changes up to {horizon} are no longer kept; reload and start over"
+        )
+    rows = session.execute(
+        text(
+            "SELECT model, obj_id, arg_max(action, seq), max(seq) AS last "
+            f"FROM {CHANGE_LOG_TABLE} "
+            "WHERE seq > :since AND list_contains(string_split(:tables, ','), model) "
+            "GROUP BY model, obj_id ORDER BY last LIMIT :limit"
+        ),
+        {"since": since, "tables": ",".join(tables), "limit": limit + 1},
+    ).all()
+    changes = [
+        Change(type=TABLE_TYPES[model], id=obj_id, action=action, seq=seq)
+        for model, obj_id, action, seq in rows[:limit]
+    ]
+    if len(rows) > limit:
+        return ChangeBatch(changes=changes, cursor=changes[-1].seq, has_more=True)
+    # Changes to other types up to the head need not be read again
+    return ChangeBatch(changes=changes, cursor=max(since, head))
+
+
+def compact(session, retention: float = CHANGE_LOG_RETENTION) -> int:
+    """Drop log entries older than `retention` and those superseded.
+    An entry is superseded by a later one for the same object: feeds report
+    only the latest change per object, so they are unaffected. Cursors from
+    before the dropped old entries expire.
+    Args:
+        session: An open session; committed by the caller.
+        retention (float): Seconds log entries are kept for.
+    Returns:
+        int: The number of entries dropped.
+    """
+    cutoff = utcnow() - timedelta(seconds=retention)
+    count = text(f"SELECT count(*) FROM {CHANGE_LOG_TABLE}")
+    before = session.execute(count).scalar()
+    session.execute(
+        text(
+            f"UPDATE {CHANGE_LOG_HORIZON_TABLE} SET seq = greatest(seq, "
+            f"(SELECT max(seq) FROM {CHANGE_LOG_TABLE} WHERE changed_at < :cutoff))"
+        ),
+        {"cutoff": cutoff},
+    )
+    session.execute(
+        text(
+            f"DELETE FROM {CHANGE_LOG_TABLE} "
+            f"WHERE seq <= (SELECT seq FROM {CHANGE_LOG_HORIZON_TABLE})"
+        )
+    )
+    session.execute(
+        text(
+            f"DELETE FROM {CHANGE_LOG_TABLE} WHERE seq NOT IN "
+            f"(SELECT max(seq) FROM {CHANGE_LOG_TABLE} GROUP BY model, obj_id)"
+        )
+    )
+    # DuckDB reports no row counts for these deletes
+    return before - session.execute(count).scalar()
+
+
+class ChangeLogCompactor:
+    """Periodically apply the retention to the change log and compact it.
+    Runs in the process owning the database: the single API process, the
+    primary or the write broker.
+    Attributes:
+        interval (float): Seconds between compactions.
+        retention (float): Seconds log entries are kept for.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        interval: float = CHANGE_LOG_COMPACT_INTERVAL,
+        retention: float = CHANGE_LOG_RETENTION,
+    ):
+        """Initialize the compactor; nothing runs until `start`.
+        Args:
+            db_path (str): Path to the DuckDB database file.
+            registry (EngineRegistry): Registry providing the pooled engine.
+            interval (float): Seconds between compactions once started.
+            retention (float): Seconds log entries are kept for.
+        """
+        self.interval = interval
+        self.retention = retention
+        self._db_path = db_path
+        self._registry = registry
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def compact(self) -> int:
+        """Compact the change log now, returning the number of entries dropped."""
+        _, Session = self._registry.get(self._db_path)
+        with Session() as session:
+            dropped = compact(session, self.retention)
+            session.commit()
+        return dropped
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.compact()
+            except Exception:
+                logger.exception(
+                    "Compacting the change log of %s failed", self._db_path
+                )
+
+    def start(self) -> None:
+        """Compact every `interval` seconds on a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sammy-change-log-compactor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop compacting."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -13,15 +13,23 @@
 # limitations under the License.
 
 # duckdb_proxy.py
+import copy
+import json
 import os
-from typing import Generic, List, Type, TypeVar
+import tempfile
+from typing import Dict, Generic, Iterator, List, Optional, Sequence, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import and_, inspect, or_, select, text
+from sqlalchemy.orm import joinedload
 
-from .persistence import PersistenceProxy  # replace with actual import path
-from .sqlmodel_models import SQLModel  # updated import
+from .change_log import commit_logged, record_changes
+from .engine_registry import ENGINE_REGISTRY, EngineRegistry
+from .events import CREATE, DELETE, UPDATE, UPSERT
+from .group_commit import GroupCommitWriter, WriteOp
+from .persistence import Page, PersistenceProxy  # replace with actual import path
+from .schema import ensure_schema
+from .sqlmodel_models import SQLModel, Versioned, utcnow  # updated import
 
 T = TypeVar("T", bound=SQLModel)
 
@@ -35,26 +43,76 @@ DEFAULT_DUCKDB_PATH = os.path.join(
 class DuckDBProxy(PersistenceProxy[T], Generic[T]):
     """DuckDB-backed persistence proxy using SQLModel."""
 
-    def __init__(self, model_cls: Type[T], db_path: str = DEFAULT_DUCKDB_PATH):
+    def __init__(
+        self,
+        model_cls: Type[T],
+        db_path: str = DEFAULT_DUCKDB_PATH,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        writer: Optional[GroupCommitWriter] = None,
+    ):
         """Initialize the DuckDB proxy.
         Args:
             model_cls (Type[T]): The SQLModel class to use for persistence.
             db_path (str): Path to the DuckDB database file.
+            registry (EngineRegistry): Registry supplying the pooled engine.
+            writer (Optional[GroupCommitWriter]): Writer to queue writes on so
+                they are committed in batches; each write commits on its own
+                if None.
         """
         self._model_cls = model_cls
         self._db_path = db_path
-        self._create_tables()
+        self._registry = registry
+        self._writer = writer
+        self._include: Sequence[str] = ()
+        self._versioned = issubclass(model_cls, Versioned)
+        self._fixed = {"_sa_instance_state", "version", "updated_at"} | {
+            column.key for column in inspect(model_cls).primary_key
+        }
+        ensure_schema(db_path, registry)
 
     def _create_engine(self):
-        """Create a SQLAlchemy engine and sessionmaker for DuckDB."""
-        engine = create_engine(f"duckdb:///{self._db_path}")
-        return engine, sessionmaker(bind=engine)
+        """Return the shared pooled engine and sessionmaker for DuckDB."""
+        return self._registry.get(self._db_path)
 
-    def _create_tables(self):
-        """Create tables in the DuckDB database if they do not exist."""
-        engine, _ = self._create_engine()
-        SQLModel.metadata.create_all(engine)
-        engine.dispose()
+    def with_relationships(self, include: Sequence[str]) -> "DuckDBProxy[T]":
+        """Return a proxy whose reads also load the named relationships.
+        The relationships are joined into the same SELECT, so listing objects
+        with their related rows costs one query regardless of the row count.
+        `iter_all` does not eager-load, as joined collections cannot be
+        streamed in batches.
+        Args:
+            include (Sequence[str]): Names of the relationships to load eagerly.
+        Returns:
+            DuckDBProxy[T]: A copy of this proxy with eager loading enabled.
+        Raises:
+            ValueError: If a name is not a relationship of the model.
+        """
+        relationships = inspect(self._model_cls).relationships
+        unknown = [name for name in include if name not in relationships]
+        if unknown:
+            raise ValueError(
+                f"{self._model_cls.__name__} has no relationship {unknown[0]!r}"
+            )
+        proxy = copy.copy(self)
+        proxy._include = tuple(include)
+        return proxy
+
+    def _load_options(self) -> list:
+        """Return the loader options eager-loading the included relationships."""
+        return [joinedload(getattr(self._model_cls, name)) for name in self._include]
+
+    def _write(self, op: WriteOp, *args):
+        """Run `op(session, *args)` and commit, returning its result.
+        With a group commit writer the op is queued and committed together
+        with other writes; this call still returns only once it has committed.
+        """
+        if self._writer is not None:
+            return self._writer.run(op, *args)
+        _, Session = self._create_engine()
+        with Session(expire_on_commit=False) as session:
+            result = op(session, *args)
+            commit_logged(session, self._db_path)
+        return result
 
     def create(self, obj: T) -> T:
         """Create a new object in the DuckDB database.
@@ -63,14 +121,162 @@ class DuckDBProxy(PersistenceProxy[T], Generic[T]):
         Returns:
             T: The created object with its ID populated.
         """
-        engine, Session = self._create_engine()
-        with Session() as session:
-            session.add(obj)
-            session.commit()
-            session.refresh(obj)
-        engine.dispose()
+        return self._write(self._create, obj)
+
+    def _stamp(self, objs: List[T]) -> None:
+        """Set the row version columns of objects about to be inserted."""
+        if self._versioned:
+            now = utcnow()
+            for obj in objs:
+                obj.version = 1
+                obj.updated_at = now
+
+    def _create(self, session, obj: T) -> T:
+        self._stamp([obj])
+        record_changes(session, self._model_cls, CREATE, [obj.id])
+        # Not flushed here, so a batch of creates is inserted by one flush
+        session.add(obj)
         return obj
 
+    def _insert_rows(self, session, objs: List[T], upsert: bool = False) -> None:
+        """Insert objects with a single INSERT reading a staged NDJSON file.
+        Binding Python values as statement parameters is slow in DuckDB, so the
+        rows are written to a temporary file as text and cast by DuckDB itself
+        while inserting, which is well over an order of magnitude faster.
+        With `upsert`, rows whose ID already exists are updated instead.
+        """
+        if not objs:
+            return
+        self._stamp(objs)
+        record_changes(
+            session, self._model_cls, UPSERT if upsert else CREATE, [o.id for o in objs]
+        )
+        dialect = session.get_bind().dialect
+        quote = dialect.identifier_preparer.quote
+        columns = [
+            (column.name, column.type.bind_processor(dialect))
+            for column in self._model_cls.__table__.columns
+        ]
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".ndjson", delete=False
+        ) as staging:
+            for obj in objs:
+                row = {}
+                for name, process in columns:
+                    value = getattr(obj, name)
+                    if process is not None:
+                        value = process(value)
+                    row[name] = value if value is None else str(value)
+                staging.write(json.dumps(row))
+                staging.write("\n")
+        table = quote(self._model_cls.__tablename__)
+        names = ", ".join(quote(name) for name, _ in columns)
+        types = ", ".join(f"'{name}': 'VARCHAR'" for name, _ in columns)
+        source = (
+            f"read_json(:path, format = 'newline_delimited', columns = {{{types}}})"
+        )
+        statement = f"INSERT INTO {table} ({names}) SELECT {names} FROM {source}"
+        try:
+            if upsert:
+                self._update_rows(session, objs, table, source, quote, staging.name)
+                statement += f" WHERE CAST(id AS UUID) NOT IN (SELECT id FROM {table})"
+            session.execute(text(statement), {"path": staging.name})
+        finally:
+            os.remove(staging.name)
+
+    def _update_rows(
+        self, session, objs: List[T], table: str, source: str, quote, path: str
+    ) -> None:
+        """Update the rows of staged objects whose ID already exists.
+        DuckDB rewrites a row for ON CONFLICT DO UPDATE and UPDATE ... RETURNING,
+        which its foreign keys reject while other rows reference it; a plain
+        UPDATE ... FROM changes the row in place, so existing versions are read
+        before it instead of being returned by it.
+        """
+        key = "t.id, t.version" if self._versioned else "t.id"
+        existing = session.execute(
+            text(
+                f"SELECT {key} FROM {table} AS t "
+                f"JOIN {source} AS s ON t.id = CAST(s.id AS UUID)"
+            ),
+            {"path": path},
+        ).all()
+        if not existing:
+            return
+        assignments = ", ".join(
+            (
+                "version = t.version + 1"
+                if self._versioned and column.name == "version"
+                else f"{quote(column.name)} = s.{quote(column.name)}"
+            )
+            for column in self._model_cls.__table__.columns
+            if not column.primary_key
+        )
+        session.execute(
+            text(
+                f"UPDATE {table} AS t SET {assignments} FROM {source} AS s "
+                "WHERE t.id = CAST(s.id AS UUID)"
+            ),
+            {"path": path},
+        )
+        if self._versioned:
+            versions = dict(existing)
+            for obj in objs:
+                if obj.id in versions:
+                    obj.version = versions[obj.id] + 1
+
+    def create_many(self, objs: List[T]) -> List[T]:
+        """Create several objects in a single transaction.
+        Args:
+            objs (List[T]): The objects to create.
+        Returns:
+            List[T]: The created objects.
+        Raises:
+            sqlalchemy.exc.IntegrityError: If any object violates a constraint;
+                no object is created in that case.
+        """
+        self._write(self._insert_rows, objs)
+        return objs
+
+    def upsert(self, obj: T) -> T:
+        """Insert an object, or update it if its ID already exists.
+        Args:
+            obj (T): The object to insert or update.
+        Returns:
+            T: The object as stored.
+        """
+        return self._write(self._upsert, obj)
+
+    def _upsert(self, session, obj: T) -> T:
+        # Updated through the ORM rather than INSERT ... ON CONFLICT, which
+        # DuckDB rejects for rows referenced by a foreign key
+        existing = session.get(self._model_cls, obj.id)
+        if existing is None:
+            self._stamp([obj])
+            session.add(obj)
+            existing = obj
+        else:
+            self._assign(existing, obj)
+            session.flush()
+        record_changes(session, self._model_cls, UPSERT, [obj.id])
+        return existing
+
+    def upsert_many(self, objs: List[T]) -> List[T]:
+        """Insert several objects in one transaction, updating those that exist.
+        Args:
+            objs (List[T]): The objects to insert or update.
+        Returns:
+            List[T]: The objects written, one per ID: the last one given.
+        Raises:
+            sqlalchemy.exc.IntegrityError: If any object violates a constraint;
+                no object is written in that case.
+        """
+        # DuckDB rejects a statement that updates the same key twice, so only
+        # the last object given for each ID is written
+        written = list({obj.id: obj for obj in objs}.values())
+        self._write(self._insert_rows, written, True)
+        return written
+
     def read(self, obj_id: UUID) -> T:
         """Read an object from the DuckDB database by its ID.
         Args:
@@ -80,14 +286,46 @@ class DuckDBProxy(PersistenceProxy[T], Generic[T]):
         Raises:
             KeyError: If the object with the specified ID does not exist.
         """
-        engine, Session = self._create_engine()
+        _, Session = self._create_engine()
         with Session() as session:
-            result = session.get(self._model_cls, obj_id)
+            result = session.get(self._model_cls, obj_id, options=self._load_options())
             if not result:
                 raise KeyError(f"Object with ID {obj_id} not found")
-        engine.dispose()
         return result
 
+    def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        """Read several objects with a single WHERE id IN (...) query.
+        The IDs are bound as one comma-separated string split by DuckDB, which
+        is far cheaper than binding a parameter per ID.
+        Args:
+            obj_ids (List[UUID]): The IDs of the objects to read.
+        Returns:
+            List[T]: The objects found, in the order of `obj_ids`; missing IDs
+                are skipped.
+        """
+        if not obj_ids:
+            return []
+        id_column = self._model_cls.__table__.columns["id"]
+        _, Session = self._create_engine()
+        with Session() as session:
+            results = (
+                session.scalars(
+                    select(self._model_cls)
+                    .where(
+                        id_column.in_(
+                            text(
+                                "SELECT CAST(unnest(string_split(:ids, ',')) AS UUID)"
+                            ).bindparams(ids=",".join(str(i) for i in set(obj_ids)))
+                        )
+                    )
+                    .options(*self._load_options())
+                )
+                .unique()
+                .all()
+            )
+        by_id = {obj.id: obj for obj in results}
+        return [by_id[obj_id] for obj_id in obj_ids if obj_id in by_id]
+
     def update(self, obj_id: UUID, obj: T) -> T:
         """Update an existing object in the DuckDB database.
         Args:
@@ -98,18 +336,30 @@ class DuckDBProxy(PersistenceProxy[T], Generic[T]):
         Raises:
             KeyError: If the object with the specified ID does not exist.
         """
-        engine, Session = self._create_engine()
-        with Session() as session:
-            existing = session.get(self._model_cls, obj_id)
-            if not existing:
-                raise KeyError(f"Object with ID {obj_id} not found")
-            for key, value in vars(obj).items():
-                if key != "_sa_instance_state":
-                    setattr(existing, key, value)
-            session.commit()
-        engine.dispose()
+        return self._write(self._update, obj_id, obj)
+
+    def _update(self, session, obj_id: UUID, obj: T) -> T:
+        existing = session.get(self._model_cls, obj_id)
+        if not existing:
+            raise KeyError(f"Object with ID {obj_id} not found")
+        self._assign(existing, obj)
+        session.flush()
+        record_changes(session, self._model_cls, UPDATE, [obj_id])
         return existing
 
+    def _assign(self, existing: T, obj: T) -> None:
+        """Copy the fields of `obj` onto a loaded row and bump its version.
+        The primary key is never assigned: DuckDB rejects any write to a key
+        referenced by a foreign key, even of the same value, and the row's own
+        ID wins over one in `obj`.
+        """
+        for key, value in vars(obj).items():
+            if key not in self._fixed:
+                setattr(existing, key, value)
+        if self._versioned:
+            existing.version += 1
+            existing.updated_at = utcnow()
+
     def delete(self, obj_id: UUID) -> None:
         """Delete an object from the DuckDB database by its ID.
         Args:
@@ -117,25 +367,118 @@ class DuckDBProxy(PersistenceProxy[T], Generic[T]):
         Raises:
             KeyError: If the object with the specified ID does not exist.
         """
-        engine, Session = self._create_engine()
-        with Session() as session:
-            obj = session.get(self._model_cls, obj_id)
-            if obj:
-                session.delete(obj)
-                session.commit()
-        engine.dispose()
+        self._write(self._delete, obj_id)
+
+    def _delete(self, session, obj_id: UUID) -> None:
+        obj = session.get(self._model_cls, obj_id)
+        if not obj:
+            raise KeyError(f"Object with ID {obj_id} not found")
+        session.delete(obj)
+        session.flush()
+        record_changes(session, self._model_cls, DELETE, [obj_id])
 
     def list_all(self) -> List[T]:
         """List all objects in the DuckDB database.
         Returns:
             List[T]: A list of all objects in the database.
         """
-        engine, Session = self._create_engine()
+        _, Session = self._create_engine()
         with Session() as session:
-            results = session.scalars(select(self._model_cls)).all()
-        engine.dispose()
+            results = (
+                session.scalars(select(self._model_cls).options(*self._load_options()))
+                .unique()
+                .all()
+            )
         return results
 
+    def list_page(
+        self, after_id: Optional[UUID] = None, limit: int = 100, order_by: str = "id"
+    ) -> Page[T]:
+        """List one page of objects using keyset pagination on (order_by, id).
+        Args:
+            after_id (Optional[UUID]): ID of the last object of the previous page.
+            limit (int): Maximum number of objects to return.
+            order_by (str): Name of the column to order by.
+        Returns:
+            Page[T]: The objects on the page and the cursor for the next one.
+        Raises:
+            ValueError: If `order_by` is not a column of the model.
+            KeyError: If the object with ID `after_id` does not exist.
+        """
+        table = self._model_cls.__table__
+        if order_by not in table.columns:
+            raise ValueError(f"Cannot order by unknown column {order_by!r}")
+        column = table.columns[order_by]
+        id_column = table.columns["id"]
+        statement = select(self._model_cls).options(*self._load_options())
+        _, Session = self._create_engine()
+        with Session() as session:
+            if after_id is not None:
+                anchor = session.execute(
+                    select(column).where(id_column == after_id)
+                ).first()
+                if anchor is None:
+                    raise KeyError(f"Object with ID {after_id} not found")
+                if column is id_column:
+                    statement = statement.where(id_column > after_id)
+                else:
+                    statement = statement.where(
+                        or_(
+                            column > anchor[0],
+                            and_(column == anchor[0], id_column > after_id),
+                        )
+                    )
+            statement = statement.order_by(column, id_column).limit(limit + 1)
+            results = list(session.scalars(statement).unique().all())
+        has_more = len(results) > limit
+        items = results[:limit]
+        return Page(items=items, next_cursor=items[-1].id if has_more else None)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[T]:
+        """Stream all objects from a single query, fetching `batch_size` rows at a time.
+        The session (and its pooled connection) stays open until the generator
+        is exhausted or closed.
+        Args:
+            batch_size (int): Number of rows fetched from the cursor per batch.
+        Yields:
+            T: Each object in the database.
+        """
+        statement = select(self._model_cls).execution_options(yield_per=batch_size)
+        _, Session = self._create_engine()
+        with Session() as session:
+            for partition in session.scalars(statement).partitions():
+                yield from partition
+
+    def find_by_properties(self, filters: Dict[str, str]) -> List[T]:
+        """List the objects having every given property key/value pair.
+        Each pair compiles to an EXISTS predicate over the unnested JSON
+        `properties` list, so the filtering runs inside DuckDB and only
+        matching rows are returned.
+        Args:
+            filters (Dict[str, str]): Required value for each property key;
+                non-string values are compared in their JSON form.
+        Returns:
+            List[T]: The matching objects, ordered by ID.
+        Raises:
+            ValueError: If the model has no `properties` column.
+        """
+        table = self._model_cls.__table__
+        if "properties" not in table.columns:
+            raise ValueError(f"{self._model_cls.__name__} has no properties")
+        statement = select(self._model_cls).options(*self._load_options())
+        for n, (key, value) in enumerate(filters.items()):
+            statement = statement.where(
+                text(
+                    "EXISTS (SELECT 1 FROM unnest(CAST(properties AS JSON[])) "
+                    f"AS prop(entry) WHERE (entry->>'key') = :key{n} "
+                    f"AND (entry->>'value') = :value{n})"
+                ).bindparams(**{f"key{n}": key, f"value{n}": value})
+            )
+        statement = statement.order_by(table.columns["id"])
+        _, Session = self._create_engine()
+        with Session() as session:
+            return list(session.scalars(statement).unique().all())
+
 
 # Example usage:
 # from .sqlmodel_models import User
@@ -0,0 +1,138 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# engine_registry.py
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+# Pool settings, overridable through the environment
+DEFAULT_POOL_SIZE = int(os.environ.get("SAMMY_DB_POOL_SIZE", "5"))
+DEFAULT_MAX_OVERFLOW = int(os.environ.get("SAMMY_DB_MAX_OVERFLOW", "10"))
+DEFAULT_POOL_TIMEOUT = float(os.environ.get("SAMMY_DB_POOL_TIMEOUT", "30"))
+DEFAULT_POOL_RECYCLE = int(os.environ.get("SAMMY_DB_POOL_RECYCLE", "-1"))
+# Off by default: a local DuckDB file has no server connection to go stale
+DEFAULT_POOL_PRE_PING = os.environ.get("SAMMY_DB_POOL_PRE_PING", "0") == "1"
+
+
+class EngineRegistry:
+    """Process-wide registry of pooled SQLAlchemy engines keyed by database path.
+    Engines are created lazily on first use and live until `dispose` is called,
+    so callers share pooled DuckDB connections instead of opening the database
+    file on every operation.
+    Attributes:
+        pool_size (int): Number of connections kept open per engine.
+        max_overflow (int): Extra connections allowed above `pool_size`.
+        pool_timeout (float): Seconds to wait for a free connection.
+        pool_recycle (int): Seconds after which connections are recycled (-1 = never).
+        pool_pre_ping (bool): Test each connection with a query on checkout.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_overflow: int = DEFAULT_MAX_OVERFLOW,
+        pool_timeout: float = DEFAULT_POOL_TIMEOUT,
+        pool_recycle: int = DEFAULT_POOL_RECYCLE,
+        pool_pre_ping: bool = DEFAULT_POOL_PRE_PING,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        self._engines: Dict[str, Tuple[Engine, sessionmaker]] = {}
+        self._redirects: Dict[str, Callable[[], str]] = {}
+        self._lock = threading.Lock()
+
+    def redirect(self, db_path: str, resolve: Optional[Callable[[], str]]) -> None:
+        """Serve a database path from another, read-only database file.
+        Every later `get(db_path)` returns the read-only engine for the path
+        `resolve()` returns at that moment, which is how snapshot replicas
+        point the whole application at the latest snapshot.
+        Args:
+            db_path (str): Path requested by callers.
+            resolve (Optional[Callable[[], str]]): Returns the path to open
+                instead; None removes the redirect.
+        """
+        with self._lock:
+            if resolve is None:
+                self._redirects.pop(db_path, None)
+            else:
+                self._redirects[db_path] = resolve
+
+    def get(self, db_path: str, read_only: bool = False) -> Tuple[Engine, sessionmaker]:
+        """Return the shared engine and sessionmaker for a database path.
+        Args:
+            db_path (str): Path to the DuckDB database file.
+            read_only (bool): Open the file read-only if the engine is created
+                by this call.
+        Returns:
+            Tuple[Engine, sessionmaker]: The pooled engine and its sessionmaker.
+        """
+        resolve = self._redirects.get(db_path)
+        if resolve is not None:
+            db_path, read_only = resolve(), True
+        entry = self._engines.get(db_path)
+        if entry is not None:
+            return entry
+        with self._lock:
+            entry = self._engines.get(db_path)
+            if entry is None:
+                engine = create_engine(
+                    f"duckdb:///{db_path}",
+                    pool_size=self.pool_size,
+                    max_overflow=self.max_overflow,
+                    pool_timeout=self.pool_timeout,
+                    pool_recycle=self.pool_recycle,
+                    pool_pre_ping=self.pool_pre_ping,
+                    connect_args={"read_only": True} if read_only else {},
+                )
+                entry = (engine, sessionmaker(bind=engine))
+                self._engines[db_path] = entry
+        return entry
+
+    def health_check(self) -> Dict[str, bool]:
+        """Run a trivial query against every registered engine.
+        Returns:
+            Dict[str, bool]: Health status keyed by database path.
+        """
+        status = {}
+        for db_path, (engine, _) in list(self._engines.items()):
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                status[db_path] = True
+            except Exception:
+                status[db_path] = False
+        return status
+
+    def dispose(self, db_path: Optional[str] = None) -> None:
+        """Dispose of one engine, or of every engine when no path is given.
+        Args:
+            db_path (Optional[str]): Path of the engine to dispose.
+        """
+        with self._lock:
+            paths = [db_path] if db_path is not None else list(self._engines)
+            for path in paths:
+                entry = self._engines.pop(path, None)
+                if entry is not None:
+                    entry[0].dispose()
+
+
+ENGINE_REGISTRY = EngineRegistry()
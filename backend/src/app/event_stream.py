@@ -0,0 +1,277 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# event_stream.py
+import asyncio
+import json
+import os
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional, Set, Tuple
+from uuid import UUID
+
+from .change_log import TABLE_TYPES
+from .events import EVENT_BUS, ChangeEvent, EventBus
+
+# Event stream settings, overridable through the environment
+EVENT_STREAM_COALESCE = (
+    float(os.environ.get("SAMMY_EVENT_STREAM_COALESCE_MS", "100")) / 1000
+)
+EVENT_STREAM_MAX_PENDING = int(os.environ.get("SAMMY_EVENT_STREAM_MAX_PENDING", "1000"))
+EVENT_STREAM_KEEPALIVE = float(os.environ.get("SAMMY_EVENT_STREAM_KEEPALIVE", "15"))
+
+Key = Tuple[str, UUID]
+
+
+class Subscription:
+    """Changes waiting for one subscriber, coalesced per object.
+    Only the latest action of each object is kept, so a burst of writes to
+    the same objects costs one entry each however long it lasts. At most
+    `max_pending` objects are kept: beyond that the changes are dropped and
+    the subscriber is told to resync instead, so a slow subscriber holds a
+    bounded amount of memory. Used on the event loop thread only.
+    Attributes:
+        types (Optional[FrozenSet[str]]): Type names received; all if None.
+        ids (Optional[FrozenSet[UUID]]): Object IDs received; all if None.
+        closed (bool): Whether the broadcaster has stopped.
+    """
+
+    __slots__ = (
+        "types",
+        "ids",
+        "closed",
+        "_max_pending",
+        "_pending",
+        "_overflowed",
+        "_ready",
+    )
+
+    def __init__(
+        self,
+        types: Optional[FrozenSet[str]] = None,
+        ids: Optional[FrozenSet[UUID]] = None,
+        max_pending: int = EVENT_STREAM_MAX_PENDING,
+    ):
+        self.types = types
+        self.ids = ids
+        self.closed = False
+        self._max_pending = max_pending
+        self._pending: Dict[Key, str] = {}
+        self._overflowed = False
+        self._ready = asyncio.Event()
+
+    def offer(self, type_name: str, obj_id: UUID, action: str) -> None:
+        """Add a change, replacing an earlier one to the same object."""
+        if self.ids is not None and obj_id not in self.ids:
+            return
+        if self._overflowed:
+            return
+        key = (type_name, obj_id)
+        if self._pending.pop(key, None) is None:
+            if len(self._pending) >= self._max_pending:
+                self.resync()
+                return
+        # Reinserted, so the changes stay ordered by their latest write
+        self._pending[key] = action
+        self._ready.set()
+
+    def resync(self) -> None:
+        """Drop the pending changes and tell the subscriber to reload."""
+        self._pending = {}
+        self._overflowed = True
+        self._ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def next_batch(
+        self, timeout: float, coalesce: float = EVENT_STREAM_COALESCE
+    ) -> Optional[Tuple[List[Dict[str, str]], bool]]:
+        """Wait for changes and take them all.
+        Once the first change arrives, further changes are gathered for
+        `coalesce` seconds, so a burst is delivered as one batch.
+        Args:
+            timeout (float): Seconds to wait for the first change.
+            coalesce (float): Seconds to gather more changes after it.
+        Returns:
+            Optional[Tuple[List[Dict[str, str]], bool]]: The changes as
+                {"type", "id", "action"} dicts and whether the subscriber must
+                resync, or None if nothing arrived within `timeout`.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if coalesce > 0 and not self.closed:
+            await asyncio.sleep(coalesce)
+        self._ready.clear()
+        changes = [
+            {"type": type_name, "id": str(obj_id), "action": action}
+            for (type_name, obj_id), action in self._pending.items()
+        ]
+        overflowed = self._overflowed
+        self._pending = {}
+        self._overflowed = False
+        return changes, overflowed
+
+
+class ChangeBroadcaster:
+    """Fan change events out from the event bus to streaming subscribers.
+    Events are published on the threads that commit writes; each is handed to
+    the event loop once, however many subscribers there are, and offered
+    there only to the subscribers of its type. Subscribers waiting for
+    changes are idle coroutines, so they cost next to nothing.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus = EVENT_BUS,
+        max_pending: int = EVENT_STREAM_MAX_PENDING,
+    ):
+        """Initialize the broadcaster; events are received from `start`.
+        Args:
+            bus (EventBus): The bus to receive change events from.
+            max_pending (int): Maximum objects pending per subscriber.
+        """
+        self.max_pending = max_pending
+        self._bus = bus
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Subscribers by type name; those of every type under None
+        self._by_type: Dict[Optional[str], Set[Subscription]] = {}
+        self._count = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Deliver the bus's events to subscribers on `loop`."""
+        self._loop = loop
+        self._bus.subscribe(self._receive)
+
+    def stop(self) -> None:
+        """Stop receiving events and end every subscription."""
+        self._bus.unsubscribe(self._receive)
+        self._loop = None
+        for subscribers in self._by_type.values():
+            for subscription in subscribers:
+                subscription.close()
+        self._by_type = {}
+        self._count = 0
+
+    def subscribers(self) -> int:
+        """Return the number of open subscriptions."""
+        return self._count
+
+    def subscribe(
+        self,
+        types: Optional[List[str]] = None,
+        ids: Optional[List[UUID]] = None,
+    ) -> Subscription:
+        """Open a subscription; call on the event loop.
+        Args:
+            types (Optional[List[str]]): Type names to receive; all if None.
+            ids (Optional[List[UUID]]): Object IDs to receive; all if None.
+        Returns:
+            Subscription: The subscription, to pass to `unsubscribe` when done.
+        Raises:
+            ValueError: If a type name is unknown.
+        """
+        if types is not None:
+            known = set(TABLE_TYPES.values())
+            unknown = [name for name in types if name not in known]
+            if unknown:
+                raise ValueError(
+                    f"Unknown change type {unknown[0]!r}; "
+                    f"expected one of {', '.join(TABLE_TYPES.values())}"
+                )
+        subscription = Subscription(
+            frozenset(types) if types is not None else None,
+            frozenset(ids) if ids is not None else None,
+            self.max_pending,
+        )
+        for type_name in subscription.types or (None,):
+            self._by_type.setdefault(type_name, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Close a subscription; unknown subscriptions are ignored."""
+        removed = False
+        for type_name in subscription.types or (None,):
+            subscribers = self._by_type.get(type_name)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                removed = True
+                if not subscribers:
+                    del self._by_type[type_name]
+        if removed:
+            self._count -= 1
+
+    def resync(self) -> None:
+        """Tell every subscriber to reload, e.g. after events were missed.
+        Safe to call from any thread.
+        """
+        loop = self._loop
+        if loop is not None and self._count:
+            loop.call_soon_threadsafe(self._resync_all)
+
+    def _resync_all(self) -> None:
+        for subscribers in list(self._by_type.values()):
+            for subscription in subscribers:
+                subscription.resync()
+
+    def _receive(self, event: ChangeEvent) -> None:
+        """Bus listener: pass the event to the event loop."""
+        loop = self._loop
+        if loop is None or not self._count:
+            return
+        type_name = TABLE_TYPES.get(getattr(event.model, "__tablename__", None))
+        if type_name is None:
+            return
+        try:
+            loop.call_soon_threadsafe(
+                self._dispatch, type_name, event.obj_id, event.action
+            )
+        except RuntimeError:
+            # The loop has been closed
+            pass
+
+    def _dispatch(self, type_name: str, obj_id: UUID, action: str) -> None:
+        for key in (type_name, None):
+            for subscription in self._by_type.get(key, ()):
+                subscription.offer(type_name, obj_id, action)
+
+
+async def server_sent_events(
+    subscription: Subscription,
+    keepalive: float = EVENT_STREAM_KEEPALIVE,
+    coalesce: float = EVENT_STREAM_COALESCE,
+) -> AsyncIterator[str]:
+    """Render a subscription as a text/event-stream body.
+    Each batch of changes is one `changes` event whose data is a JSON list of
+    {"type", "id", "action"}; a `resync` event means changes were dropped
+    and the subscriber should reload. A comment line is sent after
+    `keepalive` idle seconds, which also detects closed connections.
+    """
+    yield ": connected\n\n"
+    while not subscription.closed:
+        batch = await subscription.next_batch(keepalive, coalesce)
+        if batch is None:
+            yield ": keepalive\n\n"
+            continue
+        changes, overflowed = batch
+        if overflowed:
+            yield "event: resync\ndata: {}\n\n"
+        if changes:
+            yield f"event: changes\ndata: {json.dumps(changes)}\n\n"
+
+
+# Process-wide broadcaster, started by the API
+CHANGE_BROADCASTER = ChangeBroadcaster()
@@ -0,0 +1,164 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# events.py
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from .persistence import Page, PersistenceProxy
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Change actions; "upsert" is used when the backend cannot tell the two apart
+CREATE = "create"
+UPDATE = "update"
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A committed write to one object.
+    Attributes:
+        model (type): The model class of the object written.
+        action (str): One of CREATE, UPDATE, UPSERT or DELETE.
+        obj_id (UUID): The ID of the object written.
+        obj (Optional[Any]): The object as written; None for DELETE, and for
+            UPDATE when only the object's links changed.
+    """
+
+    model: type
+    action: str
+    obj_id: UUID
+    obj: Optional[Any] = None
+
+
+Listener = Callable[[ChangeEvent], None]
+
+
+class EventBus:
+    """Synchronous publish/subscribe hub for change events.
+    Listeners run on the thread that committed the write, in subscription
+    order; they must be quick and thread-safe. A failing listener is logged and
+    does not affect the write or the other listeners.
+    """
+
+    def __init__(self):
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Listener) -> None:
+        """Register a listener for every subsequent event."""
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """Remove a listener; unknown listeners are ignored."""
+        with self._lock:
+            self._listeners = [cb for cb in self._listeners if cb is not listener]
+
+    def publish(self, event: ChangeEvent) -> None:
+        """Deliver an event to every listener."""
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Change listener %r failed", listener)
+
+
+EVENT_BUS = EventBus()
+
+
+class PublishingProxy(PersistenceProxy[T]):
+    """Wrapper publishing a ChangeEvent for every successful write.
+    Events carry the objects returned by the wrapped proxy, i.e. as stored.
+    Reads are delegated unchanged; failed writes, including deletes of
+    missing objects, publish nothing.
+    """
+
+    def __init__(
+        self, proxy: PersistenceProxy[T], model_cls: type, bus: EventBus = EVENT_BUS
+    ):
+        """Initialize the publishing proxy.
+        Args:
+            proxy (PersistenceProxy[T]): The proxy performing the writes.
+            model_cls (type): The model class reported in the events.
+            bus (EventBus): The bus the events are published on.
+        """
+        self._proxy = proxy
+        self._model_cls = model_cls
+        self._bus = bus
+
+    def _publish(self, action: str, obj_id: UUID, obj: Optional[T] = None) -> None:
+        self._bus.publish(ChangeEvent(self._model_cls, action, obj_id, obj))
+
+    def create(self, obj: T) -> T:
+        created = self._proxy.create(obj)
+        self._publish(CREATE, created.id, created)
+        return created
+
+    def read(self, obj_id: UUID) -> T:
+        return self._proxy.read(obj_id)
+
+    def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        return self._proxy.read_many(obj_ids)
+
+    def update(self, obj_id: UUID, obj: T) -> T:
+        updated = self._proxy.update(obj_id, obj)
+        self._publish(UPDATE, obj_id, updated)
+        return updated
+
+    def upsert(self, obj: T) -> T:
+        upserted = self._proxy.upsert(obj)
+        self._publish(UPSERT, upserted.id, upserted)
+        return upserted
+
+    def create_many(self, objs: List[T]) -> List[T]:
+        created = self._proxy.create_many(objs)
+        for obj in created:
+            self._publish(CREATE, obj.id, obj)
+        return created
+
+    def upsert_many(self, objs: List[T]) -> List[T]:
+        upserted = self._proxy.upsert_many(objs)
+        for obj in upserted:
+            self._publish(UPSERT, obj.id, obj)
+        return upserted
+
+    def delete(self, obj_id: UUID) -> None:
+        self._proxy.delete(obj_id)
+        self._publish(DELETE, obj_id)
+
+    def list_all(self) -> List[T]:
+        return self._proxy.list_all()
+
+    def list_page(
+        self, after_id: Optional[UUID] = None, limit: int = 100, order_by: str = "id"
+    ) -> Page[T]:
+        return self._proxy.list_page(after_id, limit, order_by)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[T]:
+        return self._proxy.iter_all(batch_size)
+
+    def find_by_properties(self, filters: Dict[str, str]) -> List[T]:
+        return self._proxy.find_by_properties(filters)
+
+    def with_relationships(self, include: Sequence[str]) -> PersistenceProxy[T]:
+        # Reads only, so the unwrapped proxy will do
+        return self._proxy.with_relationships(include)
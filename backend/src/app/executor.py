@@ -0,0 +1,121 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# executor.py
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Optional
+
+# Database executor settings, overridable through the environment
+DB_WORKERS = int(os.environ.get("SAMMY_DB_WORKERS", "8"))
+DB_MAX_PENDING = int(os.environ.get("SAMMY_DB_MAX_PENDING", "256"))
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a bounded executor already has `max_pending` calls in flight."""
+
+
+class BoundedExecutor:
+    """Run blocking calls from async code on an executor with a bounded queue.
+    At most `max_pending` calls may be running or queued at once; further calls
+    fail immediately with ExecutorSaturatedError instead of queueing without
+    limit, so callers can shed load explicitly.
+    Attributes:
+        name (str): Name used in thread names and statistics.
+        max_pending (int): Maximum number of calls running or waiting.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_pending: int,
+        factory: Callable[[], Executor],
+    ):
+        """Initialize the bounded executor.
+        Args:
+            name (str): Name used in thread names and statistics.
+            max_pending (int): Maximum number of calls running or waiting.
+            factory (Callable[[], Executor]): Creates the underlying executor;
+                called lazily, and again after `shutdown`.
+        """
+        self.name = name
+        self.max_pending = max_pending
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _acquire(self) -> Executor:
+        """Reserve a slot and return the executor, creating it if needed."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"{self.name} executor has {self._pending} calls pending"
+                )
+            self._pending += 1
+            if self._executor is None:
+                self._executor = self._factory()
+            return self._executor
+
+    def _release(self) -> None:
+        """Free the slot reserved by `_acquire`."""
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run `fn(*args, **kwargs)` on the executor and await its result.
+        Raises:
+            ExecutorSaturatedError: If `max_pending` calls are already in flight.
+        """
+        executor = self._acquire()
+        try:
+            future = executor.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # Released when the call finishes, not when the awaiting coroutine
+        # does: a cancelled caller leaves the call running in its slot
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current queue depth and lifetime counters."""
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut the underlying executor down; it is recreated on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+DB_EXECUTOR = BoundedExecutor(
+    "database",
+    DB_MAX_PENDING,
+    lambda: ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="sammy-db"),
+)
@@ -0,0 +1,178 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# group_commit.py
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .change_log import commit_logged
+from .engine_registry import ENGINE_REGISTRY, EngineRegistry
+
+# Group commit settings, overridable through the environment
+GROUP_COMMIT = os.environ.get("SAMMY_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_OPS = int(os.environ.get("SAMMY_GROUP_COMMIT_MAX_OPS", "64"))
+GROUP_COMMIT_MAX_DELAY = (
+    float(os.environ.get("SAMMY_GROUP_COMMIT_MAX_DELAY_MS", "0")) / 1000
+)
+
+# A write operation: called with an open session, must not commit it
+WriteOp = Callable[..., Any]
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single writer thread committing queued writes in shared transactions.
+    DuckDB admits one writer at a time, so concurrent writers otherwise queue
+    on the write lock and pay for a commit each. Here every write is queued
+    and one thread runs up to `max_ops` of them, gathered for at most
+    `max_delay` seconds after the first, in a single transaction. With the
+    default delay of zero a batch is whatever queued up while the previous
+    one was committing, so a lone writer is not slowed down.
+    Each caller still gets its own result or exception through a Future. If
+    any write in a batch fails, the batch is rolled back and each write is
+    retried in its own transaction, since DuckDB has no savepoints to undo
+    just the failing write; a failure therefore affects only its caller.
+    Attributes:
+        max_ops (int): Maximum number of writes committed together.
+        max_delay (float): Seconds to wait for more writes after the first.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        max_ops: int = GROUP_COMMIT_MAX_OPS,
+        max_delay: float = GROUP_COMMIT_MAX_DELAY,
+    ):
+        """Initialize the writer; its thread starts on the first write.
+        Args:
+            db_path (str): Path to the DuckDB database file.
+            registry (EngineRegistry): Registry providing the pooled engine.
+            max_ops (int): Maximum number of writes committed together.
+            max_delay (float): Seconds to wait for more writes after the first.
+        """
+        self.max_ops = max_ops
+        self.max_delay = max_delay
+        self._db_path = db_path
+        self._registry = registry
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._ops = 0
+        self._retried = 0
+        self._largest = 0
+
+    def submit(self, op: WriteOp, *args) -> Future:
+        """Queue `op(session, *args)` to run in the next committed batch.
+        Returns:
+            Future: Resolves to the op's return value once its transaction has
+                committed, or to the exception the op or the commit raised.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sammy-group-commit", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((op, args, future))
+        return future
+
+    def run(self, op: WriteOp, *args) -> Any:
+        """Queue `op(session, *args)` and wait for it to commit."""
+        return self.submit(op, *args).result()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_ops:
+                try:
+                    item = self._queue.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _execute(self, ops: List[Tuple[WriteOp, tuple, Future]]) -> List[Any]:
+        """Run ops in one transaction and commit, returning their results."""
+        _, Session = self._registry.get(self._db_path)
+        with Session(expire_on_commit=False) as session:
+            results = [op(session, *args) for op, args, _ in ops]
+            commit_logged(session, self._db_path)
+        return results
+
+    def _commit(self, batch: List[Tuple[WriteOp, tuple, Future]]) -> None:
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        with self._lock:
+            self._batches += 1
+            self._ops += len(batch)
+            self._largest = max(self._largest, len(batch))
+        try:
+            results = self._execute(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][2].set_exception(e)
+                return
+            with self._lock:
+                self._retried += 1
+            for item in batch:
+                try:
+                    item[2].set_result(self._execute([item])[0])
+                except Exception as e:
+                    item[2].set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the batch counters and the mean batch size."""
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "ops": self._ops,
+                "mean_batch": self._ops / self._batches if self._batches else 0.0,
+                "largest_batch": self._largest,
+                "retried_batches": self._retried,
+            }
+
+    def shutdown(self) -> None:
+        """Commit the writes already queued, then stop the thread.
+        The thread is started again by the next write.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join()
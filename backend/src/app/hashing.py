@@ -0,0 +1,146 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# hashing.py
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import bcrypt
+
+from .authentication import Authentication
+from .executor import BoundedExecutor
+
+# Hashing pool settings, overridable through the environment
+HASH_WORKERS = int(
+    os.environ.get("SAMMY_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+HASH_MAX_PENDING = int(os.environ.get("SAMMY_HASH_MAX_PENDING", "64"))
+
+
+def _timed(fn: Callable, *args) -> Tuple[float, float, Any]:
+    """Run `fn(*args)` in a pool worker, returning its start and end times.
+    time.monotonic reads the system-wide monotonic clock on Linux, so the times
+    can be compared with those taken in the parent process.
+    """
+    started = time.monotonic()
+    result = fn(*args)
+    return started, time.monotonic(), result
+
+
+class HashMetrics:
+    """Counters separating time spent queued from time spent hashing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def record(self, queue_wait: float, hash_time: float) -> None:
+        """Record one completed call."""
+        with self._lock:
+            self.count += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.hash_time_total += hash_time
+            self.hash_time_max = max(self.hash_time_max, hash_time)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the call count and the mean/max queue wait and hash time."""
+        with self._lock:
+            count = self.count or 1
+            return {
+                "count": self.count,
+                "queue_wait_avg": self.queue_wait_total / count,
+                "queue_wait_max": self.queue_wait_max,
+                "hash_time_avg": self.hash_time_total / count,
+                "hash_time_max": self.hash_time_max,
+            }
+
+
+# Workers are started by a forkserver: forking the API process itself would
+# copy its open DuckDB connections and the locks held by its other threads
+HASH_EXECUTOR = BoundedExecutor(
+    "hashing",
+    HASH_MAX_PENDING,
+    lambda: ProcessPoolExecutor(
+        max_workers=HASH_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+    ),
+)
+HASH_METRICS = HashMetrics()
+
+
+@lru_cache(maxsize=None)
+def default_authentication() -> Authentication:
+    """Return the Authentication loaded from the resources directory."""
+    return Authentication()
+
+
+class HashingService:
+    """Async bcrypt hashing and verification on a bounded process pool.
+    bcrypt is deliberately slow and CPU-bound, so it runs in worker processes
+    with their own queue rather than on the event loop or the database threads;
+    a login spike then only delays other logins. When `max_pending` hashes are
+    already queued, calls fail fast with ExecutorSaturatedError, which the API
+    turns into a 503.
+    """
+
+    def __init__(
+        self,
+        auth: Optional[Authentication] = None,
+        executor: BoundedExecutor = HASH_EXECUTOR,
+        metrics: HashMetrics = HASH_METRICS,
+    ):
+        """Initialize the hashing service.
+        Args:
+            auth (Optional[Authentication]): Supplies the stored salt; loaded
+                from the resources directory by default.
+            executor (BoundedExecutor): The executor the hashes run on.
+            metrics (HashMetrics): Where queue wait and hash times are recorded.
+        """
+        self.auth = auth if auth is not None else default_authentication()
+        self._executor = executor
+        self._metrics = metrics
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        """Run a bcrypt call on the pool and record its timings."""
+        submitted = time.monotonic()
+        started, finished, result = await self._executor.run(_timed, fn, *args)
+        self._metrics.record(max(0.0, started - submitted), finished - started)
+        return result
+
+    async def hash_password(self, password: str) -> bytes:
+        """Hash a password with the stored salt, as Authentication.hash_password.
+        Raises:
+            ExecutorSaturatedError: If the hashing queue is full.
+        """
+        return await self._run(bcrypt.hashpw, password.encode(), self.auth.salt)
+
+    async def verify_password(self, password: str, stored_hash: bytes) -> bool:
+        """Verify a password, as Authentication.verify_password.
+        Raises:
+            ExecutorSaturatedError: If the hashing queue is full.
+        """
+        return await self._run(bcrypt.checkpw, password.encode(), stored_hash)
+
+    def needs_rehash(self, stored_hash: bytes) -> bool:
+        """Return whether a stored hash uses a lower cost than the current one."""
+        return self.auth.needs_rehash(stored_hash)
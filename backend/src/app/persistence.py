@@ -12,13 +12,48 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, List, TypeVar
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterator, List, Optional, Sequence, TypeVar
 from uuid import UUID
 
+from .executor import BoundedExecutor
+
 T = TypeVar("T")
 
 
+def property_text(value) -> str:
+    """Render a property value as the text compared by property filters.
+    Strings are used as they are and other values as JSON, matching what
+    DuckDB's ->> operator returns for them.
+    """
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def has_properties(obj, filters: Dict[str, str]) -> bool:
+    """Return whether an object's key/value `properties` match every filter."""
+    properties = {}
+    for prop in obj.properties:
+        properties.setdefault(prop.get("key"), set()).add(
+            property_text(prop.get("value"))
+        )
+    return all(value in properties.get(key, ()) for key, value in filters.items())
+
+
+@dataclass
+class Page(Generic[T]):
+    """A page of results from a keyset-paginated listing.
+    Attributes:
+        items (List[T]): The objects on this page.
+        next_cursor (Optional[UUID]): ID to pass as `after_id` for the next page,
+            or None when this is the last page.
+    """
+
+    items: List[T]
+    next_cursor: Optional[UUID] = None
+
+
 class PersistenceProxy(ABC, Generic[T]):
     """Abstract base class defining the persistence interface."""
 
@@ -30,6 +65,22 @@ class PersistenceProxy(ABC, Generic[T]):
     def read(self, obj_id: UUID) -> T:
         """Retrieve an object by its UUID."""
 
+    def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        """Retrieve the objects with the given UUIDs, skipping missing ones.
+        This default implementation reads the objects one at a time.
+        Args:
+            obj_ids (List[UUID]): The IDs of the objects to read.
+        Returns:
+            List[T]: The objects found, in the order of `obj_ids`.
+        """
+        found = []
+        for obj_id in obj_ids:
+            try:
+                found.append(self.read(obj_id))
+            except KeyError:
+                pass
+        return found
+
     @abstractmethod
     def update(self, obj_id: UUID, obj: T) -> T:
         """Update an existing object."""
@@ -41,6 +92,18 @@ class PersistenceProxy(ABC, Generic[T]):
         except KeyError:
             return self.create(obj)
 
+    def create_many(self, objs: List[T]) -> List[T]:
+        """Persist several new objects.
+        This default implementation creates the objects one at a time.
+        """
+        return [self.create(obj) for obj in objs]
+
+    def upsert_many(self, objs: List[T]) -> List[T]:
+        """Insert or update several objects.
+        This default implementation upserts the objects one at a time.
+        """
+        return [self.upsert(obj) for obj in objs]
+
     @abstractmethod
     def delete(self, obj_id: UUID) -> None:
         """Delete an object by its UUID."""
@@ -49,6 +112,86 @@ class PersistenceProxy(ABC, Generic[T]):
     def list_all(self) -> List[T]:
         """List all persisted objects."""
 
+    def list_page(
+        self, after_id: Optional[UUID] = None, limit: int = 100, order_by: str = "id"
+    ) -> Page[T]:
+        """List one page of objects ordered by `order_by`, then by ID.
+        This default implementation sorts the result of `list_all`; persistent
+        backends should override it with a keyset query.
+        Args:
+            after_id (Optional[UUID]): ID of the last object of the previous page.
+            limit (int): Maximum number of objects to return.
+            order_by (str): Name of the attribute to order by.
+        Returns:
+            Page[T]: The objects on the page and the cursor for the next one.
+        Raises:
+            ValueError: If `order_by` is not an attribute of the objects.
+            KeyError: If the object with ID `after_id` does not exist.
+        """
+        try:
+            ordered = sorted(
+                self.list_all(), key=lambda obj: (getattr(obj, order_by), obj.id)
+            )
+        except AttributeError:
+            raise ValueError(f"Cannot order by unknown attribute {order_by!r}")
+        start = 0
+        if after_id is not None:
+            ids = [obj.id for obj in ordered]
+            if after_id not in ids:
+                raise KeyError(f"Object with ID {after_id} not found")
+            start = ids.index(after_id) + 1
+        items = ordered[start : start + limit]
+        has_more = start + limit < len(ordered)
+        return Page(items=items, next_cursor=items[-1].id if has_more else None)
+
+    def find_by_properties(self, filters: Dict[str, str]) -> List[T]:
+        """List the objects having every given property key/value pair.
+        Applies to models whose `properties` is a list of {"key", "value"}
+        dicts. This default implementation filters the result of `list_all`.
+        Args:
+            filters (Dict[str, str]): Required value for each property key;
+                non-string values are compared in their JSON form.
+        Returns:
+            List[T]: The matching objects, ordered by ID.
+        Raises:
+            ValueError: If the model has no `properties`.
+        """
+        try:
+            found = [obj for obj in self.list_all() if has_properties(obj, filters)]
+        except AttributeError:
+            raise ValueError("Objects have no properties to filter on")
+        return sorted(found, key=lambda obj: obj.id)
+
+    def with_relationships(self, include: Sequence[str]) -> "PersistenceProxy[T]":
+        """Return a proxy whose reads also load the named relationships.
+        This default implementation returns the proxy itself, for backends that
+        keep whole object graphs in memory.
+        Args:
+            include (Sequence[str]): Names of the relationships to load eagerly.
+        Returns:
+            PersistenceProxy[T]: A proxy sharing this proxy's storage.
+        Raises:
+            ValueError: If a name is not a relationship of the model.
+        """
+        return self
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[T]:
+        """Iterate over all persisted objects, fetching `batch_size` at a time.
+        This default implementation walks `list_page` in ID order, so only one
+        batch is held in memory at a time.
+        Args:
+            batch_size (int): Number of objects fetched per batch.
+        Yields:
+            T: Each persisted object.
+        """
+        cursor = None
+        while True:
+            page = self.list_page(after_id=cursor, limit=batch_size)
+            yield from page.items
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+
 
 class InMemoryProxy(PersistenceProxy[T]):
     """In-memory implementation of the PersistenceProxy interface."""
@@ -63,6 +206,9 @@ class InMemoryProxy(PersistenceProxy[T]):
     def read(self, obj_id: UUID) -> T:
         return self._storage[obj_id]
 
+    def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        return [self._storage[obj_id] for obj_id in obj_ids if obj_id in self._storage]
+
     def update(self, obj_id: UUID, obj: T) -> T:
         self._storage[obj_id] = obj
         return obj
@@ -72,3 +218,106 @@ class InMemoryProxy(PersistenceProxy[T]):
 
     def list_all(self) -> List[T]:
         return list(self._storage.values())
+
+
+class AsyncPersistenceProxy(ABC, Generic[T]):
+    """Abstract base class defining the asynchronous persistence interface."""
+
+    @abstractmethod
+    async def create(self, obj: T) -> T:
+        """Persist a new object."""
+
+    @abstractmethod
+    async def read(self, obj_id: UUID) -> T:
+        """Retrieve an object by its UUID."""
+
+    @abstractmethod
+    async def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        """Retrieve the objects with the given UUIDs, skipping missing ones."""
+
+    @abstractmethod
+    async def update(self, obj_id: UUID, obj: T) -> T:
+        """Update an existing object."""
+
+    @abstractmethod
+    async def upsert(self, obj: T) -> T:
+        """Insert or update an object."""
+
+    @abstractmethod
+    async def create_many(self, objs: List[T]) -> List[T]:
+        """Persist several new objects."""
+
+    @abstractmethod
+    async def upsert_many(self, objs: List[T]) -> List[T]:
+        """Insert or update several objects."""
+
+    @abstractmethod
+    async def delete(self, obj_id: UUID) -> None:
+        """Delete an object by its UUID."""
+
+    @abstractmethod
+    async def list_all(self) -> List[T]:
+        """List all persisted objects."""
+
+    @abstractmethod
+    async def list_page(
+        self, after_id: Optional[UUID] = None, limit: int = 100, order_by: str = "id"
+    ) -> Page[T]:
+        """List one page of objects ordered by `order_by`, then by ID."""
+
+    @abstractmethod
+    async def find_by_properties(self, filters: Dict[str, str]) -> List[T]:
+        """List the objects having every given property key/value pair."""
+
+
+class ExecutorProxy(AsyncPersistenceProxy[T]):
+    """Asynchronous proxy running a synchronous proxy on a bounded executor.
+    Blocking database calls never run on the event loop; when the executor's
+    queue is full, calls fail fast with ExecutorSaturatedError.
+    """
+
+    def __init__(self, proxy: PersistenceProxy[T], executor: BoundedExecutor):
+        """Initialize the executor proxy.
+        Args:
+            proxy (PersistenceProxy[T]): The synchronous proxy to delegate to.
+            executor (BoundedExecutor): The executor the calls are run on.
+        """
+        self._proxy = proxy
+        self._executor = executor
+
+    async def create(self, obj: T) -> T:
+        return await self._executor.run(self._proxy.create, obj)
+
+    async def read(self, obj_id: UUID) -> T:
+        return await self._executor.run(self._proxy.read, obj_id)
+
+    async def read_many(self, obj_ids: List[UUID]) -> List[T]:
+        return await self._executor.run(self._proxy.read_many, obj_ids)
+
+    async def update(self, obj_id: UUID, obj: T) -> T:
+        return await self._executor.run(self._proxy.update, obj_id, obj)
+
+    async def upsert(self, obj: T) -> T:
+        return await self._executor.run(self._proxy.upsert, obj)
+
+    async def create_many(self, objs: List[T]) -> List[T]:
+        return await self._executor.run(self._proxy.create_many, objs)
+
+    async def upsert_many(self, objs: List[T]) -> List[T]:
+        return await self._executor.run(self._proxy.upsert_many, objs)
+
+    async def delete(self, obj_id: UUID) -> None:
+        await self._executor.run(self._proxy.delete, obj_id)
+
+    async def list_all(self) -> List[T]:
+        return await self._executor.run(self._proxy.list_all)
+
+    async def list_page(
+        self, after_id: Optional[UUID] = None, limit: int = 100, order_by: str = "id"
+    ) -> Page[T]:
+        return await self._executor.run(
+            self._proxy.list_page, after_id, limit, order_by
+        )
+
+    async def find_by_properties(self, filters: Dict[str, str]) -> List[T]:
+        return await self._executor.run(self._proxy.find_by_properties, filters)
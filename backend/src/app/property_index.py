@@ -0,0 +1,107 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# property_index.py
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
+from uuid import UUID
+
+from .events import DELETE, ChangeEvent
+from .persistence import property_text
+from .sqlmodel_models import Component
+
+# Property keys kept in the in-memory side index, e.g. "brand,vendor"
+HOT_PROPERTY_KEYS = frozenset(
+    key for key in os.environ.get("SAMMY_HOT_PROPERTY_KEYS", "").split(",") if key
+)
+
+
+class PropertyIndex:
+    """In-memory (key, value) → component IDs postings for hot property keys.
+    Filters on hot keys are answered from the postings without scanning the
+    component table. Only the configured keys are indexed, keeping memory
+    proportional to the properties that are actually searched often.
+    Attributes:
+        hot_keys (FrozenSet[str]): The property keys indexed.
+    """
+
+    def __init__(self, hot_keys: Iterable[str] = HOT_PROPERTY_KEYS):
+        self.hot_keys: FrozenSet[str] = frozenset(hot_keys)
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every component."""
+        with self._lock:
+            self._postings: Dict[Tuple[str, str], Set[UUID]] = defaultdict(set)
+            self._entries: Dict[UUID, Set[Tuple[str, str]]] = {}
+
+    def covers(self, filters: Dict[str, str]) -> bool:
+        """Return whether every filter key is indexed."""
+        return bool(filters) and all(key in self.hot_keys for key in filters)
+
+    def load(self, components: Iterable[Component]) -> None:
+        """Replace the index contents with the given components."""
+        with self._lock:
+            self.clear()
+            for component in components:
+                self.put(component.id, component.properties)
+
+    def put(self, component_id: UUID, properties) -> None:
+        """Add or replace the indexed properties of a component."""
+        entries = {
+            (prop.get("key"), property_text(prop.get("value")))
+            for prop in properties or []
+            if prop.get("key") in self.hot_keys
+        }
+        with self._lock:
+            self.remove(component_id)
+            if entries:
+                self._entries[component_id] = entries
+                for entry in entries:
+                    self._postings[entry].add(component_id)
+
+    def remove(self, component_id: UUID) -> None:
+        """Drop a component; unknown components are ignored."""
+        with self._lock:
+            for entry in self._entries.pop(component_id, ()):
+                postings = self._postings[entry]
+                postings.discard(component_id)
+                if not postings:
+                    del self._postings[entry]
+
+    def apply(self, event: ChangeEvent) -> None:
+        """Update the index from a Component change event."""
+        if event.model is not Component or not self.hot_keys:
+            return
+        if event.action == DELETE:
+            self.remove(event.obj_id)
+        elif event.obj is not None:
+            self.put(event.obj_id, event.obj.properties)
+
+    def lookup(self, filters: Dict[str, str]) -> Set[UUID]:
+        """Return the IDs of the components matching every filter.
+        Raises:
+            KeyError: If a filter key is not indexed.
+        """
+        if not self.covers(filters):
+            raise KeyError("Filter keys are not all indexed")
+        with self._lock:
+            postings = [
+                self._postings.get((key, value), set())
+                for key, value in filters.items()
+            ]
+            return set.intersection(*sorted(postings, key=len))
@@ -0,0 +1,310 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# replica.py
+import glob
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+
+from .duckdb_persistence_proxy import DEFAULT_DUCKDB_PATH
+from .engine_registry import ENGINE_REGISTRY, EngineRegistry
+from .schema import verify_schema
+
+logger = logging.getLogger(__name__)
+
+# Process roles: the primary owns the database file and publishes snapshots,
+# replicas serve reads from the latest snapshot; unset runs a single process
+PRIMARY = "primary"
+REPLICA = "replica"
+REPLICA_ROLE = os.environ.get("SAMMY_REPLICA_ROLE", "")
+
+# Snapshot settings, overridable through the environment
+SNAPSHOT_DIR = os.environ.get(
+    "SAMMY_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(DEFAULT_DUCKDB_PATH), "snapshots"),
+)
+SNAPSHOT_INTERVAL = float(os.environ.get("SAMMY_SNAPSHOT_INTERVAL", "5"))
+REPLICA_MAX_LAG = float(os.environ.get("SAMMY_REPLICA_MAX_LAG", "30"))
+REPLICA_POLL_INTERVAL = float(os.environ.get("SAMMY_REPLICA_POLL_INTERVAL", "0.5"))
+SNAPSHOT_KEEP = 3
+
+# Names the latest snapshot file; replaced atomically on every publish
+CURRENT_FILE = "CURRENT"
+_PREFIX = "snapshot-"
+_SUFFIX = ".duckdb"
+
+
+class SnapshotUnavailableError(RuntimeError):
+    """Raised when a replica has no snapshot to serve reads from."""
+
+
+def snapshot_time(name: str) -> float:
+    """Return the Unix time a snapshot was taken, from its file name."""
+    millis = os.path.basename(name).removeprefix(_PREFIX).removesuffix(_SUFFIX)
+    return int(millis) / 1000
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class SnapshotPublisher:
+    """Periodically copy the primary database into read-only snapshot files.
+    Each snapshot is a complete DuckDB file written with COPY FROM DATABASE in
+    one transaction, so it is consistent, and then renamed into place.
+    CURRENT is replaced last, so readers never see a partial file. Only the
+    newest `keep` snapshots are kept; replicas still reading an older one
+    keep it open until they switch.
+    Attributes:
+        interval (float): Seconds between snapshots.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DUCKDB_PATH,
+        snapshot_dir: str = SNAPSHOT_DIR,
+        interval: float = SNAPSHOT_INTERVAL,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        keep: int = SNAPSHOT_KEEP,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the publisher; nothing is written until `publish`.
+        Args:
+            db_path (str): Path to the primary DuckDB database file.
+            snapshot_dir (str): Directory the snapshots are written to.
+            interval (float): Seconds between snapshots once started.
+            registry (EngineRegistry): Registry providing the primary engine.
+            keep (int): Number of snapshot files kept.
+            clock (Callable[[], float]): Returns the current Unix time.
+        """
+        self.interval = interval
+        self._db_path = db_path
+        self._dir = snapshot_dir
+        self._registry = registry
+        self._keep = keep
+        self._clock = clock
+        self._last_millis = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self) -> str:
+        """Write a new snapshot and make it the current one.
+        Returns:
+            str: The path of the new snapshot file.
+        """
+        os.makedirs(self._dir, exist_ok=True)
+        millis = max(int(self._clock() * 1000), self._last_millis + 1)
+        self._last_millis = millis
+        path = os.path.join(self._dir, f"{_PREFIX}{millis}{_SUFFIX}")
+        staging = path + ".tmp"
+        if os.path.exists(staging):
+            os.remove(staging)
+        try:
+            self._copy_to(staging)
+            os.replace(staging, path)
+        except BaseException:
+            for leftover in (staging, staging + ".wal"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            raise
+        pointer = os.path.join(self._dir, CURRENT_FILE)
+        with open(pointer + ".tmp", "w") as f:
+            f.write(os.path.basename(path))
+        os.replace(pointer + ".tmp", pointer)
+        self._prune()
+        return path
+
+    def _copy_to(self, path: str) -> None:
+        """Copy every table of the primary into a new database file."""
+        engine, _ = self._registry.get(self._db_path)
+        with engine.connect() as connection:
+            database = connection.execute(text("SELECT current_database()")).scalar()
+            connection.execute(text(f"ATTACH {_sql_string(path)} AS sammy_snapshot"))
+            try:
+                connection.execute(
+                    text(f'COPY FROM DATABASE "{database}" TO sammy_snapshot')
+                )
+                connection.commit()
+            finally:
+                # DuckDB refuses to detach inside the transaction that wrote
+                connection.rollback()
+                connection.execute(text("DETACH sammy_snapshot"))
+                connection.commit()
+
+    def _prune(self) -> None:
+        """Delete all but the newest `keep` snapshots."""
+        snapshots = sorted(
+            glob.glob(os.path.join(self._dir, f"{_PREFIX}*{_SUFFIX}")),
+            key=snapshot_time,
+        )
+        for path in snapshots[: -self._keep]:
+            os.remove(path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.publish()
+            except Exception:
+                logger.exception("Publishing a snapshot of %s failed", self._db_path)
+
+    def start(self) -> None:
+        """Publish a snapshot now, then one every `interval` seconds."""
+        self.publish()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sammy-snapshot-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop publishing."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class SnapshotReplica:
+    """Serve a database path from the latest published snapshot, read-only.
+    Once attached, every engine requested for `db_path` is the read-only
+    engine of the current snapshot, so the services need no changes. A
+    background thread checks for newer snapshots every `poll_interval`
+    seconds, switches to them and then runs the `on_switch` listeners, which
+    rebuild state derived from the database such as in-memory indexes.
+    Attributes:
+        max_lag (float): Age in seconds beyond which the snapshot is stale.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DUCKDB_PATH,
+        snapshot_dir: str = SNAPSHOT_DIR,
+        max_lag: float = REPLICA_MAX_LAG,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        poll_interval: float = REPLICA_POLL_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the replica; nothing is opened until `attach`.
+        Args:
+            db_path (str): Path the application reads from.
+            snapshot_dir (str): Directory the primary publishes snapshots to.
+            max_lag (float): Age in seconds beyond which the snapshot is stale.
+            registry (EngineRegistry): Registry to redirect `db_path` in.
+            poll_interval (float): Seconds between checks for a new snapshot.
+            clock (Callable[[], float]): Returns the current Unix time.
+        """
+        self.max_lag = max_lag
+        self._db_path = db_path
+        self._dir = snapshot_dir
+        self._registry = registry
+        self._poll_interval = poll_interval
+        self._clock = clock
+        self._current: Optional[str] = None
+        self._listeners: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def on_switch(self, listener: Callable[[], None]) -> None:
+        """Call `listener()` after every switch to a newer snapshot."""
+        self._listeners.append(listener)
+
+    def current_path(self) -> str:
+        """Return the path of the snapshot being served.
+        Raises:
+            SnapshotUnavailableError: If no snapshot has been loaded.
+        """
+        current = self._current
+        if current is None:
+            raise SnapshotUnavailableError(f"No snapshot found in {self._dir}")
+        return current
+
+    def age(self) -> Optional[float]:
+        """Return the age of the served snapshot in seconds, None if none."""
+        current = self._current
+        return None if current is None else self._clock() - snapshot_time(current)
+
+    def is_fresh(self) -> bool:
+        """Return whether a snapshot no older than `max_lag` is being served."""
+        age = self.age()
+        return age is not None and age <= self.max_lag
+
+    def refresh(self) -> bool:
+        """Switch to the newest published snapshot if it is not current.
+        Returns:
+            bool: True if the replica switched to another snapshot.
+        """
+        with self._lock:
+            try:
+                with open(os.path.join(self._dir, CURRENT_FILE)) as f:
+                    path = os.path.join(self._dir, f.read().strip())
+            except FileNotFoundError:
+                return False
+            if path == self._current:
+                return False
+            self._registry.get(path, read_only=True)
+            verify_schema(path, self._registry)
+            previous, self._current = self._current, path
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception:
+                logger.exception("Snapshot listener %r failed", listener)
+        if previous is not None:
+            self._registry.dispose(previous)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Loading a snapshot from %s failed", self._dir)
+
+    def attach(self) -> None:
+        """Redirect `db_path` to the latest snapshot and follow new ones.
+        Raises:
+            SnapshotUnavailableError: If no snapshot has been published yet.
+        """
+        self.refresh()
+        self.current_path()
+        self._registry.redirect(self._db_path, self.current_path)
+        verify_schema(self._db_path, self._registry)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sammy-snapshot-replica", daemon=True
+        )
+        self._thread.start()
+
+    def detach(self) -> None:
+        """Stop following snapshots and remove the redirect."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._registry.redirect(self._db_path, None)
+        with self._lock:
+            current, self._current = self._current, None
+        if current is not None:
+            self._registry.dispose(current)
+
+
+# Process-wide publisher and replica, started by the API for its role
+SNAPSHOT_PUBLISHER = SnapshotPublisher()
+SNAPSHOT_REPLICA = SnapshotReplica()
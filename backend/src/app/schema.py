@@ -0,0 +1,151 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# schema.py
+import threading
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import text
+
+from .engine_registry import ENGINE_REGISTRY, EngineRegistry
+from .sqlmodel_models import SQLModel
+
+# Bump whenever the table models change, and add the statements needed to bring
+# an older database up to date to MIGRATIONS under the new version number.
+SCHEMA_VERSION = 3
+SCHEMA_VERSION_TABLE = "sammy_schema_version"
+
+# Tables of the models deriving from sqlmodel_models.Versioned
+_VERSIONED_TABLES = [
+    "user",
+    "password",
+    "role",
+    "roleauth",
+    "userauth",
+    "component",
+    "system",
+]
+
+# Statements must be idempotent: a database created before versioning existed
+# is treated as version 0 and replays every migration.
+MIGRATIONS: Dict[int, List[str]] = {
+    # Row version columns; existing rows count as written at migration time.
+    # DuckDB cannot replay a WAL adding a column with a non-constant default,
+    # so updated_at is filled in by an UPDATE instead.
+    2: [
+        statement
+        for table in _VERSIONED_TABLES
+        for statement in (
+            f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS version INTEGER '
+            "DEFAULT 1",
+            f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP',
+            f"UPDATE \"{table}\" SET updated_at = timezone('UTC', now()) "
+            "WHERE updated_at IS NULL",
+        )
+    ],
+    # Change log behind GET /changes, see change_log.py
+    3: [
+        "CREATE SEQUENCE IF NOT EXISTS change_log_seq",
+        "CREATE TABLE IF NOT EXISTS change_log (seq BIGINT NOT NULL, "
+        "model VARCHAR NOT NULL, action VARCHAR NOT NULL, obj_id UUID NOT NULL, "
+        "changed_at TIMESTAMP NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS change_log_horizon (seq BIGINT NOT NULL)",
+        "INSERT INTO change_log_horizon SELECT 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM change_log_horizon)",
+    ],
+}
+
+_bootstrapped: Set[str] = set()
+_lock = threading.Lock()
+
+
+def _stored_version(connection) -> Optional[int]:
+    """Return the highest schema version recorded in the database."""
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "version INTEGER NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL DEFAULT current_timestamp)"
+        )
+    )
+    return connection.execute(
+        text(f"SELECT max(version) FROM {SCHEMA_VERSION_TABLE}")
+    ).scalar()
+
+
+def bootstrap_schema(db_path: str, registry: EngineRegistry = ENGINE_REGISTRY) -> bool:
+    """Create or migrate the schema of a database if its recorded version is stale.
+    Args:
+        db_path (str): Path to the DuckDB database file.
+        registry (EngineRegistry): Registry supplying the pooled engine.
+    Returns:
+        bool: True if the schema was created or migrated, False if it was current.
+    Raises:
+        RuntimeError: If the database was written by a newer schema version.
+    """
+    with _lock:
+        engine, _ = registry.get(db_path)
+        with engine.begin() as connection:
+            stored = _stored_version(connection)
+            if stored == SCHEMA_VERSION:
+                _bootstrapped.add(db_path)
+                return False
+            if stored is not None and stored > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"Database {db_path} has schema version {stored}, "
+                    f"newer than supported version {SCHEMA_VERSION}"
+                )
+            SQLModel.metadata.create_all(connection)
+            for version in range((stored or 0) + 1, SCHEMA_VERSION + 1):
+                for statement in MIGRATIONS.get(version, []):
+                    connection.execute(text(statement))
+            connection.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version) VALUES (:v)"),
+                {"v": SCHEMA_VERSION},
+            )
+        _bootstrapped.add(db_path)
+        return True
+
+
+def ensure_schema(db_path: str, registry: EngineRegistry = ENGINE_REGISTRY) -> None:
+    """Bootstrap the schema once per process; later calls return immediately.
+    Args:
+        db_path (str): Path to the DuckDB database file.
+        registry (EngineRegistry): Registry supplying the pooled engine.
+    """
+    if db_path not in _bootstrapped:
+        bootstrap_schema(db_path, registry)
+
+
+def verify_schema(db_path: str, registry: EngineRegistry = ENGINE_REGISTRY) -> None:
+    """Check the schema version of a read-only database without changing it.
+    Marks the database as bootstrapped, so `ensure_schema` leaves it alone.
+    Args:
+        db_path (str): Path to the DuckDB database file.
+        registry (EngineRegistry): Registry supplying the pooled engine.
+    Raises:
+        RuntimeError: If the database's schema version is not SCHEMA_VERSION.
+    """
+    engine, _ = registry.get(db_path)
+    with engine.connect() as connection:
+        stored = connection.execute(
+            text(f"SELECT max(version) FROM {SCHEMA_VERSION_TABLE}")
+        ).scalar()
+    if stored != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database {db_path} has schema version {stored}, "
+            f"expected version {SCHEMA_VERSION}"
+        )
+    with _lock:
+        _bootstrapped.add(db_path)
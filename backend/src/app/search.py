@@ -0,0 +1,238 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# search.py
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from .events import DELETE, ChangeEvent
+from .sqlmodel_models import Component, System, User
+
+# Searchable models by the type name used in queries and results
+SEARCH_TYPES: Dict[str, type] = {"user": User, "component": Component, "system": System}
+_TYPE_NAMES = {model: name for name, model in SEARCH_TYPES.items()}
+
+Key = Tuple[str, UUID]
+# A word-suffix of a folded name, and the object it belongs to
+Entry = Tuple[str, str, UUID]
+
+# Recent or dropped word-suffix entries kept before merging, at least
+MERGE_MIN = 1024
+
+# Match ranks, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def fold(text: str) -> str:
+    """Normalize text for matching: case-folded, whitespace collapsed."""
+    return " ".join(text.casefold().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the three-character substrings of already folded text."""
+    return {"".join(gram) for gram in zip(text, text[1:], text[2:])}
+
+
+def _word_starts(text: str) -> List[int]:
+    return [0] + [i + 1 for i, char in enumerate(text) if char == " "]
+
+
+def _entries(folded: str, key: Key) -> List[Entry]:
+    return [(folded[start:], *key) for start in _word_starts(folded)]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One search result.
+    Attributes:
+        type (str): The type name of the object, a key of SEARCH_TYPES.
+        id (UUID): The ID of the object.
+        name (str): The object's name as stored.
+    """
+
+    type: str
+    id: UUID
+    name: str
+
+
+class SearchIndex:
+    """In-memory name index answering prefix and substring queries.
+    Queries of three characters or more intersect the trigram postings of the
+    query and confirm each candidate with a substring test. Shorter queries
+    bisect sorted lists holding every word-suffix of every name, which finds
+    the names having a word that starts with the query. Results are ranked
+    exact match, name prefix, word prefix, then any other substring, with
+    shorter names first within a rank.
+
+    New word-suffix entries go into a smaller sorted list of recent entries,
+    and the entries of dropped names are remembered and skipped by queries
+    rather than deleted. The recent list is merged into the main one, and
+    dropped entries purged, in one linear pass once either outgrows an eighth
+    of the main list. A write then shifts a list an eighth the size and pays
+    a constant share of the merges, instead of shifting the whole list.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every name."""
+        with self._lock:
+            self._names: Dict[Key, str] = {}
+            self._folded: Dict[Key, str] = {}
+            self._postings: Dict[str, Set[Key]] = defaultdict(set)
+            self._words: List[Entry] = []
+            self._recent: List[Entry] = []
+            self._dropped: Set[Entry] = set()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def load(self, type_name: str, objs: Iterable) -> None:
+        """Replace the names of one type with those of the given objects."""
+        with self._lock:
+            for key in [key for key in self._names if key[0] == type_name]:
+                self._forget(key)
+            for obj in objs:
+                self._recent.extend(self._add(type_name, obj.id, obj.name))
+            self._compact()
+
+    def put(self, type_name: str, obj_id: UUID, name: str) -> None:
+        """Add or replace the name of an object."""
+        with self._lock:
+            self._forget((type_name, obj_id))
+            for entry in self._add(type_name, obj_id, name):
+                insort(self._recent, entry)
+            self._maybe_compact()
+
+    def _add(self, type_name: str, obj_id: UUID, name: str) -> List[Entry]:
+        """Index a new name, returning its word-suffix entries to be inserted."""
+        key = (type_name, obj_id)
+        folded = fold(name)
+        self._names[key] = name
+        self._folded[key] = folded
+        for gram in trigrams(folded):
+            self._postings[gram].add(key)
+        entries = _entries(folded, key)
+        # Putting a name back revives its entries
+        self._dropped.difference_update(entries)
+        return entries
+
+    def remove(self, type_name: str, obj_id: UUID) -> None:
+        """Drop an object; unknown objects are ignored."""
+        with self._lock:
+            self._forget((type_name, obj_id))
+            self._maybe_compact()
+
+    def _forget(self, key: Key) -> None:
+        """Drop a name, leaving its word-suffix entries for _compact."""
+        folded = self._folded.pop(key, None)
+        if folded is None:
+            return
+        del self._names[key]
+        for gram in trigrams(folded):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+        self._dropped.update(_entries(folded, key))
+
+    def _maybe_compact(self) -> None:
+        limit = max(MERGE_MIN, len(self._words) // 8)
+        if len(self._recent) > limit or len(self._dropped) > limit:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Merge the recent entries into the main list, purging dropped ones."""
+        # Two sorted runs, which sort() merges in linear time
+        merged = self._words + self._recent
+        merged.sort()
+        dropped = self._dropped
+        # A name put back leaves its old entries equal to the new ones
+        self._words = [
+            entry
+            for i, entry in enumerate(merged)
+            if (i == 0 or entry != merged[i - 1]) and entry not in dropped
+        ]
+        self._recent = []
+        self._dropped = set()
+
+    def apply(self, event: ChangeEvent) -> None:
+        """Update the index from a User, Component or System change event."""
+        type_name = _TYPE_NAMES.get(event.model)
+        if type_name is None:
+            return
+        if event.action == DELETE:
+            self.remove(type_name, event.obj_id)
+        elif event.obj is not None:
+            self.put(type_name, event.obj_id, event.obj.name)
+
+    def _candidates(self, query: str) -> Set[Key]:
+        if len(query) >= 3:
+            postings = sorted(
+                (self._postings.get(gram, set()) for gram in trigrams(query)), key=len
+            )
+            return {
+                key for key in set.intersection(*postings) if query in self._folded[key]
+            }
+        found = set()
+        for words in (self._words, self._recent):
+            start = bisect_left(words, (query,))
+            for entry in islice(words, start, None):
+                if not entry[0].startswith(query):
+                    break
+                if entry not in self._dropped:
+                    found.add(entry[1:])
+        return found
+
+    def _rank(self, query: str, key: Key) -> int:
+        folded = self._folded[key]
+        if folded == query:
+            return EXACT
+        if folded.startswith(query):
+            return PREFIX
+        if any(folded.startswith(query, i) for i in _word_starts(folded)):
+            return WORD_PREFIX
+        return SUBSTRING
+
+    def search(
+        self, query: str, types: Optional[Iterable[str]] = None, limit: int = 20
+    ) -> List[SearchHit]:
+        """Find the names containing a query.
+        Args:
+            query (str): The text to look for, matched case-insensitively.
+            types (Optional[Iterable[str]]): Type names to search; all if None.
+            limit (int): Maximum number of hits returned.
+        Returns:
+            List[SearchHit]: The best `limit` hits, best first.
+        """
+        query = fold(query)
+        if not query or limit <= 0:
+            return []
+        wanted = None if types is None else set(types)
+        with self._lock:
+            ranked = (
+                (self._rank(query, key), len(self._folded[key]), self._folded[key], key)
+                for key in self._candidates(query)
+                if wanted is None or key[0] in wanted
+            )
+            best = heapq.nsmallest(limit, ranked)
+            return [SearchHit(key[0], key[1], self._names[key]) for *_, key in best]
@@ -0,0 +1,87 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# serialization.py
+import functools
+import os
+from typing import Any, Dict, List, Sequence
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse
+
+# Serialize rows read from the database without validating them again
+FAST_SERIALIZATION = os.environ.get("SAMMY_FAST_SERIALIZATION", "1") == "1"
+
+
+def _default(value: Any) -> Any:
+    """Render the values orjson does not know, i.e. pydantic models."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson; bytes are taken as rendered JSON.
+    orjson handles UUIDs, datetimes and enums natively, so content needs no
+    jsonable_encoder pass first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, default=_default)
+
+
+@functools.lru_cache(maxsize=None)
+def rows_adapter(model_cls: type) -> TypeAdapter:
+    """Return the TypeAdapter of a list of `model_cls`, built once per model."""
+    return TypeAdapter(List[model_cls])
+
+
+def embedded(obj, include: Sequence[str], exclude_none: bool = False) -> Dict:
+    """Dump an object's columns and its eager-loaded relationships to a dict."""
+    data = obj.model_dump(exclude_none=exclude_none)
+    for name in include:
+        data[name] = [
+            related.model_dump(exclude_none=exclude_none)
+            for related in getattr(obj, name)
+        ]
+    return data
+
+
+def dump_rows(
+    model_cls: type,
+    rows: Sequence[Any],
+    include: Sequence[str] = (),
+    exclude_none: bool = False,
+) -> bytes:
+    """Serialize objects read from the database to a JSON array.
+    The objects were validated when written and are typed by their columns
+    when read, so they are not validated again. Without `include` they are
+    serialized in one pass by the model's compiled pydantic-core serializer;
+    with it they are dumped with their relationships and rendered by orjson.
+    Args:
+        model_cls (type): The table model of the objects.
+        rows (Sequence[Any]): The objects.
+        include (Sequence[str]): Eager-loaded relationships to embed.
+        exclude_none (bool): Whether to leave out fields that are None.
+    Returns:
+        bytes: The JSON array.
+    """
+    if not include:
+        return rows_adapter(model_cls).dump_json(rows, exclude_none=exclude_none)
+    return orjson.dumps(
+        [embedded(obj, include, exclude_none) for obj in rows], default=_default
+    )
@@ -12,10 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Generic, TypeVar
+import hashlib
+import threading
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
 
-from .duckdb_persistence_proxy import DuckDBProxy
+from sqlalchemy import inspect, text
+
+from .authorization import AuthorizationIndex
+from .broker import BROKER_CLIENT, BrokerClient, BrokerProxy, brokered
+from .caching_proxy import CachingProxy, ReadCache, invalidate_objects
+from .change_log import (
+    ChangeBatch,
+    ChangeLogCompactor,
+    commit_logged,
+    read_changes,
+    record_changes,
+)
+from .duckdb_persistence_proxy import DEFAULT_DUCKDB_PATH, DuckDBProxy
+from .engine_registry import ENGINE_REGISTRY, EngineRegistry
+from .events import EVENT_BUS, UPDATE, ChangeEvent, EventBus, PublishingProxy
+from .executor import DB_EXECUTOR
+from .group_commit import GROUP_COMMIT, GroupCommitWriter
+from .model_enum import ComponentType
+from .persistence import ExecutorProxy, Page, PersistenceProxy
+from .property_index import PropertyIndex
+from .schema import ensure_schema
+from .search import SEARCH_TYPES, SearchHit, SearchIndex
 from .sqlmodel_models import Role  # updated import
 from .sqlmodel_models import (
     Component,
@@ -23,6 +57,7 @@ from .sqlmodel_models import (
     RoleAuth,
     SQLModel,
     System,
+    SystemComponentLink,
     User,
     UserAuth,
 )
@@ -34,20 +69,86 @@ T = TypeVar("T", bound=SQLModel)
 
 # PROXY = InMemoryProxy[T]()
 
+# Read caches live for the process, shared by every instance of a cached service
+READ_CACHES: Dict[type, ReadCache] = {}
+
+
+def read_cache_for(model_cls: type) -> ReadCache:
+    """Return the process-wide read cache for a model class."""
+    return READ_CACHES.setdefault(model_cls, ReadCache())
+
+
+def invalidate_cached_reads(event: ChangeEvent) -> None:
+    """Drop the cached reads of a changed object.
+    Needed for writes that never pass through this process's caching proxies:
+    those made by other workers through the write broker, and the deletes of
+    the link service.
+    """
+    cache = READ_CACHES.get(event.model)
+    if cache is not None:
+        invalidate_objects(cache, event.obj_id)
+
+
+EVENT_BUS.subscribe(invalidate_cached_reads)
+
+
+# Writer committing the writes of every service in batches (SAMMY_GROUP_COMMIT)
+GROUP_COMMIT_WRITER = GroupCommitWriter(DEFAULT_DUCKDB_PATH)
+
+# Retention and compaction of the change log, run by the process owning the file
+CHANGE_LOG_COMPACTOR = ChangeLogCompactor(DEFAULT_DUCKDB_PATH)
+
+
+def persistence_proxy(model_cls: type[T]) -> PersistenceProxy[T]:
+    """Return the proxy reaching the database for a model class.
+    With a write broker configured (SAMMY_BROKER_SOCKET) every call goes to
+    the broker process; otherwise the database is opened in this process,
+    batching commits if so configured.
+    """
+    if BROKER_CLIENT is not None:
+        return BrokerProxy(model_cls, BROKER_CLIENT)
+    return DuckDBProxy(model_cls, writer=GROUP_COMMIT_WRITER if GROUP_COMMIT else None)
+
 
 class CRUDService(Generic[T]):
     """CRUD service for managing objects of type T."""
 
-    def __init__(self, model_cls: type[T]):  # , proxy: PersistenceProxy[T] = PROXY):
-        self.proxy = DuckDBProxy(model_cls)  # Use DuckDBProxy for persistence
+    def __init__(
+        self, model_cls: type[T], cached: bool = False
+    ):  # , proxy: PersistenceProxy[T] = PROXY):
+        self.model_cls = model_cls
+        self.proxy = persistence_proxy(model_cls)
+        if BROKER_CLIENT is None:
+            # Announce every committed write on the process-wide event bus;
+            # with a broker, its events are forwarded to the bus instead
+            self.proxy = PublishingProxy(self.proxy, model_cls)
+        if cached:
+            # Serve reads from the shared read cache, invalidated on writes
+            self.proxy = CachingProxy(self.proxy, read_cache_for(model_cls))
+        # Same proxy for async callers, run on the bounded database executor
+        self.async_proxy = ExecutorProxy(self.proxy, DB_EXECUTOR)
+
+    def _reader(self, include: Sequence[str]) -> PersistenceProxy[T]:
+        """Return the proxy to read through, eager-loading `include`."""
+        return self.proxy.with_relationships(include) if include else self.proxy
+
+    def _async_reader(self, include: Sequence[str]) -> ExecutorProxy[T]:
+        """Return the async proxy to read through, eager-loading `include`."""
+        if not include:
+            return self.async_proxy
+        return ExecutorProxy(self.proxy.with_relationships(include), DB_EXECUTOR)
 
     def create(self, obj: T) -> T:
         """Create a new object."""
         return self.proxy.create(obj)
 
-    def read(self, obj_id: UUID) -> T:
-        """Read an object by its ID."""
-        return self.proxy.read(obj_id)
+    def read(self, obj_id: UUID, include: Sequence[str] = ()) -> T:
+        """Read an object by its ID, eager-loading the `include` relationships."""
+        return self._reader(include).read(obj_id)
+
+    def read_many(self, obj_ids: List[UUID], include: Sequence[str] = ()) -> List[T]:
+        """Read the objects with the given IDs, skipping missing ones."""
+        return self._reader(include).read_many(obj_ids)
 
     def update(self, obj_id: UUID, obj: T) -> T:
         """Update an existing object."""
@@ -57,13 +158,108 @@ class CRUDService(Generic[T]):
         """Update an existing object."""
         return self.proxy.upsert(obj)
 
+    def create_many(self, objs: List[T]) -> List[T]:
+        """Create several objects in one batch."""
+        return self.proxy.create_many(objs)
+
+    def upsert_many(self, objs: List[T]) -> List[T]:
+        """Insert or update several objects in one batch."""
+        return self.proxy.upsert_many(objs)
+
     def delete(self, obj_id: UUID) -> None:
         """Delete an object by its ID."""
         self.proxy.delete(obj_id)
 
-    def list_all(self):
+    def list_all(self, include: Sequence[str] = ()):
         """List all objects."""
-        return self.proxy.list_all()
+        return self._reader(include).list_all()
+
+    def list_page(
+        self,
+        after_id: Optional[UUID] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        include: Sequence[str] = (),
+    ) -> Page[T]:
+        """List one page of objects after the object with ID `after_id`."""
+        return self._reader(include).list_page(after_id, limit, order_by)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[T]:
+        """Iterate over all objects without loading them all at once."""
+        return self.proxy.iter_all(batch_size)
+
+    def find_by_properties(
+        self, filters: Dict[str, str], include: Sequence[str] = ()
+    ) -> List[T]:
+        """List the objects having every given property key/value pair."""
+        return self._reader(include).find_by_properties(filters)
+
+    async def acreate(self, obj: T) -> T:
+        """Create a new object without blocking the event loop."""
+        return await self.async_proxy.create(obj)
+
+    async def aread(self, obj_id: UUID, include: Sequence[str] = ()) -> T:
+        """Read an object by its ID without blocking the event loop."""
+        return await self._async_reader(include).read(obj_id)
+
+    async def aread_many(
+        self, obj_ids: List[UUID], include: Sequence[str] = ()
+    ) -> List[T]:
+        """Read several objects by ID without blocking the event loop."""
+        return await self._async_reader(include).read_many(obj_ids)
+
+    async def aupdate(self, obj_id: UUID, obj: T) -> T:
+        """Update an existing object without blocking the event loop."""
+        return await self.async_proxy.update(obj_id, obj)
+
+    async def aupsert(self, obj: T) -> T:
+        """Insert or update an object without blocking the event loop."""
+        return await self.async_proxy.upsert(obj)
+
+    async def acreate_many(self, objs: List[T]) -> List[T]:
+        """Create several objects in one batch without blocking the event loop."""
+        return await self.async_proxy.create_many(objs)
+
+    async def aupsert_many(self, objs: List[T]) -> List[T]:
+        """Insert or update several objects without blocking the event loop."""
+        return await self.async_proxy.upsert_many(objs)
+
+    async def adelete(self, obj_id: UUID) -> None:
+        """Delete an object by its ID without blocking the event loop."""
+        await self.async_proxy.delete(obj_id)
+
+    async def alist_all(self, include: Sequence[str] = ()):
+        """List all objects without blocking the event loop."""
+        return await self._async_reader(include).list_all()
+
+    async def alist_page(
+        self,
+        after_id: Optional[UUID] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        include: Sequence[str] = (),
+    ) -> Page[T]:
+        """List one page of objects without blocking the event loop."""
+        return await self._async_reader(include).list_page(after_id, limit, order_by)
+
+    async def afind_by_properties(
+        self, filters: Dict[str, str], include: Sequence[str] = ()
+    ) -> List[T]:
+        """Filter objects by property without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.find_by_properties, filters, include)
+
+
+# Process-wide authorization index, kept current by the write events
+AUTHORIZATION_INDEX = AuthorizationIndex()
+EVENT_BUS.subscribe(AUTHORIZATION_INDEX.apply)
+
+# Process-wide name search index over users, components and systems
+SEARCH_INDEX = SearchIndex()
+EVENT_BUS.subscribe(SEARCH_INDEX.apply)
+
+# Process-wide side index for hot component property keys
+PROPERTY_INDEX = PropertyIndex()
+EVENT_BUS.subscribe(PROPERTY_INDEX.apply)
 
 
 class UserService(CRUDService[User]):
@@ -84,14 +280,14 @@ class RoleService(CRUDService[Role]):
     """Role service for managing role objects."""
 
     def __init__(self):
-        super().__init__(Role)
+        super().__init__(Role, cached=True)
 
 
 class RoleAuthService(CRUDService[RoleAuth]):
     """Role authorization service for managing role authorization objects."""
 
     def __init__(self):
-        super().__init__(RoleAuth)
+        super().__init__(RoleAuth, cached=True)
 
 
 class UserAuthService(CRUDService[UserAuth]):
@@ -104,12 +300,691 @@ class UserAuthService(CRUDService[UserAuth]):
 class ComponentService(CRUDService[Component]):
     """Component service for managing component objects."""
 
-    def __init__(self):
+    _index_loaded = False
+    _index_lock = threading.Lock()
+
+    def __init__(self, property_index: PropertyIndex = PROPERTY_INDEX):
         super().__init__(Component)
+        self.property_index = property_index
+
+    def _ensure_property_index(self) -> None:
+        """Load the hot-key property index on first use."""
+        if not ComponentService._index_loaded:
+            with ComponentService._index_lock:
+                if not ComponentService._index_loaded:
+                    self.property_index.load(self.proxy.iter_all())
+                    ComponentService._index_loaded = True
+
+    def find_by_properties(
+        self, filters: Dict[str, str], include: Sequence[str] = ()
+    ) -> List[Component]:
+        """List the components having every given property key/value pair.
+        Filters only on hot keys (SAMMY_HOT_PROPERTY_KEYS) are answered from
+        the in-memory side index; the others run as DuckDB JSON predicates.
+        """
+        if not self.property_index.covers(filters):
+            return super().find_by_properties(filters, include)
+        self._ensure_property_index()
+        ids = sorted(self.property_index.lookup(filters))
+        return self.read_many(ids, include)
 
 
 class SystemService(CRUDService[System]):
     """System service for managing system objects."""
 
     def __init__(self):
-        super().__init__(System)
+        super().__init__(System, cached=True)
+
+
+class AuthorizationService:
+    """Feature checks answered from the in-memory authorization index.
+    The index is loaded from the UserAuth and RoleAuth tables on first use and
+    then updated incrementally from the write events of the auth services.
+    """
+
+    _loaded = False
+    _load_lock = threading.Lock()
+
+    def __init__(self, index: AuthorizationIndex = AUTHORIZATION_INDEX):
+        self.index = index
+        if not AuthorizationService._loaded:
+            with AuthorizationService._load_lock:
+                if not AuthorizationService._loaded:
+                    self.reload()
+                    AuthorizationService._loaded = True
+
+    def reload(self) -> None:
+        """Rebuild the index from the database."""
+        self.index.load(
+            persistence_proxy(UserAuth).iter_all(),
+            persistence_proxy(RoleAuth).iter_all(),
+        )
+
+    def has_feature(self, user_id: UUID, feature_name: str) -> bool:
+        """Return whether any of the user's roles grants the feature."""
+        return self.index.has_feature(user_id, feature_name)
+
+    def features_for(self, user_id: UUID) -> List[str]:
+        """Return the names of the features the user has."""
+        return self.index.features_for(user_id)
+
+    def users_with_feature(self, feature_name: str) -> List[UUID]:
+        """Return the IDs of the users having the feature."""
+        return self.index.users_with(feature_name)
+
+
+class SearchService:
+    """Name search answered from the in-memory search index.
+    The index is loaded from the searchable tables on first use and then
+    updated from the write events of their services.
+    """
+
+    _loaded = False
+    _load_lock = threading.Lock()
+
+    def __init__(self, index: SearchIndex = SEARCH_INDEX):
+        self.index = index
+        if not SearchService._loaded:
+            with SearchService._load_lock:
+                if not SearchService._loaded:
+                    self.reload()
+                    SearchService._loaded = True
+
+    def reload(self) -> None:
+        """Rebuild the index from the database."""
+        for type_name, model_cls in SEARCH_TYPES.items():
+            self.index.load(type_name, persistence_proxy(model_cls).iter_all())
+
+    def search(
+        self, query: str, types: Optional[Sequence[str]] = None, limit: int = 20
+    ) -> List[SearchHit]:
+        """Find users, components and systems by name.
+        Args:
+            query (str): The text to look for, matched case-insensitively.
+            types (Optional[Sequence[str]]): Type names to search; all if None.
+            limit (int): Maximum number of hits returned.
+        Returns:
+            List[SearchHit]: The best hits, best first.
+        Raises:
+            ValueError: If a type name is unknown.
+        """
+        unknown = sorted(set(types or ()) - set(SEARCH_TYPES))
+        if unknown:
+            raise ValueError(f"Unknown search types: {', '.join(unknown)}")
+        return self.index.search(query, types, limit)
+
+    async def asearch(
+        self, query: str, types: Optional[Sequence[str]] = None, limit: int = 20
+    ) -> List[SearchHit]:
+        """Find names without blocking the event loop on the index lock."""
+        return await DB_EXECUTOR.run(self.search, query, types, limit)
+
+
+def reload_indexes() -> None:
+    """Rebuild the in-memory indexes and drop the read caches.
+    Used when the database is replaced underneath the process, e.g. by a newer
+    snapshot on a read-only replica, so no write events describe the change.
+    """
+    for cache in READ_CACHES.values():
+        cache.clear()
+    if AuthorizationService._loaded:
+        AuthorizationService().reload()
+    if SearchService._loaded:
+        SearchService().reload()
+    # Loaded again on the next property filter
+    ComponentService._index_loaded = False
+
+
+class SQLService:
+    """Base of the services querying the database with their own SQL.
+    With a broker client, the methods marked @brokered run in the broker and
+    nothing is opened in this process; otherwise the schema is ensured and
+    the names of the tables queried are quoted once for the pooled engine.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DUCKDB_PATH,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        broker: Optional[BrokerClient] = BROKER_CLIENT,
+    ):
+        """Initialize the service.
+        Args:
+            db_path (str): Path to the DuckDB database file.
+            registry (EngineRegistry): Registry providing the pooled engine.
+            broker (Optional[BrokerClient]): Write broker to run the queries
+                in; the database is opened in this process if None.
+        """
+        self._broker = broker
+        if broker is not None:
+            return
+        ensure_schema(db_path, registry)
+        self._db_path = db_path
+        self._registry = registry
+        engine, _ = registry.get(db_path)
+        self._quote = engine.dialect.identifier_preparer.quote
+        self._link_table = self._quote(SystemComponentLink.__tablename__)
+        self._system_table = self._quote(System.__tablename__)
+        self._component_table = self._quote(Component.__tablename__)
+
+    def _session(self):
+        """Open a session on the pooled engine."""
+        _, Session = self._registry.get(self._db_path)
+        return Session()
+
+
+class SystemComponentLinkService(SQLService):
+    """Link service writing SystemComponentLink rows directly.
+    Links are inserted and deleted with set-based SQL instead of loading and
+    re-saving the `System.components` relationship, so systems with thousands
+    of components are linked in a handful of statements. ID lists are passed
+    to DuckDB as one comma-separated string and split server-side, which is
+    far cheaper than binding a parameter per ID.
+    """
+
+    # Expands the :ids parameter into a one-column relation of UUIDs
+    _IDS_SQL = "SELECT CAST(unnest(string_split(:ids, ',')) AS UUID) AS id"
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DUCKDB_PATH,
+        registry: EngineRegistry = ENGINE_REGISTRY,
+        broker: Optional[BrokerClient] = BROKER_CLIENT,
+        bus: EventBus = EVENT_BUS,
+    ):
+        """Initialize the link service.
+        Args:
+            db_path (str): Path to the DuckDB database file.
+            registry (EngineRegistry): Registry providing the pooled engine.
+            broker (Optional[BrokerClient]): Write broker to run the queries
+                in; the database is opened in this process if None.
+            bus (EventBus): The bus committed link changes are published on.
+        """
+        super().__init__(db_path, registry, broker)
+        self._bus = bus
+
+    @staticmethod
+    def _id_list(ids: Iterable[UUID]) -> str:
+        """Join IDs into the string expanded by `_IDS_SQL`."""
+        return ",".join(str(obj_id) for obj_id in ids)
+
+    def _check_system(self, session, system_id: UUID) -> None:
+        """Raise KeyError if the system does not exist."""
+        found = session.execute(
+            text(f"SELECT 1 FROM {self._system_table} WHERE id = :id"),
+            {"id": str(system_id)},
+        ).first()
+        if found is None:
+            raise KeyError(f"System with ID {system_id} not found")
+
+    def _check_components(self, session, component_ids: List[UUID]) -> None:
+        """Raise KeyError naming the components that do not exist."""
+        if not component_ids:
+            return
+        missing = session.execute(
+            text(
+                f"SELECT requested.id FROM ({self._IDS_SQL}) AS requested "
+                f"ANTI JOIN {self._component_table} AS c ON c.id = requested.id"
+            ),
+            {"ids": self._id_list(component_ids)},
+        ).scalars()
+        missing = sorted(str(obj_id) for obj_id in missing)
+        if missing:
+            raise KeyError(f"Components not found: {', '.join(missing)}")
+
+    def _linked_ids(self, session, system_id: UUID) -> List[UUID]:
+        """Return the IDs of the components linked to a system."""
+        return list(
+            session.execute(
+                text(
+                    f"SELECT component_id FROM {self._link_table} "
+                    "WHERE system_id = :system_id ORDER BY component_id"
+                ),
+                {"system_id": str(system_id)},
+            ).scalars()
+        )
+
+    @staticmethod
+    def _record_links(
+        session, system_ids: List[UUID], component_ids: List[UUID]
+    ) -> None:
+        """Log both ends of changed links as updated, for the change feed."""
+        record_changes(session, System, UPDATE, system_ids)
+        record_changes(session, Component, UPDATE, component_ids)
+
+    def _publish_links(self, system_ids: List[UUID], component_ids: List[UUID]) -> None:
+        """Announce both ends of committed link changes as updated."""
+        for system_id in system_ids:
+            self._bus.publish(ChangeEvent(System, UPDATE, system_id))
+        for component_id in component_ids:
+            self._bus.publish(ChangeEvent(Component, UPDATE, component_id))
+
+    @brokered
+    def component_ids(self, system_id: UUID) -> List[UUID]:
+        """Return the IDs of the components linked to a system.
+        Raises:
+            KeyError: If the system does not exist.
+        """
+        with self._session() as session:
+            self._check_system(session, system_id)
+            return self._linked_ids(session, system_id)
+
+    @brokered
+    def link(self, system_id: UUID, component_id: UUID) -> None:
+        """Link a component to a system; linking twice is a no-op.
+        Raises:
+            KeyError: If the system or the component does not exist.
+        """
+        with self._session() as session:
+            self._check_system(session, system_id)
+            self._check_components(session, [component_id])
+            inserted = session.execute(
+                text(
+                    f"INSERT INTO {self._link_table} (system_id, component_id) "
+                    "VALUES (:system_id, :component_id) ON CONFLICT DO NOTHING "
+                    "RETURNING system_id"
+                ),
+                {"system_id": str(system_id), "component_id": str(component_id)},
+            ).first()
+            if inserted is not None:
+                self._record_links(session, [system_id], [component_id])
+            commit_logged(session, self._db_path)
+        if inserted is not None:
+            self._publish_links([system_id], [component_id])
+
+    @brokered
+    def unlink(self, system_id: UUID, component_id: UUID) -> None:
+        """Remove the link between a system and a component.
+        Raises:
+            KeyError: If the component is not linked to the system.
+        """
+        params = {"system_id": str(system_id), "component_id": str(component_id)}
+        where = "WHERE system_id = :system_id AND component_id = :component_id"
+        with self._session() as session:
+            found = session.execute(
+                text(f"SELECT 1 FROM {self._link_table} {where}"), params
+            ).first()
+            if found is None:
+                raise KeyError(
+                    f"Component {component_id} is not linked to system {system_id}"
+                )
+            session.execute(text(f"DELETE FROM {self._link_table} {where}"), params)
+            self._record_links(session, [system_id], [component_id])
+            commit_logged(session, self._db_path)
+        self._publish_links([system_id], [component_id])
+
+    @brokered
+    def replace_components(
+        self, system_id: UUID, component_ids: List[UUID]
+    ) -> Tuple[List[UUID], List[UUID]]:
+        """Make `component_ids` the exact component set of a system.
+        Only the set difference is written: links no longer wanted are deleted
+        and missing ones inserted, all in one transaction.
+        Args:
+            system_id (UUID): The system to update.
+            component_ids (List[UUID]): The complete new set of component IDs.
+        Returns:
+            Tuple[List[UUID], List[UUID]]: The component IDs added and removed.
+        Raises:
+            KeyError: If the system or any of the components does not exist.
+        """
+        wanted = set(component_ids)
+        with self._session() as session:
+            self._check_system(session, system_id)
+            self._check_components(session, sorted(wanted))
+            current = set(self._linked_ids(session, system_id))
+            added = sorted(wanted - current)
+            removed = sorted(current - wanted)
+            if removed:
+                session.execute(
+                    text(
+                        f"DELETE FROM {self._link_table} "
+                        "WHERE system_id = :system_id "
+                        f"AND component_id IN ({self._IDS_SQL})"
+                    ),
+                    {"system_id": str(system_id), "ids": self._id_list(removed)},
+                )
+            if added:
+                session.execute(
+                    text(
+                        f"INSERT INTO {self._link_table} (system_id, component_id) "
+                        "SELECT CAST(:system_id AS UUID), requested.id "
+                        f"FROM ({self._IDS_SQL}) AS requested"
+                    ),
+                    {"system_id": str(system_id), "ids": self._id_list(added)},
+                )
+            if added or removed:
+                self._record_links(session, [system_id], added + removed)
+            commit_logged(session, self._db_path)
+        if added or removed:
+            self._publish_links([system_id], added + removed)
+        return added, removed
+
+    @brokered
+    def unlink_system(self, system_id: UUID) -> None:
+        """Remove every link of a system, e.g. before deleting it."""
+        self._delete_links("system_id", system_id)
+
+    @brokered
+    def unlink_component(self, component_id: UUID) -> None:
+        """Remove every link of a component, e.g. before deleting it."""
+        self._delete_links("component_id", component_id)
+
+    @brokered
+    def delete_system(self, system_id: UUID) -> None:
+        """Delete a system, unlinking its components first.
+        Raises:
+            KeyError: If the system does not exist.
+        """
+        self._delete_linked(System, "system_id", system_id)
+
+    @brokered
+    def delete_component(self, component_id: UUID) -> None:
+        """Delete a component, removing it from every system first.
+        Raises:
+            KeyError: If the component does not exist.
+        """
+        self._delete_linked(Component, "component_id", component_id)
+
+    def _other_end(self, column: str) -> Tuple[str, str]:
+        """Return the link column opposite `column` and the table it refers to."""
+        if column == "system_id":
+            return "component_id", self._component_table
+        return "system_id", self._system_table
+
+    def _links_changed(
+        self, session, column: str, obj_id: UUID, others: List[UUID]
+    ) -> Tuple[List[UUID], List[UUID]]:
+        """Log the links of `obj_id` to `others` as changed.
+        Returns:
+            Tuple[List[UUID], List[UUID]]: The system and component IDs, to
+                publish once committed.
+        """
+        ends = ([obj_id], others) if column == "system_id" else (others, [obj_id])
+        if others:
+            self._record_links(session, *ends)
+        return ends
+
+    def _delete_links(self, column: str, obj_id: UUID) -> List[UUID]:
+        """Delete the link rows whose `column` equals `obj_id`.
+        Returns:
+            List[UUID]: The IDs at the other end of the deleted links.
+        """
+        other, _ = self._other_end(column)
+        with self._session() as session:
+            linked = list(
+                session.execute(
+                    text(
+                        f"DELETE FROM {self._link_table} WHERE {column} = :id "
+                        f"RETURNING {other}"
+                    ),
+                    {"id": str(obj_id)},
+                ).scalars()
+            )
+            ends = self._links_changed(session, column, obj_id, linked)
+            commit_logged(session, self._db_path)
+        if linked:
+            self._publish_links(*ends)
+        return linked
+
+    def _restore_links(self, column: str, obj_id: UUID, linked: List[UUID]) -> None:
+        """Link `obj_id` again to those of `linked` that still exist."""
+        other, other_table = self._other_end(column)
+        with self._session() as session:
+            restored = list(
+                session.execute(
+                    text(
+                        f"INSERT INTO {self._link_table} ({column}, {other}) "
+                        f"SELECT CAST(:id AS UUID), requested.id "
+                        f"FROM ({self._IDS_SQL}) AS requested "
+                        f"WHERE requested.id IN (SELECT id FROM {other_table}) "
+                        f"ON CONFLICT DO NOTHING RETURNING {other}"
+                    ),
+                    {"id": str(obj_id), "ids": self._id_list(linked)},
+                ).scalars()
+            )
+            ends = self._links_changed(session, column, obj_id, restored)
+            commit_logged(session, self._db_path)
+        if restored:
+            self._publish_links(*ends)
+
+    def _delete_linked(self, model_cls: type, column: str, obj_id: UUID) -> None:
+        """Delete the links of an object, then the object.
+        DuckDB rejects deleting a row in the transaction that deleted the rows
+        referencing it, so the two deletes are committed one after the other;
+        should the object's delete fail, its links are restored.
+        """
+        with self._session() as session:
+            if model_cls is System:
+                self._check_system(session, obj_id)
+            else:
+                self._check_components(session, [obj_id])
+        linked = self._delete_links(column, obj_id)
+        proxy = PublishingProxy(
+            DuckDBProxy(model_cls, self._db_path, self._registry), model_cls, self._bus
+        )
+        try:
+            proxy.delete(obj_id)
+        except Exception:
+            if linked:
+                self._restore_links(column, obj_id, linked)
+            raise
+
+    async def acomponent_ids(self, system_id: UUID) -> List[UUID]:
+        """Return a system's component IDs without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.component_ids, system_id)
+
+    async def alink(self, system_id: UUID, component_id: UUID) -> None:
+        """Link a component to a system without blocking the event loop."""
+        await DB_EXECUTOR.run(self.link, system_id, component_id)
+
+    async def aunlink(self, system_id: UUID, component_id: UUID) -> None:
+        """Unlink a component from a system without blocking the event loop."""
+        await DB_EXECUTOR.run(self.unlink, system_id, component_id)
+
+    async def areplace_components(
+        self, system_id: UUID, component_ids: List[UUID]
+    ) -> Tuple[List[UUID], List[UUID]]:
+        """Replace a system's component set without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.replace_components, system_id, component_ids)
+
+    async def aunlink_system(self, system_id: UUID) -> None:
+        """Remove every link of a system without blocking the event loop."""
+        await DB_EXECUTOR.run(self.unlink_system, system_id)
+
+    async def aunlink_component(self, component_id: UUID) -> None:
+        """Remove every link of a component without blocking the event loop."""
+        await DB_EXECUTOR.run(self.unlink_component, component_id)
+
+    async def adelete_system(self, system_id: UUID) -> None:
+        """Delete a system and its links without blocking the event loop."""
+        await DB_EXECUTOR.run(self.delete_system, system_id)
+
+    async def adelete_component(self, component_id: UUID) -> None:
+        """Delete a component and its links without blocking the event loop."""
+        await DB_EXECUTOR.run(self.delete_component, component_id)
+
+
+class StatsService(SQLService):
+    """Aggregate statistics over systems, components and their links.
+    Each statistic is a single DuckDB GROUP BY or join query, so only the
+    aggregated rows leave the database. Results are columnar: a dict mapping
+    each column name to the list of its values, all lists the same length.
+    """
+
+    def _columns(self, sql: str, columns: Sequence[str]) -> Dict[str, List[Any]]:
+        """Run a query and return its rows transposed into columns."""
+        with self._session() as session:
+            rows = session.execute(text(sql)).all()
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        return {name: list(column) for name, column in zip(columns, values)}
+
+    @brokered
+    def summary(self) -> Dict[str, int]:
+        """Return the number of systems, components, links, orphan components
+        (linked to no system) and empty systems (with no components).
+        """
+        columns = self._columns(
+            f"""
+            SELECT
+                (SELECT count(*) FROM {self._system_table}),
+                (SELECT count(*) FROM {self._component_table}),
+                (SELECT count(*) FROM {self._link_table}),
+                (SELECT count(*) FROM {self._component_table} AS c
+                 ANTI JOIN {self._link_table} AS l ON l.component_id = c.id),
+                (SELECT count(*) FROM {self._system_table} AS s
+                 ANTI JOIN {self._link_table} AS l ON l.system_id = s.id)
+            """,
+            ["systems", "components", "links", "orphan_components", "empty_systems"],
+        )
+        return {name: values[0] for name, values in columns.items()}
+
+    @brokered
+    def components_by_type(self) -> Dict[str, List[Any]]:
+        """Return the number of components of each ComponentType, zeros included."""
+        columns = self._columns(
+            f"SELECT CAST(type AS VARCHAR), count(*) FROM {self._component_table} "
+            "GROUP BY ALL",
+            ["type", "count"],
+        )
+        # The enum is stored by member name; report member values as the API does
+        counts = dict(zip(columns["type"], columns["count"]))
+        return {
+            "type": [member.value for member in ComponentType],
+            "count": [counts.get(member.name, 0) for member in ComponentType],
+        }
+
+    @brokered
+    def components_per_system(self) -> Dict[str, List[Any]]:
+        """Return every system with its component count, largest first."""
+        return self._columns(
+            f"""
+            SELECT CAST(s.id AS VARCHAR), s.name, count(l.component_id) AS n
+            FROM {self._system_table} AS s
+            LEFT JOIN {self._link_table} AS l ON l.system_id = s.id
+            GROUP BY s.id, s.name
+            ORDER BY n DESC, s.name, s.id
+            """,
+            ["system_id", "name", "component_count"],
+        )
+
+    @brokered
+    def orphan_components(self) -> Dict[str, List[Any]]:
+        """Return the components not linked to any system, by name."""
+        columns = self._columns(
+            f"""
+            SELECT CAST(c.id AS VARCHAR), c.name, CAST(c.type AS VARCHAR)
+            FROM {self._component_table} AS c
+            ANTI JOIN {self._link_table} AS l ON l.component_id = c.id
+            ORDER BY c.name, c.id
+            """,
+            ["id", "name", "type"],
+        )
+        columns["type"] = [ComponentType[name].value for name in columns["type"]]
+        return columns
+
+    async def asummary(self) -> Dict[str, int]:
+        """Return the summary counts without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.summary)
+
+    async def acomponents_by_type(self) -> Dict[str, List[Any]]:
+        """Return the components per type without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.components_by_type)
+
+    async def acomponents_per_system(self) -> Dict[str, List[Any]]:
+        """Return the components per system without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.components_per_system)
+
+    async def aorphan_components(self) -> Dict[str, List[Any]]:
+        """Return the orphan components without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.orphan_components)
+
+
+class TableTagService(SQLService):
+    """Entity tags summarizing the current contents of whole tables.
+    A tag digests, per table, the row count, the latest `updated_at`, the sum
+    of the row versions and the XOR of the row-ID hashes, all computed in one
+    aggregate query. Every create, update and delete changes at least one of
+    them, so a response built from the tables is unchanged while the tag is.
+    """
+
+    def _aggregate(self, table) -> str:
+        """Return the SELECT list summarizing one table."""
+        name = self._quote(table.name)
+        if "version" not in table.columns:
+            # Link tables: rows are only ever inserted or deleted
+            keys = ", ".join(self._quote(column.name) for column in table.primary_key)
+            return f"(SELECT [count(*), bit_xor(hash({keys}))] FROM {name})"
+        return (
+            "(SELECT [count(*), epoch_us(max(updated_at)), sum(version), "
+            f"bit_xor(hash(id))] FROM {name})"
+        )
+
+    @brokered
+    def table_tag(self, model_cls: type, include: Sequence[str] = ()) -> str:
+        """Return the tag of a model's table and of the tables of `include`.
+        Args:
+            model_cls (type): The table model listed.
+            include (Sequence[str]): Relationships embedded in the listing.
+        Returns:
+            str: A hex digest, the same for as long as the tables are unchanged.
+        Raises:
+            ValueError: If a name is not a relationship of the model.
+        """
+        mapper = inspect(model_cls)
+        tables = [model_cls.__table__]
+        for name in include:
+            if name not in mapper.relationships:
+                raise ValueError(f"{model_cls.__name__} has no relationship {name!r}")
+            relationship = mapper.relationships[name]
+            tables.append(relationship.mapper.local_table)
+            if relationship.secondary is not None:
+                tables.append(relationship.secondary)
+        sql = "SELECT " + ", ".join(self._aggregate(table) for table in tables)
+        with self._session() as session:
+            row = session.execute(text(sql)).one()
+        return hashlib.blake2b(repr(tuple(row)).encode(), digest_size=16).hexdigest()
+
+    async def atable_tag(self, model_cls: type, include: Sequence[str] = ()) -> str:
+        """Return a table tag without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.table_tag, model_cls, tuple(include))
+
+
+class ChangeFeedService(SQLService):
+    """Incremental changes since a cursor, read from the change log.
+    Every write through DuckDBProxy or the link service appends to the log in
+    its own transaction, so clients can fetch what changed since their last
+    sync instead of whole collections. Link changes are reported as updates
+    of the system and the components concerned.
+    """
+
+    @brokered
+    def changes(
+        self,
+        since: Optional[int],
+        types: Optional[Sequence[str]] = None,
+        limit: int = 1000,
+    ) -> ChangeBatch:
+        """Return the latest change to each object after a cursor.
+        Args:
+            since (Optional[int]): Cursor of the previous batch; None returns
+                just the cursor to start from.
+            types (Optional[Sequence[str]]): Type names to include; all if None.
+            limit (int): Maximum number of changes returned.
+        Returns:
+            ChangeBatch: The changes, oldest first, and the next cursor.
+        Raises:
+            ValueError: If a type name is unknown.
+            CursorExpiredError: If changes after `since` are no longer kept.
+        """
+        with self._session() as session:
+            return read_changes(session, since, types, limit)
+
+    async def achanges(
+        self,
+        since: Optional[int],
+        types: Optional[Sequence[str]] = None,
+        limit: int = 1000,
+    ) -> ChangeBatch:
+        """Return the changes after a cursor without blocking the event loop."""
+        return await DB_EXECUTOR.run(self.changes, since, types, limit)
@@ -14,33 +14,51 @@
 
 # sqlmodel_models.py
 import uuid
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from pydantic import NaiveDatetime
 from sqlalchemy import JSON, Column
 from sqlmodel import Field, Relationship, SQLModel
 
 from .model_enum import ComponentType
 
 
-class User(SQLModel, table=True):
+def utcnow() -> datetime:
+    """Return the current UTC time, naive as stored in TIMESTAMP columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Versioned(SQLModel):
+    """Row version columns, maintained by the persistence layer on every write.
+    `version` is 1 when a row is created and grows by one on each update;
+    `updated_at` is the UTC time of the last write. Values sent by clients are
+    ignored.
+    """
+
+    version: int = Field(default=1)
+    updated_at: NaiveDatetime = Field(default_factory=utcnow)
+
+
+class User(Versioned, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     name: str
     auths: List["UserAuth"] = Relationship(back_populates="user")
 
 
-class Password(SQLModel, table=True):
+class Password(Versioned, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     password: str
 
 
-class Role(SQLModel, table=True):
+class Role(Versioned, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str
     role_auths: List["RoleAuth"] = Relationship(back_populates="role")
     user_auths: List["UserAuth"] = Relationship(back_populates="role")
 
 
-class RoleAuth(SQLModel, table=True):
+class RoleAuth(Versioned, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str
     feature_name: str
@@ -48,7 +66,7 @@ class RoleAuth(SQLModel, table=True):
     role: Optional[Role] = Relationship(back_populates="role_auths")
 
 
-class UserAuth(SQLModel, table=True):
+class UserAuth(Versioned, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id")
     role_id: uuid.UUID = Field(foreign_key="role.id")
@@ -61,7 +79,7 @@ class SystemComponentLink(SQLModel, table=True):
     component_id: uuid.UUID = Field(foreign_key="component.id", primary_key=True)
 
 
-class Component(SQLModel, table=True):
+class Component(Versioned, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str
     type: ComponentType
@@ -73,9 +91,54 @@ class Component(SQLModel, table=True):
     )
 
 
-class System(SQLModel, table=True):
+class System(Versioned, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str
     components: List[Component] = Relationship(
         back_populates="systems", link_model=SystemComponentLink
     )
+
+
+# Response models for the routes' include= parameter. Relationships are None
+# unless requested, and the routes leave None fields out of the response.
+class UserAuthRead(Versioned):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    role_id: uuid.UUID
+
+
+class RoleAuthRead(Versioned):
+    id: uuid.UUID
+    name: str
+    feature_name: str
+    role_id: uuid.UUID
+
+
+class UserRead(Versioned):
+    id: uuid.UUID
+    name: str
+    auths: Optional[List[UserAuthRead]] = None
+
+
+class RoleRead(Versioned):
+    id: uuid.UUID
+    name: str
+    role_auths: Optional[List[RoleAuthRead]] = None
+    user_auths: Optional[List[UserAuthRead]] = None
+
+
+class ComponentRead(Versioned):
+    id: uuid.UUID
+    name: str
+    type: ComponentType
+    properties: List[Dict[str, Any]] = []
+    systems: Optional[List["SystemRead"]] = None
+
+
+class SystemRead(Versioned):
+    id: uuid.UUID
+    name: str
+    components: Optional[List[ComponentRead]] = None
+
+
+ComponentRead.model_rebuild()
@@ -0,0 +1,96 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# tokens.py
+import os
+import time
+from typing import Callable, Optional, Tuple
+from uuid import UUID
+
+from jose import JWTError, jwt
+
+from .authentication import Authentication
+
+# Session token settings, overridable through the environment
+TOKEN_TTL = int(os.environ.get("SAMMY_TOKEN_TTL", "900"))
+TOKEN_ALGORITHM = "HS256"
+
+
+class InvalidTokenError(ValueError):
+    """Raised when a session token is malformed, forged or expired."""
+
+
+class TokenService:
+    """Issue and validate short-lived signed session tokens.
+    Tokens are HS256 JWTs signed with the Fernet key Authentication already
+    manages, so no additional secret has to be provisioned. Validating one is
+    an HMAC check, so authenticated requests never touch bcrypt.
+    Attributes:
+        ttl (int): Seconds a token stays valid after it is issued.
+    """
+
+    def __init__(
+        self,
+        auth: Authentication,
+        ttl: int = TOKEN_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the token service.
+        Args:
+            auth (Authentication): Supplies the signing key.
+            ttl (int): Seconds a token stays valid after it is issued.
+            clock (Callable[[], float]): Returns the current Unix time.
+        """
+        self.ttl = ttl
+        self._key = auth.fernet_key
+        self._clock = clock
+
+    def issue(self, user_id: UUID) -> Tuple[str, int]:
+        """Issue a token for a user.
+        Args:
+            user_id (UUID): The user the token authenticates.
+        Returns:
+            Tuple[str, int]: The token and its expiry as a Unix timestamp.
+        """
+        now = int(self._clock())
+        expires_at = now + self.ttl
+        claims = {"sub": str(user_id), "iat": now, "exp": expires_at}
+        return jwt.encode(claims, self._key, algorithm=TOKEN_ALGORITHM), expires_at
+
+    def validate(self, token: Optional[str]) -> UUID:
+        """Check a token's signature and expiry.
+        Args:
+            token (Optional[str]): The token presented by the client.
+        Returns:
+            UUID: The ID of the user the token was issued to.
+        Raises:
+            InvalidTokenError: If the token is missing, invalid or expired.
+        """
+        if not token:
+            raise InvalidTokenError("Missing token")
+        try:
+            # Expiry is checked below against the injectable clock
+            claims = jwt.decode(
+                token,
+                self._key,
+                algorithms=[TOKEN_ALGORITHM],
+                options={"verify_exp": False},
+            )
+            user_id = UUID(claims["sub"])
+            expires_at = int(claims["exp"])
+        except (JWTError, KeyError, TypeError, ValueError) as e:
+            raise InvalidTokenError(f"Invalid token: {e}")
+        if expires_at <= self._clock():
+            raise InvalidTokenError("Token has expired")
+        return user_id
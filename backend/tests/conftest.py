@@ -0,0 +1,42 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# conftest.py
+import pytest
+
+from app.engine_registry import EngineRegistry
+
+
+class FakeClock:
+    """A clock that only moves when a test sets or advances `now`"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """A FakeClock starting at a fixed Unix time"""
+    return FakeClock()
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh database file and the registry holding its engine"""
+    registry = EngineRegistry()
+    yield str(tmp_path / "test.duckdb"), registry
+    registry.dispose()
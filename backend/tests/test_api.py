@@ -0,0 +1,286 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# test_api.py
+import importlib
+import json
+import pkgutil
+import sys
+import uuid
+
+import bcrypt
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from app.authentication import hash_rounds
+from app.hashing import default_authentication
+from app.replica import REPLICA, SNAPSHOT_REPLICA
+
+# The API imports this package as src.app; alias every module so both names
+# share one set of table definitions
+sys.modules.setdefault("src.app", app)
+for _module in pkgutil.iter_modules(app.__path__):
+    sys.modules.setdefault(
+        f"src.app.{_module.name}", importlib.import_module(f"app.{_module.name}")
+    )
+
+from src.api import app as api  # noqa: E402
+
+pytestmark = pytest.mark.api
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(api) as client:
+        yield client
+
+
+@pytest.fixture
+def component(client):
+    created = client.post(
+        "/components/", json={"name": "API Component", "type": "hardware"}
+    ).json()
+    yield created
+    client.delete(f"/components/{created['id']}")
+
+
+class TestBatch:
+    def test_reports_found_and_missing_ids(self, client, component):
+        unknown = str(uuid.uuid4())
+        response = client.get(
+            "/components/batch", params={"ids": f"{component['id']},{unknown}"}
+        )
+        assert response.status_code == 200
+        assert "ETag" in response.headers
+        body = response.json()
+        assert [item["id"] for item in body["items"]] == [component["id"]]
+        assert body["missing"] == [unknown]
+
+    def test_ids_are_required(self, client):
+        assert client.get("/components/batch").status_code == 422
+
+    def test_invalid_id(self, client):
+        assert client.get("/systems/batch", params={"ids": "nope"}).status_code == 422
+
+    def test_documented_with_its_own_schema(self, client):
+        paths = client.get("/openapi.json").json()["paths"]
+        content = paths["/components/batch"]["get"]["responses"]["200"]["content"]
+        schema = content["application/json"]["schema"]
+        assert schema["$ref"].endswith("/Batch_ComponentRead_")
+        listed = paths["/components/"]["get"]["parameters"]
+        assert "ids" not in [parameter["name"] for parameter in listed]
+
+
+class TestDelete:
+    def test_linked_system(self, client, component):
+        system = client.post("/systems/", json={"name": "API System"}).json()
+        linked = client.put(
+            f"/systems/{system['id']}/components", json=[component["id"]]
+        )
+        assert linked.status_code == 200
+        assert client.delete(f"/systems/{system['id']}").status_code == 204
+        assert client.get(f"/systems/{system['id']}").status_code == 404
+        assert client.delete(f"/systems/{system['id']}").status_code == 404
+        assert client.get(f"/components/{component['id']}").status_code == 200
+
+
+class TestUpdate:
+    def test_linked_component_and_system(self, client, component):
+        system = client.post("/systems/", json={"name": "API System"}).json()
+        try:
+            client.put(f"/systems/{system['id']}/components", json=[component["id"]])
+            body = {**component, "name": "Renamed Component"}
+            updated = client.put(f"/components/{component['id']}", json=body)
+            assert updated.status_code == 200
+            assert updated.json()["name"] == "Renamed Component"
+            # The path ID wins over the one in the body
+            body = {**system, "id": str(uuid.uuid4()), "name": "Renamed System"}
+            updated = client.put(f"/systems/{system['id']}", json=body)
+            assert updated.status_code == 200
+            assert updated.json()["id"] == system["id"]
+            assert updated.json()["name"] == "Renamed System"
+        finally:
+            client.delete(f"/systems/{system['id']}")
+
+
+@pytest.fixture
+def login_user(client):
+    user = client.post("/users/", json={"name": "API Login User"}).json()
+    client.post("/passwords/", json={"id": user["id"], "password": "s3cret"})
+    yield user
+    client.delete(f"/passwords/{user['id']}")
+    client.delete(f"/users/{user['id']}")
+
+
+def login(client, user_id, password):
+    return client.post("/auth/login", json={"user_id": user_id, "password": password})
+
+
+class TestAuth:
+    def test_passwords_are_stored_hashed(self, client, login_user):
+        stored = client.get(f"/passwords/{login_user['id']}").json()["password"]
+        assert stored.startswith("$2") and "s3cret" not in stored
+
+    def test_login_and_me(self, client, login_user):
+        response = login(client, login_user["id"], "s3cret")
+        assert response.status_code == 200
+        token = response.json()["access_token"]
+        me = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert me.status_code == 200
+        assert me.json()["id"] == login_user["id"]
+
+    def test_invalid_credentials(self, client, login_user):
+        assert login(client, login_user["id"], "wrong").status_code == 401
+        assert login(client, str(uuid.uuid4()), "s3cret").status_code == 401
+
+    def test_changed_password(self, client, login_user):
+        changed = client.put(
+            f"/passwords/{login_user['id']}",
+            json={"id": login_user["id"], "password": "n3w"},
+        )
+        assert changed.status_code == 200
+        assert login(client, login_user["id"], "s3cret").status_code == 401
+        assert login(client, login_user["id"], "n3w").status_code == 200
+
+    def test_me_requires_a_valid_token(self, client):
+        missing = client.get("/auth/me")
+        assert missing.status_code == 401
+        assert missing.headers["WWW-Authenticate"] == "Bearer"
+        invalid = client.get("/auth/me", headers={"Authorization": "Bearer nope"})
+        assert invalid.status_code == 401
+
+    def test_login_upgrades_weaker_hashes(self, client, login_user):
+        weak = bcrypt.hashpw(b"s3cret", bcrypt.gensalt(rounds=4)).decode()
+        imported = client.post(
+            "/passwords/bulk?upsert=true",
+            json=[{"id": login_user["id"], "password": weak}],
+        )
+        assert imported.status_code == 201
+        assert login(client, login_user["id"], "s3cret").status_code == 200
+        # The rehash runs as a background task of the login
+        stored = client.get(f"/passwords/{login_user['id']}").json()["password"]
+        assert hash_rounds(stored.encode()) == default_authentication().rounds > 4
+        assert login(client, login_user["id"], "s3cret").status_code == 200
+
+    def test_bulk_passwords_must_be_hashes(self, client):
+        response = client.post(
+            "/passwords/bulk", json=[{"id": str(uuid.uuid4()), "password": "plain"}]
+        )
+        assert response.status_code == 400
+
+
+class TestConditionalGet:
+    def test_item_revalidates_with_etag(self, client, component):
+        url = f"/components/{component['id']}"
+        etag = client.get(url).headers["ETag"]
+        response = client.get(url, headers={"If-None-Match": f"W/{etag}"})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert client.get(url, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    def test_if_modified_since_has_whole_seconds(self, client, component):
+        url = f"/components/{component['id']}"
+        last_modified = client.get(url).headers["Last-Modified"]
+        # updated_at has microseconds, the HTTP date only whole seconds
+        response = client.get(url, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+        earlier = {"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}
+        assert client.get(url, headers=earlier).status_code == 200
+
+    def test_if_none_match_takes_precedence(self, client, component):
+        url = f"/components/{component['id']}"
+        first = client.get(url)
+        stale = {
+            "If-None-Match": '"stale"',
+            "If-Modified-Since": first.headers["Last-Modified"],
+        }
+        assert client.get(url, headers=stale).status_code == 200
+        current = {
+            "If-None-Match": first.headers["ETag"],
+            "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT",
+        }
+        assert client.get(url, headers=current).status_code == 304
+
+    def test_list_revalidates_with_etag(self, client, component):
+        listed = client.get("/components/")
+        assert "Accept" in listed.headers["Vary"]
+        response = client.get(
+            "/components/", headers={"If-None-Match": listed.headers["ETag"]}
+        )
+        assert response.status_code == 304
+        assert "Accept" in response.headers["Vary"]
+
+    def test_json_and_ndjson_have_their_own_etags(self, client, component):
+        ndjson = {"Accept": "application/x-ndjson"}
+        listed = client.get("/components/")
+        streamed = client.get("/components/", headers=ndjson)
+        assert "Accept" in streamed.headers["Vary"]
+        assert streamed.headers["ETag"] != listed.headers["ETag"]
+        stale = {**ndjson, "If-None-Match": listed.headers["ETag"]}
+        assert client.get("/components/", headers=stale).status_code == 200
+        current = {**ndjson, "If-None-Match": streamed.headers["ETag"]}
+        assert client.get("/components/", headers=current).status_code == 304
+
+
+class TestChangeFeed:
+    def test_password_changes_carry_no_hash(self, client):
+        cursor = client.get("/changes").json()["cursor"]
+        password = client.post("/passwords/", json={"password": "hash"}).json()
+        try:
+            feed = client.get(
+                "/changes", params={"since": cursor, "types": "passwords"}
+            ).json()
+        finally:
+            client.delete(f"/passwords/{password['id']}")
+        assert feed["changes"] == [
+            {
+                "type": "passwords",
+                "id": password["id"],
+                "action": "create",
+                "data": None,
+            }
+        ]
+
+    def test_replicas_do_not_stream(self, client, monkeypatch):
+        monkeypatch.setattr(sys.modules["src.api"], "REPLICA_ROLE", REPLICA)
+        monkeypatch.setattr(SNAPSHOT_REPLICA, "is_fresh", lambda: True)
+        monkeypatch.setattr(SNAPSHOT_REPLICA, "age", lambda: 0.0)
+        response = client.get("/changes/stream")
+        assert response.status_code == 503
+        assert "primary" in response.json()["detail"]
+        assert client.get("/changes").status_code == 200
+
+
+class TestSearch:
+    def test_finds_names(self, client, component):
+        response = client.get(
+            "/search/", params={"q": "api comp", "types": "component"}
+        )
+        assert response.status_code == 200
+        assert component["id"] in [hit["id"] for hit in response.json()]
+        bad = client.get("/search/", params={"q": "api", "types": "nope"})
+        assert bad.status_code == 400
+
+
+class TestNDJSON:
+    def test_streams_every_page(self, client, component, monkeypatch):
+        monkeypatch.setattr(sys.modules["src.api"], "STREAM_BATCH_SIZE", 2)
+        listed = client.get("/components/").json()
+        streamed = client.get(
+            "/components/", headers={"Accept": "application/x-ndjson"}
+        )
+        assert streamed.status_code == 200
+        ids = [json.loads(line)["id"] for line in streamed.text.splitlines()]
+        assert sorted(ids) == sorted(item["id"] for item in listed)
@@ -16,7 +16,7 @@ import os
 
 import pytest
 
-from app.authentication import Authentication
+from app.authentication import Authentication, calibrate_rounds, hash_rounds
 
 
 @pytest.fixture
@@ -43,3 +43,47 @@ def test_key_file_created(auth):
     assert (
         os.path.exists(auth.__class__.__module__ + "/key.bin") is False
     )  # Filepath is patched
+
+
+def test_calibrate_rounds_extrapolates_from_probe():
+    times = iter([0.0, 0.004])  # 4ms at the probe cost of 8
+    assert calibrate_rounds(0.25, 4, 16, timer=lambda: next(times), probes=1) == 13
+
+
+def test_calibrate_rounds_uses_median_probe():
+    # Probes of 4ms, 1s (a stall) and 4ms: the stall is ignored
+    times = iter([0.0, 0.004, 0.0, 1.0, 0.0, 0.004])
+    assert calibrate_rounds(0.25, 4, 16, timer=lambda: next(times), probes=3) == 13
+
+
+def test_calibrate_rounds_is_clamped():
+    times = iter([0.0, 1.0])
+    assert calibrate_rounds(0.25, 10, 16, timer=lambda: next(times), probes=1) == 10
+
+
+def test_set_rounds_keeps_salt(auth):
+    original = auth.salt
+    auth.set_rounds(4)
+    assert auth.rounds == 4
+    assert auth.salt[-22:] == original[-22:]
+
+
+def test_verify_and_update_rehashes_outdated_cost(auth):
+    auth.set_rounds(4)
+    old_hash = auth.hash_password("secure_password")
+    auth.set_rounds(5)
+    assert auth.needs_rehash(old_hash)
+    valid, new_hash = auth.verify_and_update("secure_password", old_hash)
+    assert valid
+    assert hash_rounds(new_hash) == 5
+    assert not auth.needs_rehash(new_hash)
+    assert auth.verify_and_update("secure_password", new_hash) == (True, None)
+    assert auth.verify_and_update("wrong_password", old_hash) == (False, None)
+
+
+def test_higher_cost_hashes_are_kept(auth):
+    auth.set_rounds(5)
+    stronger_hash = auth.hash_password("secure_password")
+    auth.set_rounds(4)
+    assert not auth.needs_rehash(stronger_hash)
+    assert auth.verify_and_update("secure_password", stronger_hash) == (True, None)
@@ -0,0 +1,78 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import uuid
+
+import pytest
+
+from app.authorization import AuthorizationIndex
+from app.events import EventBus, PublishingProxy
+from app.persistence import InMemoryProxy
+from app.sqlmodel_models import RoleAuth, UserAuth
+
+
+@pytest.fixture
+def index():
+    return AuthorizationIndex()
+
+
+@pytest.fixture
+def ids():
+    return {name: uuid.uuid4() for name in ["alice", "bob", "admin", "viewer"]}
+
+
+class TestAuthorizationIndex:
+    def test_user_gets_features_of_their_roles(self, index, ids):
+        index.put_role_auth(uuid.uuid4(), ids["admin"], "billing")
+        index.put_role_auth(uuid.uuid4(), ids["viewer"], "reports")
+        index.put_user_auth(uuid.uuid4(), ids["alice"], ids["admin"])
+        index.put_user_auth(uuid.uuid4(), ids["alice"], ids["viewer"])
+        index.put_user_auth(uuid.uuid4(), ids["bob"], ids["viewer"])
+        assert index.features_for(ids["alice"]) == ["billing", "reports"]
+        assert index.has_feature(ids["bob"], "reports")
+        assert not index.has_feature(ids["bob"], "billing")
+        assert index.users_with("reports") == sorted([ids["alice"], ids["bob"]])
+
+    def test_feature_kept_while_another_path_grants_it(self, index, ids):
+        index.put_role_auth(uuid.uuid4(), ids["admin"], "reports")
+        index.put_role_auth(uuid.uuid4(), ids["viewer"], "reports")
+        index.put_user_auth(uuid.uuid4(), ids["alice"], ids["admin"])
+        via_viewer = uuid.uuid4()
+        index.put_user_auth(via_viewer, ids["alice"], ids["viewer"])
+        index.remove_user_auth(via_viewer)
+        assert index.has_feature(ids["alice"], "reports")
+
+    def test_updating_a_row_replaces_it(self, index, ids):
+        row_id = uuid.uuid4()
+        index.put_user_auth(uuid.uuid4(), ids["alice"], ids["admin"])
+        index.put_role_auth(row_id, ids["admin"], "billing")
+        index.put_role_auth(row_id, ids["admin"], "reports")
+        index.put_role_auth(row_id, ids["admin"], "reports")
+        assert index.features_for(ids["alice"]) == ["reports"]
+        index.remove_role_auth(row_id)
+        assert index.features_for(ids["alice"]) == []
+        assert index.users_with("reports") == []
+
+    def test_follows_published_writes(self, index, ids):
+        bus = EventBus()
+        bus.subscribe(index.apply)
+        user_auths = PublishingProxy(InMemoryProxy[UserAuth](), UserAuth, bus)
+        role_auths = PublishingProxy(InMemoryProxy[RoleAuth](), RoleAuth, bus)
+        role_auths.create(
+            RoleAuth(name="Billing", feature_name="billing", role_id=ids["admin"])
+        )
+        grant = user_auths.create(UserAuth(user_id=ids["alice"], role_id=ids["admin"]))
+        assert index.has_feature(ids["alice"], "billing")
+        user_auths.delete(grant.id)
+        assert not index.has_feature(ids["alice"], "billing")
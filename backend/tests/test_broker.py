@@ -0,0 +1,153 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# test_broker.py
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.broker import BrokerClient, BrokerError, BrokerProxy
+from app.broker_server import WriteBroker
+from app.engine_registry import EngineRegistry
+from app.events import CREATE, DELETE, EventBus
+from app.model_enum import ComponentType
+from app.services import StatsService, SystemComponentLinkService
+from app.sqlmodel_models import Component, System, User
+
+AUTHKEY = b"test-broker-key"
+
+
+@pytest.fixture
+def broker(tmp_path):
+    registry = EngineRegistry()
+    broker = WriteBroker(
+        str(tmp_path / "broker.sock"),
+        str(tmp_path / "broker.duckdb"),
+        registry,
+        authkey=AUTHKEY,
+    )
+    broker.start()
+    yield broker
+    broker.stop()
+    registry.dispose()
+
+
+@pytest.fixture
+def client(broker):
+    client = BrokerClient(broker.socket_path, authkey=AUTHKEY)
+    yield client
+    client.close()
+
+
+def _write_users(socket_path, worker, count):
+    client = BrokerClient(socket_path, authkey=AUTHKEY)
+    proxy = BrokerProxy(User, client)
+    for i in range(count):
+        proxy.create(User(name=f"W{worker}-{i}"))
+    client.close()
+
+
+def test_proxy_round_trip(client):
+    proxy = BrokerProxy(User, client)
+    created = proxy.create(User(name="Alice"))
+    assert proxy.read(created.id).name == "Alice"
+    proxy.update(created.id, User(id=created.id, name="Alicia"))
+    proxy.create_many([User(name=f"U{i}") for i in range(5)])
+    assert len(list(proxy.iter_all(batch_size=2))) == 6
+    assert proxy.list_page(limit=4).next_cursor is not None
+    proxy.delete(created.id)
+    with pytest.raises(KeyError):
+        proxy.read(created.id)
+
+
+def test_errors_are_raised_in_the_caller(client):
+    proxy = BrokerProxy(User, client)
+    existing = proxy.create(User(name="Existing"))
+    with pytest.raises(IntegrityError):
+        proxy.create(User(id=existing.id, name="Duplicate"))
+    # The connection is still usable afterwards
+    assert [user.name for user in proxy.list_all()] == ["Existing"]
+
+
+def test_relationships_are_loaded_in_the_broker(client):
+    component = BrokerProxy(Component, client).create(
+        Component(name="Disk", type=ComponentType.HARDWARE)
+    )
+    system = BrokerProxy(System, client).create(System(name="Server"))
+    SystemComponentLinkService(broker=client).link(system.id, component.id)
+    loaded = BrokerProxy(System, client).with_relationships(["components"])
+    assert [c.name for c in loaded.read(system.id).components] == ["Disk"]
+    assert StatsService(broker=client).summary()["links"] == 1
+
+
+def test_only_allowed_methods_are_served(client):
+    with pytest.raises(ValueError):
+        client.call_proxy(User, (), "iter_all")
+    with pytest.raises(ValueError):
+        client.call_service("StatsService", "_columns", "SELECT 1", ["one"])
+    with pytest.raises(ValueError):
+        client.call_proxy(object, (), "list_all")
+
+
+def test_wrong_key_is_rejected(broker):
+    client = BrokerClient(broker.socket_path, authkey=b"wrong")
+    with pytest.raises(BrokerError):
+        client.call_proxy(User, (), "list_all")
+
+
+def test_change_events_reach_subscribers(client):
+    received = []
+    deleted = threading.Event()
+
+    def listener(event):
+        received.append((event.model, event.action, event.obj_id))
+        if event.action == DELETE:
+            deleted.set()
+
+    bus = EventBus()
+    bus.subscribe(listener)
+    client.subscribe(bus)
+    proxy = BrokerProxy(User, client)
+    # Events are only sent once the subscription is registered
+    while not received:
+        proxy.create(User(name="Probe"))
+        deleted.wait(0.2)
+    user = proxy.create(User(name="Alice"))
+    proxy.delete(user.id)
+    assert deleted.wait(5)
+    assert received[-2:] == [(User, CREATE, user.id), (User, DELETE, user.id)]
+
+
+def test_concurrent_writers(client):
+    proxy = BrokerProxy(User, client)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: proxy.create(User(name=f"T{i}")), range(40)))
+    assert len(proxy.list_all()) == 40
+
+
+def test_worker_processes_write_through_one_broker(broker, client):
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_write_users, args=(broker.socket_path, worker, 10))
+        for worker in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    assert len(BrokerProxy(User, client).list_all()) == 30
@@ -0,0 +1,90 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from app.caching_proxy import CachingProxy, ReadCache
+from app.persistence import InMemoryProxy
+from app.sqlmodel_models import Role
+
+
+@pytest.fixture
+def proxy(clock):
+    return CachingProxy(
+        InMemoryProxy[Role](), ReadCache(max_entries=2, ttl=10, clock=clock)
+    )
+
+
+class TestCachingProxy:
+    def test_read_hits_after_first_miss(self, proxy):
+        role = proxy.create(Role(name="Admin"))
+        proxy.read(role.id)
+        proxy.read(role.id)
+        stats = proxy.cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_write_invalidates_read_and_list(self, proxy):
+        role = proxy.create(Role(name="Admin"))
+        assert proxy.read(role.id).name == "Admin"
+        assert len(proxy.list_all()) == 1
+
+        proxy.update(role.id, Role(id=role.id, name="Owner"))
+        proxy.create(Role(name="Guest"))
+        assert proxy.read(role.id).name == "Owner"
+        assert len(proxy.list_all()) == 2
+
+        proxy.delete(role.id)
+        with pytest.raises(KeyError):
+            proxy.read(role.id)
+
+    def test_entries_expire_after_ttl(self, proxy, clock):
+        role = proxy.create(Role(name="Admin"))
+        proxy.read(role.id)
+        clock.now += 11
+        proxy.read(role.id)
+        stats = proxy.cache.stats()
+        assert stats["misses"] == 2
+        assert stats["evictions"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self, proxy):
+        roles = [proxy.create(Role(name=f"Role {i}")) for i in range(3)]
+        for role in roles:
+            proxy.read(role.id)
+        assert proxy.cache.stats() == {
+            "entries": 2,
+            "max_entries": 2,
+            "hits": 0,
+            "misses": 3,
+            "evictions": 1,
+        }
+
+    def test_read_racing_a_write_is_not_cached(self):
+        cache = ReadCache()
+        _, generation = cache.get("key")
+        cache.invalidate("key")
+        cache.put("key", "stale", generation)
+        assert cache.get("key")[0] is False
+
+    def test_read_many_only_loads_misses(self, proxy):
+        first = proxy.create(Role(name="First"))
+        second = proxy.create(Role(name="Second"))
+        proxy.read(first.id)
+        found = proxy.read_many([first.id, second.id])
+        assert [role.name for role in found] == ["First", "Second"]
+        stats = proxy.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert [role.id for role in proxy.read_many([second.id])] == [second.id]
+        assert proxy.cache.stats()["hits"] == 2
@@ -0,0 +1,145 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# test_change_log.py
+import pytest
+from sqlalchemy import text
+
+from app.change_log import ChangeLogCompactor, CursorExpiredError
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.group_commit import GroupCommitWriter
+from app.model_enum import ComponentType
+from app.services import ChangeFeedService, SystemComponentLinkService
+from app.sqlmodel_models import Component, System, User
+
+
+@pytest.fixture
+def feed(db):
+    db_path, registry = db
+    return ChangeFeedService(db_path=db_path, registry=registry, broker=None)
+
+
+@pytest.fixture
+def users(db):
+    db_path, registry = db
+    return DuckDBProxy(User, db_path=db_path, registry=registry)
+
+
+def _summary(batch):
+    return [(change.type, change.id, change.action) for change in batch.changes]
+
+
+def _log_size(db):
+    db_path, registry = db
+    engine, _ = registry.get(db_path)
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT count(*) FROM change_log")).scalar()
+
+
+def test_latest_change_per_object(feed, users):
+    start = feed.changes(None).cursor
+    alice = users.create(User(name="Alice"))
+    users.update(alice.id, User(id=alice.id, name="Alicia"))
+    bob, carol = users.create_many([User(name="Bob"), User(name="Carol")])
+    users.upsert(User(id=bob.id, name="Robert"))
+    users.delete(carol.id)
+    batch = feed.changes(start)
+    assert _summary(batch) == [
+        ("users", alice.id, "update"),
+        ("users", bob.id, "upsert"),
+        ("users", carol.id, "delete"),
+    ]
+    assert not batch.has_more
+    assert feed.changes(batch.cursor).changes == []
+
+
+def test_types_filter_still_advances_the_cursor(db, feed, users):
+    db_path, registry = db
+    start = feed.changes(None).cursor
+    users.create(User(name="Alice"))
+    system = DuckDBProxy(System, db_path=db_path, registry=registry).create(
+        System(name="Billing")
+    )
+    batch = feed.changes(start, ["systems"])
+    assert _summary(batch) == [("systems", system.id, "create")]
+    assert feed.changes(batch.cursor).changes == []
+    with pytest.raises(ValueError):
+        feed.changes(start, ["owners"])
+
+
+def test_batches_are_paged(feed, users):
+    created = users.create_many([User(name=f"U{i}") for i in range(5)])
+    seen, cursor, has_more = [], 0, True
+    while has_more:
+        batch = feed.changes(cursor, None, 2)
+        seen += [change.id for change in batch.changes]
+        cursor, has_more = batch.cursor, batch.has_more
+    assert sorted(seen) == sorted(user.id for user in created)
+
+
+def test_links_change_both_ends(db, feed):
+    db_path, registry = db
+    system = DuckDBProxy(System, db_path=db_path, registry=registry).create(
+        System(name="Billing")
+    )
+    component = DuckDBProxy(Component, db_path=db_path, registry=registry).create(
+        Component(name="Ledger", type=ComponentType.DATABASE)
+    )
+    links = SystemComponentLinkService(db_path, registry, broker=None)
+    start = feed.changes(None).cursor
+    links.link(system.id, component.id)
+    links.link(system.id, component.id)
+    assert sorted(_summary(feed.changes(start))) == sorted(
+        [("systems", system.id, "update"), ("components", component.id, "update")]
+    )
+    cursor = feed.changes(None).cursor
+    links.unlink_component(component.id)
+    assert len(feed.changes(cursor).changes) == 2
+
+
+def test_failed_writes_are_not_logged(db, feed, users):
+    db_path, registry = db
+    writer = GroupCommitWriter(db_path, registry)
+    grouped = DuckDBProxy(User, db_path=db_path, registry=registry, writer=writer)
+    alice = grouped.create(User(name="Alice"))
+    start = feed.changes(None).cursor
+    with pytest.raises(Exception):
+        grouped.create(User(id=alice.id, name="Duplicate"))
+    writer.shutdown()
+    assert feed.changes(start).changes == []
+
+
+def test_compaction_keeps_the_feed(db, feed, users):
+    db_path, registry = db
+    alice = users.create(User(name="Alice"))
+    for name in ("B", "C", "D"):
+        users.update(alice.id, User(id=alice.id, name=name))
+    before = feed.changes(0)
+    compactor = ChangeLogCompactor(db_path, registry)
+    assert compactor.compact() == 3
+    assert _log_size(db) == 1
+    assert feed.changes(0) == before
+
+
+def test_retention_expires_old_cursors(db, feed, users):
+    db_path, registry = db
+    users.create(User(name="Alice"))
+    cursor = feed.changes(None).cursor
+    ChangeLogCompactor(db_path, registry, retention=0).compact()
+    assert _log_size(db) == 0
+    with pytest.raises(CursorExpiredError):
+        feed.changes(0)
+    # Clients holding the latest cursor keep syncing
+    bob = users.create(User(name="Bob"))
+    assert _summary(feed.changes(cursor)) == [("users", bob.id, "create")]
@@ -0,0 +1,54 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from app.engine_registry import EngineRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = EngineRegistry(pool_size=2, max_overflow=0)
+    yield registry, str(tmp_path / "registry.duckdb")
+    registry.dispose()
+
+
+class TestEngineRegistry:
+    def test_engine_is_shared_per_path(self, registry):
+        registry, db_path = registry
+        engine, Session = registry.get(db_path)
+        assert registry.get(db_path) == (engine, Session)
+        assert engine.pool.size() == 2
+
+    def test_health_check(self, registry):
+        registry, db_path = registry
+        registry.get(db_path)
+        assert registry.health_check() == {db_path: True}
+
+    def test_dispose(self, registry):
+        registry, db_path = registry
+        engine, _ = registry.get(db_path)
+        registry.dispose()
+        assert registry.health_check() == {}
+        assert registry.get(db_path)[0] is not engine
+
+    def test_pre_ping_is_opt_in(self, registry, tmp_path):
+        registry, db_path = registry
+        assert registry.get(db_path)[0].pool._pre_ping is False
+        pinging = EngineRegistry(pool_pre_ping=True)
+        try:
+            engine, _ = pinging.get(str(tmp_path / "pinged.duckdb"))
+            assert engine.pool._pre_ping is True
+        finally:
+            pinging.dispose()
@@ -0,0 +1,134 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# test_event_stream.py
+import asyncio
+import json
+import threading
+import uuid
+
+import pytest
+
+from app.event_stream import ChangeBroadcaster, server_sent_events
+from app.events import CREATE, DELETE, UPDATE, ChangeEvent, EventBus
+from app.sqlmodel_models import Component, System, User
+
+
+def _publish(bus, *events):
+    """Publish from another thread, as committed writes do."""
+    thread = threading.Thread(target=lambda: [bus.publish(e) for e in events])
+    thread.start()
+    thread.join()
+
+
+def _run(scenario, max_pending=100):
+    bus = EventBus()
+    broadcaster = ChangeBroadcaster(bus, max_pending=max_pending)
+
+    async def main():
+        broadcaster.start(asyncio.get_running_loop())
+        try:
+            return await scenario(bus, broadcaster)
+        finally:
+            broadcaster.stop()
+
+    return asyncio.run(main())
+
+
+def test_bursts_are_coalesced_per_object():
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+
+    async def scenario(bus, broadcaster):
+        subscription = broadcaster.subscribe()
+        _publish(
+            bus,
+            ChangeEvent(User, CREATE, alice),
+            ChangeEvent(User, CREATE, bob),
+            ChangeEvent(User, UPDATE, alice),
+            ChangeEvent(User, DELETE, bob),
+        )
+        return await subscription.next_batch(1, coalesce=0.01)
+
+    changes, overflowed = _run(scenario)
+    assert not overflowed
+    assert changes == [
+        {"type": "users", "id": str(alice), "action": UPDATE},
+        {"type": "users", "id": str(bob), "action": DELETE},
+    ]
+
+
+def test_subscriptions_filter_by_type_and_id():
+    system_id, component_id = uuid.uuid4(), uuid.uuid4()
+
+    async def scenario(bus, broadcaster):
+        systems = broadcaster.subscribe(types=["systems"])
+        one = broadcaster.subscribe(ids=[component_id])
+        _publish(
+            bus,
+            ChangeEvent(System, UPDATE, system_id),
+            ChangeEvent(Component, UPDATE, component_id),
+            ChangeEvent(Component, UPDATE, uuid.uuid4()),
+        )
+        return [
+            [change["id"] for change in (await sub.next_batch(1, 0.01))[0]]
+            for sub in (systems, one)
+        ]
+
+    assert _run(scenario) == [[str(system_id)], [str(component_id)]]
+
+
+def test_unknown_type_is_rejected():
+    async def scenario(bus, broadcaster):
+        with pytest.raises(ValueError):
+            broadcaster.subscribe(types=["owners"])
+        return broadcaster.subscribers()
+
+    assert _run(scenario) == 0
+
+
+def test_slow_subscriber_is_told_to_resync():
+    async def scenario(bus, broadcaster):
+        subscription = broadcaster.subscribe()
+        _publish(bus, *[ChangeEvent(User, CREATE, uuid.uuid4()) for _ in range(10)])
+        first = await subscription.next_batch(1, coalesce=0.01)
+        _publish(bus, ChangeEvent(User, CREATE, uuid.uuid4()))
+        second = await subscription.next_batch(1, coalesce=0.01)
+        return first, second
+
+    (changes, overflowed), (after, resync) = _run(scenario, max_pending=3)
+    assert changes == [] and overflowed
+    assert len(after) == 1 and not resync
+
+
+def test_server_sent_events_render_batches():
+    user_id = uuid.uuid4()
+
+    async def scenario(bus, broadcaster):
+        subscription = broadcaster.subscribe()
+        stream = server_sent_events(subscription, keepalive=0.05, coalesce=0.01)
+        received = [await stream.__anext__(), await stream.__anext__()]
+        _publish(bus, ChangeEvent(User, CREATE, user_id))
+        received.append(await stream.__anext__())
+        broadcaster.unsubscribe(subscription)
+        await stream.aclose()
+        return received, broadcaster.subscribers()
+
+    (connected, keepalive, event), subscribers = _run(scenario)
+    assert connected.startswith(":") and keepalive.startswith(":")
+    name, data = event.strip().split("\n")
+    assert name == "event: changes"
+    assert json.loads(data.removeprefix("data: ")) == [
+        {"type": "users", "id": str(user_id), "action": CREATE}
+    ]
+    assert subscribers == 0
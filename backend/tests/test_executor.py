@@ -0,0 +1,86 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.executor import BoundedExecutor, ExecutorSaturatedError
+from app.persistence import ExecutorProxy, InMemoryProxy
+from app.sqlmodel_models import User
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor("test", 2, lambda: ThreadPoolExecutor(max_workers=1))
+    yield executor
+    executor.shutdown()
+
+
+class TestBoundedExecutor:
+    def test_runs_call_off_the_event_loop(self, executor):
+        async def main():
+            return await executor.run(threading.current_thread)
+
+        assert asyncio.run(main()) is not threading.main_thread()
+        assert executor.stats()["completed"] == 1
+
+    def test_rejects_calls_beyond_max_pending(self, executor):
+        release = threading.Event()
+
+        async def main():
+            blocked = [
+                asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorSaturatedError):
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*blocked)
+
+        asyncio.run(main())
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["pending"] == 0
+
+    def test_cancelled_caller_keeps_its_slot_until_the_call_ends(self, executor):
+        release = threading.Event()
+
+        async def main():
+            waiting = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await asyncio.sleep(0.01)
+            pending = executor.stats()["pending"]
+            release.set()
+            return pending
+
+        assert asyncio.run(main()) == 1
+        executor.shutdown()
+        assert executor.stats()["pending"] == 0
+
+
+class TestExecutorProxy:
+    def test_delegates_to_sync_proxy(self, executor):
+        proxy = ExecutorProxy(InMemoryProxy[User](), executor)
+
+        async def main():
+            user = await proxy.create(User(name="Async"))
+            assert (await proxy.read(user.id)).name == "Async"
+            await proxy.delete(user.id)
+            return await proxy.list_all()
+
+        assert asyncio.run(main()) == []
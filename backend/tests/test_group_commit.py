@@ -0,0 +1,87 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.group_commit import GroupCommitWriter
+from app.sqlmodel_models import User
+
+
+@pytest.fixture
+def writer(db):
+    db_path, registry = db
+    writer = GroupCommitWriter(db_path, registry, max_ops=16, max_delay=0.05)
+    yield writer
+    writer.shutdown()
+
+
+@pytest.fixture
+def proxy(db, writer):
+    db_path, registry = db
+    return DuckDBProxy(User, db_path=db_path, registry=registry, writer=writer)
+
+
+def test_concurrent_writes_share_commits(proxy, writer):
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        created = list(pool.map(lambda i: proxy.create(User(name=f"U{i}")), range(32)))
+    assert sorted(user.name for user in proxy.list_all()) == sorted(
+        user.name for user in created
+    )
+    stats = writer.stats()
+    assert stats["ops"] == 32
+    assert stats["batches"] < 32
+
+
+def test_failed_write_only_fails_its_caller(proxy, writer):
+    existing = proxy.create(User(name="Existing"))
+    start = threading.Barrier(3)
+
+    def create(user):
+        start.wait()
+        return writer.submit(proxy._create, user)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = list(
+            pool.map(
+                create,
+                [User(name="A"), User(id=existing.id, name="Dup"), User(name="B")],
+            )
+        )
+    assert futures[0].result().name == "A"
+    with pytest.raises(IntegrityError):
+        futures[1].result()
+    assert futures[2].result().name == "B"
+    assert sorted(user.name for user in proxy.list_all()) == ["A", "B", "Existing"]
+
+
+def test_update_and_delete_errors_reach_caller(proxy):
+    user = proxy.create(User(name="Before"))
+    assert proxy.update(user.id, User(id=user.id, name="After")).name == "After"
+    with pytest.raises(KeyError):
+        proxy.update(User().id, User(name="Missing"))
+    proxy.delete(user.id)
+    assert proxy.list_all() == []
+
+
+def test_shutdown_commits_queued_writes_and_restarts(proxy, writer):
+    futures = [writer.submit(proxy._create, User(name=f"U{i}")) for i in range(5)]
+    writer.shutdown()
+    assert all(future.done() for future in futures)
+    proxy.create(User(name="After restart"))
+    assert len(proxy.list_all()) == 6
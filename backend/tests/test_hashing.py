@@ -0,0 +1,69 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.executor import BoundedExecutor, ExecutorSaturatedError
+from app.hashing import HashingService, HashMetrics
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor(
+        "test-hashing", 1, lambda: ProcessPoolExecutor(max_workers=1)
+    )
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def metrics():
+    return HashMetrics()
+
+
+@pytest.fixture
+def service(executor, metrics):
+    return HashingService(executor=executor, metrics=metrics)
+
+
+class TestHashingService:
+    def test_hash_and_verify_match_authentication(self, service, metrics):
+        async def main():
+            hashed = await service.hash_password("secure_password")
+            assert hashed == service.auth.hash_password("secure_password")
+            assert await service.verify_password("secure_password", hashed)
+            assert not await service.verify_password("wrong_password", hashed)
+
+        asyncio.run(main())
+        stats = metrics.stats()
+        assert stats["count"] == 3
+        assert stats["hash_time_avg"] > 0
+
+    def test_fails_fast_when_queue_is_full(self, service, executor):
+        hashed = service.auth.hash_password("secure_password")
+
+        async def main():
+            first = asyncio.ensure_future(
+                service.verify_password("secure_password", hashed)
+            )
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorSaturatedError):
+                await service.verify_password("secure_password", hashed)
+            assert await first
+
+        asyncio.run(main())
+        assert executor.stats()["rejected"] == 1
@@ -0,0 +1,138 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import uuid
+
+import pytest
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.events import DELETE, UPDATE, EventBus
+from app.model_enum import ComponentType
+from app.services import SystemComponentLinkService
+from app.sqlmodel_models import Component, System
+
+
+@pytest.fixture
+def system(db):
+    db_path, registry = db
+    proxy = DuckDBProxy(System, db_path=db_path, registry=registry)
+    return proxy.create(System(name="System"))
+
+
+@pytest.fixture
+def components(db):
+    db_path, registry = db
+    proxy = DuckDBProxy(Component, db_path=db_path, registry=registry)
+    return proxy.create_many(
+        [
+            Component(name=f"Component {i}", type=ComponentType.HARDWARE)
+            for i in range(4)
+        ]
+    )
+
+
+@pytest.fixture
+def links(db):
+    db_path, registry = db
+    return SystemComponentLinkService(db_path=db_path, registry=registry)
+
+
+class TestSystemComponentLinkService:
+    def test_link_and_unlink(self, links, system, components):
+        links.link(system.id, components[0].id)
+        links.link(system.id, components[0].id)
+        assert links.component_ids(system.id) == [components[0].id]
+        links.unlink(system.id, components[0].id)
+        assert links.component_ids(system.id) == []
+        with pytest.raises(KeyError):
+            links.unlink(system.id, components[0].id)
+
+    def test_link_unknown_objects(self, links, system, components):
+        with pytest.raises(KeyError):
+            links.link(uuid.uuid4(), components[0].id)
+        with pytest.raises(KeyError):
+            links.link(system.id, uuid.uuid4())
+
+    def test_replace_components_writes_set_difference(self, links, system, components):
+        ids = [component.id for component in components]
+        added, removed = links.replace_components(system.id, ids[:3])
+        assert added == sorted(ids[:3])
+        assert removed == []
+
+        added, removed = links.replace_components(system.id, ids[1:])
+        assert added == [ids[3]]
+        assert removed == [ids[0]]
+        assert links.component_ids(system.id) == sorted(ids[1:])
+
+        links.replace_components(system.id, [])
+        assert links.component_ids(system.id) == []
+
+    def test_replace_components_is_all_or_nothing(self, links, system, components):
+        links.replace_components(system.id, [components[0].id])
+        with pytest.raises(KeyError):
+            links.replace_components(system.id, [components[1].id, uuid.uuid4()])
+        assert links.component_ids(system.id) == [components[0].id]
+
+    def test_unlink_system(self, links, system, components):
+        links.replace_components(system.id, [c.id for c in components])
+        links.unlink_system(system.id)
+        assert links.component_ids(system.id) == []
+
+
+class TestLinkEvents:
+    @pytest.fixture
+    def published(self, db):
+        db_path, registry = db
+        bus = EventBus()
+        events = []
+        bus.subscribe(lambda e: events.append((e.model, e.action, e.obj_id)))
+        return SystemComponentLinkService(db_path, registry, None, bus), events
+
+    def test_link_changes_update_both_ends(self, published, system, components):
+        links, events = published
+        links.link(system.id, components[0].id)
+        links.link(system.id, components[0].id)
+        links.unlink(system.id, components[0].id)
+        change = [(System, UPDATE, system.id), (Component, UPDATE, components[0].id)]
+        assert events == change + change
+
+    def test_delete_system_unlinks_it(self, published, system, components):
+        links, events = published
+        links.replace_components(system.id, [components[0].id])
+        del events[:]
+        links.delete_system(system.id)
+        assert events == [
+            (System, UPDATE, system.id),
+            (Component, UPDATE, components[0].id),
+            (System, DELETE, system.id),
+        ]
+        with pytest.raises(KeyError):
+            links.delete_system(system.id)
+        with pytest.raises(KeyError):
+            links.delete_component(uuid.uuid4())
+
+    def test_failed_delete_restores_links(
+        self, monkeypatch, db, published, system, components
+    ):
+        links, _ = published
+        linked = sorted(c.id for c in components[:2])
+        links.replace_components(system.id, linked)
+
+        def fail(proxy, session, obj_id):
+            raise RuntimeError("delete failed")
+
+        monkeypatch.setattr(DuckDBProxy, "_delete", fail)
+        with pytest.raises(RuntimeError):
+            links.delete_component(components[0].id)
+        assert links.component_ids(system.id) == linked
@@ -0,0 +1,311 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import uuid
+
+import pytest
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.events import DELETE, UPDATE, UPSERT, EventBus, PublishingProxy
+from app.model_enum import ComponentType
+from app.persistence import InMemoryProxy
+from app.services import SystemComponentLinkService
+from app.sqlmodel_models import Component, Role, RoleAuth, System, User
+
+
+@pytest.fixture(params=["memory", "duckdb"])
+def user_proxy(request, tmp_path):
+    """A User proxy for each persistence backend, backed by an empty store"""
+    if request.param == "memory":
+        yield InMemoryProxy[User]()
+        return
+    registry = EngineRegistry()
+    yield DuckDBProxy(User, db_path=str(tmp_path / "proxy.duckdb"), registry=registry)
+    registry.dispose()
+
+
+@pytest.fixture
+def users(user_proxy):
+    names = ["Eve", "Alice", "Dave", "Bob", "Carol"]
+    return [user_proxy.create(User(name=name)) for name in names]
+
+
+class TestListPage:
+    def test_pages_cover_all_rows_in_id_order(self, user_proxy, users):
+        seen = []
+        cursor = None
+        while True:
+            page = user_proxy.list_page(after_id=cursor, limit=2)
+            seen.extend(user.id for user in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert seen == sorted(user.id for user in users)
+
+    def test_order_by_column(self, user_proxy, users):
+        first = user_proxy.list_page(limit=3, order_by="name")
+        assert [user.name for user in first.items] == ["Alice", "Bob", "Carol"]
+        second = user_proxy.list_page(
+            after_id=first.next_cursor, limit=3, order_by="name"
+        )
+        assert [user.name for user in second.items] == ["Dave", "Eve"]
+        assert second.next_cursor is None
+
+    def test_unknown_order_by(self, user_proxy, users):
+        with pytest.raises(ValueError):
+            user_proxy.list_page(order_by="missing")
+
+    def test_unknown_cursor(self, user_proxy, users):
+        with pytest.raises(KeyError):
+            user_proxy.list_page(after_id=uuid.uuid4())
+
+
+class TestIterAll:
+    def test_yields_every_row_across_batches(self, user_proxy, users):
+        names = sorted(user.name for user in user_proxy.iter_all(batch_size=2))
+        assert names == sorted(user.name for user in users)
+
+    def test_empty_store(self, user_proxy):
+        assert list(user_proxy.iter_all()) == []
+
+
+class TestUpsert:
+    def test_upsert_inserts_new_object(self, user_proxy):
+        user = user_proxy.upsert(User(name="Fresh"))
+        assert user_proxy.read(user.id).name == "Fresh"
+
+    def test_upsert_updates_existing_object(self, user_proxy, users):
+        user_proxy.upsert(User(id=users[0].id, name="Replaced"))
+        assert user_proxy.read(users[0].id).name == "Replaced"
+        assert len(user_proxy.list_all()) == len(users)
+
+
+class TestBulkWrites:
+    def test_create_many(self, user_proxy):
+        created = user_proxy.create_many([User(name=f"Bulk {i}") for i in range(5)])
+        assert len(created) == 5
+        assert sorted(user.name for user in user_proxy.list_all()) == [
+            f"Bulk {i}" for i in range(5)
+        ]
+
+    def test_upsert_many_updates_and_inserts(self, user_proxy, users):
+        renamed = User(id=users[0].id, name="Renamed")
+        added = User(name="Added")
+        user_proxy.upsert_many([renamed, added])
+        assert user_proxy.read(users[0].id).name == "Renamed"
+        assert user_proxy.read(added.id).name == "Added"
+        assert len(user_proxy.list_all()) == len(users) + 1
+
+
+class TestReadMany:
+    def test_returns_found_objects_in_request_order(self, user_proxy, users):
+        wanted = [users[3].id, uuid.uuid4(), users[0].id]
+        found = user_proxy.read_many(wanted)
+        assert [user.id for user in found] == [users[3].id, users[0].id]
+
+    def test_empty_request(self, user_proxy, users):
+        assert user_proxy.read_many([]) == []
+
+
+class TestWithRelationships:
+    @pytest.fixture
+    def system_proxy(self, tmp_path):
+        db_path = str(tmp_path / "include.duckdb")
+        registry = EngineRegistry()
+        systems = DuckDBProxy(System, db_path=db_path, registry=registry)
+        components = DuckDBProxy(Component, db_path=db_path, registry=registry)
+        links = SystemComponentLinkService(db_path=db_path, registry=registry)
+        for i in range(3):
+            system = systems.create(System(name=f"System {i}"))
+            parts = components.create_many(
+                [
+                    Component(name=f"Part {i}.{j}", type=ComponentType.HARDWARE)
+                    for j in range(2)
+                ]
+            )
+            links.replace_components(system.id, [part.id for part in parts])
+        yield systems
+        registry.dispose()
+
+    def test_loads_relationships_after_session_closes(self, system_proxy):
+        proxy = system_proxy.with_relationships(["components"])
+        systems = proxy.list_all()
+        assert len(systems) == 3
+        assert all(len(system.components) == 2 for system in systems)
+        assert len(proxy.read(systems[0].id).components) == 2
+        page = proxy.list_page(limit=2, order_by="name")
+        assert [len(system.components) for system in page.items] == [2, 2]
+        assert page.next_cursor is not None
+
+    def test_unknown_relationship(self, system_proxy):
+        with pytest.raises(ValueError):
+            system_proxy.with_relationships(["missing"])
+
+    def test_memory_proxy_ignores_include(self):
+        proxy = InMemoryProxy[User]()
+        assert proxy.with_relationships(["auths"]) is proxy
+
+
+@pytest.fixture(params=["memory", "duckdb"])
+def component_proxy(request, tmp_path):
+    """A Component proxy for each persistence backend, with four components"""
+    registry = EngineRegistry()
+    if request.param == "memory":
+        proxy = InMemoryProxy[Component]()
+    else:
+        proxy = DuckDBProxy(
+            Component, db_path=str(tmp_path / "props.duckdb"), registry=registry
+        )
+    specs = [
+        [{"key": "brand", "value": "Acme"}, {"key": "rack", "value": 2}],
+        [{"key": "brand", "value": "Acme"}, {"key": "rack", "value": 3}],
+        [{"key": "brand", "value": "Initech"}, {"key": "rack", "value": 2}],
+        [],
+    ]
+    for i, properties in enumerate(specs):
+        proxy.create(
+            Component(
+                name=f"Part {i}", type=ComponentType.HARDWARE, properties=properties
+            )
+        )
+    yield proxy
+    registry.dispose()
+
+
+class TestFindByProperties:
+    def names(self, components):
+        return sorted(component.name for component in components)
+
+    def test_single_filter(self, component_proxy):
+        found = component_proxy.find_by_properties({"brand": "Acme"})
+        assert self.names(found) == ["Part 0", "Part 1"]
+        assert [c.id for c in found] == sorted(c.id for c in found)
+
+    def test_filters_are_combined(self, component_proxy):
+        found = component_proxy.find_by_properties({"brand": "Acme", "rack": "2"})
+        assert self.names(found) == ["Part 0"]
+
+    def test_no_match(self, component_proxy):
+        assert component_proxy.find_by_properties({"brand": "Globex"}) == []
+        assert component_proxy.find_by_properties({"color": "red"}) == []
+
+    def test_model_without_properties(self, user_proxy, users):
+        with pytest.raises(ValueError):
+            user_proxy.find_by_properties({"brand": "Acme"})
+
+
+@pytest.fixture
+def duckdb_user_proxy(tmp_path):
+    registry = EngineRegistry()
+    yield DuckDBProxy(User, db_path=str(tmp_path / "rows.duckdb"), registry=registry)
+    registry.dispose()
+
+
+class TestRowVersions:
+    def test_create_starts_at_version_one(self, duckdb_user_proxy):
+        created = duckdb_user_proxy.create(User(name="Alice", version=7))
+        assert created.version == 1
+        assert duckdb_user_proxy.read(created.id).version == 1
+
+    def test_update_increments_version(self, duckdb_user_proxy):
+        created = duckdb_user_proxy.create(User(name="Alice"))
+        duckdb_user_proxy.update(created.id, User(id=created.id, name="Alicia"))
+        updated = duckdb_user_proxy.read(created.id)
+        assert (updated.name, updated.version) == ("Alicia", 2)
+        assert updated.updated_at >= created.updated_at
+
+    def test_upsert_increments_existing_version(self, duckdb_user_proxy):
+        created = duckdb_user_proxy.create(User(name="Alice"))
+        upserted = duckdb_user_proxy.upsert(User(id=created.id, name="Alicia"))
+        assert upserted.version == 2
+        assert duckdb_user_proxy.upsert(User(name="Bob")).version == 1
+
+    def test_bulk_writes_maintain_versions(self, duckdb_user_proxy):
+        first, second = duckdb_user_proxy.create_many(
+            [User(name="Alice"), User(name="Bob")]
+        )
+        written = duckdb_user_proxy.upsert_many(
+            [User(id=first.id, name="Alicia"), User(name="Carol")]
+        )
+        assert [user.version for user in written] == [2, 1]
+        stored = {user.name: user.version for user in duckdb_user_proxy.list_all()}
+        assert stored == {"Alicia": 2, "Bob": 1, "Carol": 1}
+
+    def test_upsert_many_returns_one_object_per_id(self, duckdb_user_proxy):
+        created = duckdb_user_proxy.create(User(name="Alice"))
+        added = User(name="Bob")
+        written = duckdb_user_proxy.upsert_many(
+            [
+                User(id=created.id, name="Alicia"),
+                added,
+                User(id=created.id, name="Ally"),
+            ]
+        )
+        assert [(user.id, user.name, user.version) for user in written] == [
+            (created.id, "Ally", 2),
+            (added.id, "Bob", 1),
+        ]
+        assert duckdb_user_proxy.read(created.id).name == "Ally"
+
+
+class TestReferencedUpserts:
+    """Rows referenced by a foreign key are updated in place."""
+
+    def test_upsert_referenced_role(self, db):
+        db_path, registry = db
+        roles = DuckDBProxy(Role, db_path=db_path, registry=registry)
+        role = roles.create(Role(name="admin"))
+        DuckDBProxy(RoleAuth, db_path=db_path, registry=registry).create(
+            RoleAuth(name="read", feature_name="reports", role_id=role.id)
+        )
+        assert roles.upsert(Role(id=role.id, name="Admin")).version == 2
+        added = Role(name="viewer")
+        written = roles.upsert_many([Role(id=role.id, name="Administrator"), added])
+        assert [r.version for r in written] == [3, 1]
+        assert roles.read(role.id).name == "Administrator"
+        assert roles.read(added.id).name == "viewer"
+
+    def test_upsert_linked_system(self, db):
+        db_path, registry = db
+        systems = DuckDBProxy(System, db_path=db_path, registry=registry)
+        system = systems.create(System(name="Billing"))
+        component = DuckDBProxy(Component, db_path=db_path, registry=registry).create(
+            Component(name="Ledger", type=ComponentType.DATABASE)
+        )
+        SystemComponentLinkService(db_path=db_path, registry=registry).link(
+            system.id, component.id
+        )
+        systems.upsert(System(id=system.id, name="Invoicing"))
+        systems.upsert_many([System(id=system.id, name="Payments")])
+        linked = systems.with_relationships(["components"]).read(system.id)
+        assert (linked.name, linked.version) == ("Payments", 3)
+        assert [c.id for c in linked.components] == [component.id]
+
+
+def test_published_events_carry_stored_objects(db):
+    db_path, registry = db
+    bus = EventBus()
+    events = []
+    bus.subscribe(lambda e: events.append((e.action, e.obj and e.obj.version)))
+    proxy = PublishingProxy(
+        DuckDBProxy(User, db_path=db_path, registry=registry), User, bus
+    )
+    created = proxy.create(User(name="Alice"))
+    proxy.update(created.id, User(id=created.id, name="Alicia", version=9))
+    proxy.upsert(User(id=created.id, name="Al"))
+    proxy.delete(created.id)
+    with pytest.raises(KeyError):
+        proxy.delete(created.id)
+    assert events[1:] == [(UPDATE, 2), (UPSERT, 3), (DELETE, None)]
@@ -0,0 +1,79 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from app.events import CREATE, DELETE, UPDATE, ChangeEvent
+from app.property_index import PropertyIndex
+from app.sqlmodel_models import Component, ComponentType, User
+
+
+def component(name, **properties):
+    return Component(
+        name=name,
+        type=ComponentType.HARDWARE,
+        properties=[{"key": k, "value": v} for k, v in properties.items()],
+    )
+
+
+@pytest.fixture
+def parts():
+    return [
+        component("a", brand="Acme", rack=2, color="red"),
+        component("b", brand="Acme", rack=3),
+        component("c", brand="Initech", rack=2),
+    ]
+
+
+@pytest.fixture
+def index(parts):
+    index = PropertyIndex(["brand", "rack"])
+    index.load(parts)
+    return index
+
+
+def test_covers_only_hot_keys(index):
+    assert index.covers({"brand": "Acme", "rack": "2"})
+    assert not index.covers({"brand": "Acme", "color": "red"})
+    assert not index.covers({})
+
+
+def test_lookup_intersects_filters(index, parts):
+    assert index.lookup({"brand": "Acme"}) == {parts[0].id, parts[1].id}
+    assert index.lookup({"brand": "Acme", "rack": "2"}) == {parts[0].id}
+    assert index.lookup({"brand": "Globex"}) == set()
+
+
+def test_lookup_rejects_cold_keys(index):
+    with pytest.raises(KeyError):
+        index.lookup({"color": "red"})
+
+
+def test_events_keep_index_current(index, parts):
+    moved = component("b", brand="Initech")
+    moved.id = parts[1].id
+    index.apply(ChangeEvent(Component, UPDATE, moved.id, moved))
+    assert index.lookup({"brand": "Initech"}) == {parts[1].id, parts[2].id}
+    assert index.lookup({"rack": "3"}) == set()
+
+    added = component("d", brand="Acme")
+    index.apply(ChangeEvent(Component, CREATE, added.id, added))
+    index.apply(ChangeEvent(Component, DELETE, parts[0].id))
+    assert index.lookup({"brand": "Acme"}) == {added.id}
+
+
+def test_ignores_other_models(index, parts):
+    user = User(name="Acme")
+    index.apply(ChangeEvent(User, DELETE, parts[0].id, user))
+    assert parts[0].id in index.lookup({"brand": "Acme"})
@@ -0,0 +1,118 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.replica import (
+    CURRENT_FILE,
+    SnapshotPublisher,
+    SnapshotReplica,
+    SnapshotUnavailableError,
+)
+from app.sqlmodel_models import User
+
+
+@pytest.fixture
+def primary(tmp_path):
+    registry = EngineRegistry()
+    db_path = str(tmp_path / "primary.duckdb")
+    yield db_path, registry, DuckDBProxy(User, db_path=db_path, registry=registry)
+    registry.dispose()
+
+
+@pytest.fixture
+def publisher(primary, tmp_path, clock):
+    db_path, registry, _ = primary
+    return SnapshotPublisher(
+        db_path, str(tmp_path / "snapshots"), registry=registry, keep=2, clock=clock
+    )
+
+
+@pytest.fixture
+def replica(primary, tmp_path, clock):
+    """A replica of the primary with its own engines, as in another process"""
+    db_path, _, _ = primary
+    registry = EngineRegistry()
+    replica = SnapshotReplica(
+        db_path,
+        str(tmp_path / "snapshots"),
+        max_lag=10,
+        registry=registry,
+        poll_interval=3600,
+        clock=clock,
+    )
+    yield replica, DuckDBProxy(User, db_path=db_path, registry=registry)
+    replica.detach()
+    registry.dispose()
+
+
+def test_publish_writes_snapshot_and_prunes(primary, publisher, tmp_path):
+    _, _, users = primary
+    users.create(User(name="Alice"))
+    paths = [publisher.publish() for _ in range(3)]
+    directory = tmp_path / "snapshots"
+    assert (directory / CURRENT_FILE).read_text() == os.path.basename(paths[-1])
+    assert sorted(os.listdir(directory)) == sorted(
+        [CURRENT_FILE] + [os.path.basename(path) for path in paths[1:]]
+    )
+
+
+def test_replica_reads_latest_snapshot(primary, publisher, replica, clock):
+    _, _, users = primary
+    snapshot, replica_users = replica
+    switches = []
+    snapshot.on_switch(lambda: switches.append(snapshot.current_path()))
+    users.create(User(name="Alice"))
+    publisher.publish()
+    snapshot.attach()
+    assert [user.name for user in replica_users.list_all()] == ["Alice"]
+
+    users.create(User(name="Bob"))
+    assert len(replica_users.list_all()) == 1
+    assert not snapshot.refresh()
+    clock.now += 5
+    publisher.publish()
+    assert snapshot.refresh()
+    assert sorted(user.name for user in replica_users.list_all()) == ["Alice", "Bob"]
+    assert len(switches) == 2
+
+
+def test_freshness(primary, publisher, replica, clock):
+    snapshot, _ = replica
+    assert snapshot.age() is None and not snapshot.is_fresh()
+    publisher.publish()
+    snapshot.attach()
+    clock.now += 10
+    assert snapshot.age() == pytest.approx(10) and snapshot.is_fresh()
+    clock.now += 1
+    assert not snapshot.is_fresh()
+
+
+def test_replica_is_read_only(primary, publisher, replica):
+    publisher.publish()
+    snapshot, replica_users = replica
+    snapshot.attach()
+    with pytest.raises(SQLAlchemyError):
+        replica_users.create(User(name="Mallory"))
+
+
+def test_attach_without_snapshot(replica):
+    snapshot, _ = replica
+    with pytest.raises(SnapshotUnavailableError):
+        snapshot.attach()
@@ -0,0 +1,91 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.engine_registry import EngineRegistry
+from app.schema import (
+    SCHEMA_VERSION,
+    SCHEMA_VERSION_TABLE,
+    bootstrap_schema,
+    ensure_schema,
+)
+from app.sqlmodel_models import User
+
+
+@pytest.fixture
+def database(tmp_path):
+    registry = EngineRegistry()
+    yield registry, str(tmp_path / "schema.duckdb")
+    registry.dispose()
+
+
+class TestSchemaBootstrap:
+    def test_bootstrap_records_version_once(self, database):
+        registry, db_path = database
+        assert bootstrap_schema(db_path, registry) is True
+        assert bootstrap_schema(db_path, registry) is False
+
+        engine, _ = registry.get(db_path)
+        with engine.connect() as connection:
+            versions = connection.execute(
+                text(f"SELECT version FROM {SCHEMA_VERSION_TABLE}")
+            ).scalars()
+            assert list(versions) == [SCHEMA_VERSION]
+        assert inspect(engine).has_table("user")
+
+    def test_newer_database_is_rejected(self, database):
+        registry, db_path = database
+        bootstrap_schema(db_path, registry)
+        engine, _ = registry.get(db_path)
+        with engine.begin() as connection:
+            connection.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version) VALUES (:v)"),
+                {"v": SCHEMA_VERSION + 1},
+            )
+        with pytest.raises(RuntimeError):
+            bootstrap_schema(db_path, registry)
+
+    def test_proxy_uses_bootstrapped_schema(self, database):
+        registry, db_path = database
+        ensure_schema(db_path, registry)
+        proxy = DuckDBProxy(User, db_path=db_path, registry=registry)
+        created = proxy.create(User(name="Schema"))
+        assert proxy.read(created.id).name == "Schema"
+
+    def test_version_one_database_gains_row_versions(self, database):
+        registry, db_path = database
+        engine, _ = registry.get(db_path)
+        with engine.begin() as connection:
+            connection.execute(
+                text('CREATE TABLE "user" (id UUID PRIMARY KEY, name VARCHAR)')
+            )
+            connection.execute(text("INSERT INTO \"user\" VALUES (uuid(), 'Old')"))
+            connection.execute(
+                text(
+                    f"CREATE TABLE {SCHEMA_VERSION_TABLE} (version INTEGER NOT NULL, "
+                    "applied_at TIMESTAMP NOT NULL DEFAULT current_timestamp)"
+                )
+            )
+            connection.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} VALUES (1, now())")
+            )
+        assert bootstrap_schema(db_path, registry) is True
+        proxy = DuckDBProxy(User, db_path=db_path, registry=registry)
+        (old,) = proxy.list_all()
+        assert old.version == 1 and old.updated_at is not None
+        proxy.update(old.id, User(id=old.id, name="Renamed"))
+        assert proxy.read(old.id).version == 2
@@ -0,0 +1,114 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import uuid
+
+import pytest
+
+from app.events import DELETE, UPDATE, ChangeEvent
+from app.search import MERGE_MIN, SearchIndex
+from app.sqlmodel_models import Component, ComponentType, Role, System, User
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.load("user", [User(name=name) for name in ["Alice Smith", "Bob Alison"]])
+    index.load("system", [System(name="Ali"), System(name="Payroll Alpha")])
+    index.load(
+        "component",
+        [Component(name="Malibu Disk", type=ComponentType.HARDWARE)],
+    )
+    return index
+
+
+def names(hits):
+    return [hit.name for hit in hits]
+
+
+def test_ranks_exact_prefix_word_then_substring(index):
+    assert names(index.search("ali")) == [
+        "Ali",
+        "Alice Smith",
+        "Bob Alison",
+        "Malibu Disk",
+    ]
+
+
+def test_case_and_whitespace_insensitive(index):
+    assert names(index.search("  ALICE   smith ")) == ["Alice Smith"]
+
+
+def test_short_queries_match_word_starts(index):
+    assert names(index.search("al")) == [
+        "Ali",
+        "Alice Smith",
+        "Bob Alison",
+        "Payroll Alpha",
+    ]
+    assert names(index.search("s")) == ["Alice Smith"]
+
+
+def test_types_and_limit(index):
+    assert names(index.search("ali", types=["user"])) == ["Alice Smith", "Bob Alison"]
+    assert names(index.search("ali", limit=2)) == ["Ali", "Alice Smith"]
+    assert index.search("zzz") == []
+    assert index.search("") == []
+
+
+def test_events_keep_index_current(index):
+    user = User(name="Zed")
+    index.apply(ChangeEvent(User, UPDATE, user.id, user))
+    assert names(index.search("zed")) == ["Zed"]
+    renamed = User(id=user.id, name="Zelda")
+    index.apply(ChangeEvent(User, UPDATE, user.id, renamed))
+    assert names(index.search("ze")) == ["Zelda"]
+    index.apply(ChangeEvent(User, DELETE, user.id))
+    assert index.search("ze") == []
+    index.apply(ChangeEvent(Role, DELETE, uuid.uuid4()))
+    assert len(index) == 5
+
+
+def test_load_replaces_one_type(index):
+    index.load("system", [])
+    assert names(index.search("ali")) == ["Alice Smith", "Bob Alison", "Malibu Disk"]
+    assert names(index.search("p")) == []
+
+
+def test_short_queries_ignore_replaced_names():
+    index = SearchIndex()
+    obj_id = uuid.uuid4()
+    index.put("user", obj_id, "Bob Carter")
+    assert names(index.search("c")) == ["Bob Carter"]
+    # "carter" is still a suffix of the new name, but no longer a word start
+    index.put("user", obj_id, "Bobcarter")
+    assert index.search("c") == []
+    index.remove("user", obj_id)
+    index.put("user", obj_id, "Bob Carter")
+    index.put("user", obj_id, "Bob Carter")
+    assert names(index.search("c")) == ["Bob Carter"]
+    index._compact()
+    assert len(index._words) == 2
+
+
+def test_writes_merge_recent_and_drop_stale_entries():
+    index = SearchIndex()
+    ids = [uuid.uuid4() for _ in range(3000)]
+    for i, obj_id in enumerate(ids):
+        index.put("user", obj_id, f"user {i}")
+    assert len(index._recent) <= MERGE_MIN
+    for obj_id in ids:
+        index.remove("user", obj_id)
+    assert len(index._words) + len(index._recent) < 2 * MERGE_MIN
+    assert index.search("us") == []
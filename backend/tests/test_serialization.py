@@ -0,0 +1,77 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# test_serialization.py
+import json
+import uuid
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.model_enum import ComponentType
+from app.serialization import FastJSONResponse, dump_rows, embedded
+from app.services import SystemComponentLinkService
+from app.sqlmodel_models import Component, ComponentRead, System, SystemRead
+
+
+def _validated(read_cls, rows, include=()):
+    """Serialize the way FastAPI does through the route's response_model."""
+    adapter = TypeAdapter(List[read_cls])
+    value = adapter.validate_python([embedded(obj, include) for obj in rows])
+    return adapter.dump_json(value, exclude_none=True)
+
+
+def test_rows_match_the_response_model(db):
+    db_path, registry = db
+    proxy = DuckDBProxy(Component, db_path=db_path, registry=registry)
+    proxy.create_many(
+        [
+            Component(
+                name="Ledger",
+                type=ComponentType.DATABASE,
+                properties=[{"key": "engine", "value": "duckdb"}],
+            ),
+            Component(name="Gateway", type=ComponentType.SOFTWARE),
+        ]
+    )
+    rows = proxy.list_all()
+    assert json.loads(dump_rows(Component, rows, exclude_none=True)) == json.loads(
+        _validated(ComponentRead, rows)
+    )
+
+
+def test_included_relationships_match_the_response_model(db):
+    db_path, registry = db
+    system = DuckDBProxy(System, db_path=db_path, registry=registry).create(
+        System(name="Billing")
+    )
+    component = DuckDBProxy(Component, db_path=db_path, registry=registry).create(
+        Component(name="Ledger", type=ComponentType.DATABASE)
+    )
+    SystemComponentLinkService(db_path, registry, broker=None).link(
+        system.id, component.id
+    )
+    proxy = DuckDBProxy(System, db_path=db_path, registry=registry)
+    rows = proxy.with_relationships(["components"]).list_all()
+    fast = json.loads(dump_rows(System, rows, ["components"], exclude_none=True))
+    assert fast == json.loads(_validated(SystemRead, rows, ["components"]))
+    assert fast[0]["components"][0]["id"] == str(component.id)
+
+
+def test_response_passes_rendered_json_through():
+    assert FastJSONResponse(b'[{"a":1}]').body == b'[{"a":1}]'
+    obj_id = uuid.uuid4()
+    response = FastJSONResponse({"id": obj_id})
+    assert json.loads(response.body) == {"id": str(obj_id)}
@@ -0,0 +1,91 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.model_enum import ComponentType
+from app.services import StatsService, SystemComponentLinkService
+from app.sqlmodel_models import Component, System
+
+
+@pytest.fixture
+def stats(db):
+    db_path, registry = db
+    return StatsService(db_path=db_path, registry=registry)
+
+
+@pytest.fixture
+def inventory(db):
+    """Two systems sharing a component, one empty system and one orphan"""
+    db_path, registry = db
+    systems = DuckDBProxy(System, db_path=db_path, registry=registry).create_many(
+        [System(name=name) for name in ["Billing", "Payroll", "Spare"]]
+    )
+    components = DuckDBProxy(Component, db_path=db_path, registry=registry).create_many(
+        [
+            Component(name="Disk", type=ComponentType.HARDWARE),
+            Component(name="Ledger", type=ComponentType.DATABASE),
+            Component(name="Server", type=ComponentType.HARDWARE),
+            Component(name="Unused", type=ComponentType.SOFTWARE),
+        ]
+    )
+    links = SystemComponentLinkService(db_path=db_path, registry=registry)
+    links.replace_components(systems[0].id, [c.id for c in components[:3]])
+    links.replace_components(systems[1].id, [components[1].id])
+    return systems, components
+
+
+def test_summary(stats, inventory):
+    assert stats.summary() == {
+        "systems": 3,
+        "components": 4,
+        "links": 4,
+        "orphan_components": 1,
+        "empty_systems": 1,
+    }
+
+
+def test_components_by_type_includes_zero_counts(stats, inventory):
+    assert stats.components_by_type() == {
+        "type": [member.value for member in ComponentType],
+        "count": [2, 1, 1, 0, 0],
+    }
+
+
+def test_components_per_system(stats, inventory):
+    systems, _ = inventory
+    assert stats.components_per_system() == {
+        "system_id": [str(system.id) for system in systems],
+        "name": ["Billing", "Payroll", "Spare"],
+        "component_count": [3, 1, 0],
+    }
+
+
+def test_orphan_components(stats, inventory):
+    _, components = inventory
+    assert stats.orphan_components() == {
+        "id": [str(components[3].id)],
+        "name": ["Unused"],
+        "type": ["software"],
+    }
+
+
+def test_empty_database(stats):
+    assert stats.summary()["components"] == 0
+    assert stats.components_per_system() == {
+        "system_id": [],
+        "name": [],
+        "component_count": [],
+    }
@@ -0,0 +1,70 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# test_table_tags.py
+import pytest
+
+from app.duckdb_persistence_proxy import DuckDBProxy
+from app.model_enum import ComponentType
+from app.services import SystemComponentLinkService, TableTagService
+from app.sqlmodel_models import Component, System
+
+
+@pytest.fixture
+def tags(db):
+    db_path, registry = db
+    return TableTagService(db_path=db_path, registry=registry)
+
+
+@pytest.fixture
+def systems(db):
+    db_path, registry = db
+    return DuckDBProxy(System, db_path=db_path, registry=registry)
+
+
+def test_tag_is_stable_without_writes(tags, systems):
+    systems.create(System(name="Billing"))
+    assert tags.table_tag(System) == tags.table_tag(System)
+
+
+def test_every_write_changes_the_tag(tags, systems):
+    systems.create(System(name="Spare"))
+    seen = [tags.table_tag(System)]
+    system = systems.create(System(name="Billing"))
+    seen.append(tags.table_tag(System))
+    systems.update(system.id, System(id=system.id, name="Payroll"))
+    seen.append(tags.table_tag(System))
+    systems.delete(system.id)
+    seen.append(tags.table_tag(System))
+    assert all(before != after for before, after in zip(seen, seen[1:]))
+    # The tag reflects the contents, so it is back to where it started
+    assert seen[-1] == seen[0]
+
+
+def test_included_tables_are_covered(db, tags, systems):
+    db_path, registry = db
+    system = systems.create(System(name="Billing"))
+    component = DuckDBProxy(Component, db_path=db_path, registry=registry).create(
+        Component(name="Ledger", type=ComponentType.DATABASE)
+    )
+    plain = tags.table_tag(System)
+    embedded = tags.table_tag(System, ["components"])
+    SystemComponentLinkService(db_path, registry).link(system.id, component.id)
+    assert tags.table_tag(System) == plain
+    assert tags.table_tag(System, ["components"]) != embedded
+
+
+def test_unknown_relationship(tags):
+    with pytest.raises(ValueError):
+        tags.table_tag(System, ["owners"])
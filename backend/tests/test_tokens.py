@@ -0,0 +1,51 @@
+# Copyright 2025 James G Willmore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import uuid
+
+import pytest
+
+from app.authentication import Authentication
+from app.tokens import InvalidTokenError, TokenService
+
+
+@pytest.fixture
+def tokens(clock):
+    return TokenService(Authentication(), ttl=60, clock=clock)
+
+
+class TestTokenService:
+    def test_issued_token_validates(self, tokens, clock):
+        user_id = uuid.uuid4()
+        token, expires_at = tokens.issue(user_id)
+        assert expires_at == clock.now + 60
+        assert tokens.validate(token) == user_id
+
+    def test_expired_token(self, tokens, clock):
+        token, _ = tokens.issue(uuid.uuid4())
+        clock.now += 61
+        with pytest.raises(InvalidTokenError):
+            tokens.validate(token)
+
+    @pytest.mark.parametrize("token", [None, "", "not-a-token"])
+    def test_malformed_token(self, tokens, token):
+        with pytest.raises(InvalidTokenError):
+            tokens.validate(token)
+
+    def test_tampered_token(self, tokens):
+        token, _ = tokens.issue(uuid.uuid4())
+        header, claims, signature = token.split(".")
+        forged, _ = tokens.issue(uuid.uuid4())
+        with pytest.raises(InvalidTokenError):
+            tokens.validate(".".join([header, forged.split(".")[1], signature]))